@@ -0,0 +1,120 @@
+"""
+Startup Benchmark
+Measures package import cost with `python -X importtime` in fresh interpreters
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget 1.0 --targets "from src import DataLoader"
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    'import src',
+    'from src import DataLoader',
+    'from src import EDAAnalyzer',
+    'from src import InsightMiner',
+    'from src import ForecastingModel',
+    'from src import VisualizationGenerator',
+    'import src.dashboard_server',
+]
+
+# Statements that back data-only commands (load/clean); these must stay under the budget
+FAST_TARGETS = ['import src', 'from src import DataLoader']
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parse `-X importtime` output
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        One record per imported module with self and cumulative microseconds
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        name = name[1:]  # nested imports are indented by two spaces per level
+        records.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'top_level': not name.startswith(' ')
+        })
+    return records
+
+
+def measure_statement(statement: str, top: int = 10) -> Dict:
+    """
+    Import a statement in a fresh interpreter and summarize where the time went
+
+    Args:
+        statement: Python import statement
+        top: Number of heaviest top-level imports to report
+
+    Returns:
+        Dictionary with total seconds and the heaviest top-level imports
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {'statement': statement, 'error': result.stderr.strip().splitlines()[-1]}
+
+    records = parse_importtime(result.stderr)
+    top_level = [r for r in records if r['top_level']]
+    heaviest = sorted(top_level, key=lambda r: r['cumulative_us'], reverse=True)[:top]
+    return {
+        'statement': statement,
+        'seconds': sum(r['cumulative_us'] for r in top_level) / 1e6,
+        'modules_imported': len(records),
+        'heaviest': [{'module': r['module'], 'seconds': r['cumulative_us'] / 1e6} for r in heaviest]
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure package import (startup) time')
+    parser.add_argument('--targets', nargs='+', default=DEFAULT_TARGETS, help='Import statements to time')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='Maximum seconds for data-only imports (%s)' % ', '.join(FAST_TARGETS))
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per statement (fastest kept)')
+    parser.add_argument('--output', help='Write results as JSON')
+    args = parser.parse_args(argv)
+
+    results = []
+    for statement in args.targets:
+        runs = [measure_statement(statement) for _ in range(args.repeat)]
+        runs = [run for run in runs if 'error' not in run] or runs[:1]
+        best = min(runs, key=lambda run: run.get('seconds', float('inf')))
+        results.append(best)
+        if 'error' in best:
+            print(f"{statement:<45} ERROR: {best['error']}")
+            continue
+        heaviest = ', '.join(f"{m['module']} {m['seconds']:.2f}s" for m in best['heaviest'][:3])
+        print(f"{statement:<45} {best['seconds']:>6.2f}s  ({heaviest})")
+
+    over_budget = [r for r in results
+                   if r['statement'] in FAST_TARGETS and r.get('seconds', float('inf')) > args.budget]
+    for r in over_budget:
+        print(f"Over budget ({args.budget:.2f}s): {r['statement']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'budget_seconds': args.budget, 'results': results}, f, indent=2)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Benchmark Suite
+Times the public pipeline entry points on synthetic panels and compares against a stored baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py --rows 23784 1000000
+    python benchmarks/run_benchmarks.py --rows 23784 --update-baseline
+    python benchmarks/run_benchmarks.py --rows 10000000 --skip forecast viz
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import warnings
+warnings.filterwarnings('ignore')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import generate_panel, write_panel
+
+BENCHMARKS = ['process', 'eda', 'insights', 'forecast', 'regress', 'viz', 'rolling', 'rolling_pandas']
+ROLLING_WINDOW = 12
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def measure(func: Callable, repeat: int = 1) -> Dict:
+    """
+    Time a callable, keeping the fastest of `repeat` runs
+
+    Args:
+        func: Zero-argument callable
+        repeat: Number of runs
+
+    Returns:
+        Dictionary with wall seconds, CPU seconds, peak RSS and the last result
+    """
+    from profiling import peak_rss_mb
+
+    best = None
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result = func()
+        run = {
+            'seconds': time.perf_counter() - wall_start,
+            'cpu_seconds': time.process_time() - cpu_start
+        }
+        if best is None or run['seconds'] < best['seconds']:
+            best = run
+    best['peak_rss_mb'] = peak_rss_mb()
+    best['result'] = result
+    return best
+
+
+def run_size(rows: int, selected: List[str], work_dir: str, repeat: int, seed: int) -> List[Dict]:
+    """
+    Run the selected benchmarks on one synthetic panel
+
+    Each stage runs on the processed panel, the same way main.py runs it.
+
+    Args:
+        rows: Panel size
+        selected: Benchmark names to run
+        work_dir: Scratch directory for the input file and plots
+        repeat: Runs per benchmark (fastest is kept)
+        seed: Generator seed
+
+    Returns:
+        List of result records
+    """
+    from data_processing import DataProcessor
+
+    data_path = write_panel(generate_panel(rows, seed=seed), os.path.join(work_dir, f'panel_{rows}.csv'))
+    plots_dir = os.path.join(work_dir, f'plots_{rows}')
+    os.makedirs(plots_dir, exist_ok=True)
+
+    processed = measure(lambda: DataProcessor(data_path).process(), repeat)
+    processed_data = processed['result'][0]
+    date_col = processed_data.select_dtypes(include=['datetime64']).columns[0]
+    value_col = processed_data.select_dtypes(include=['float64', 'int64']).columns[0]
+
+    def run_eda():
+        from eda import EDAAnalyzer
+        return EDAAnalyzer(processed_data).generate_eda_report(save_path=plots_dir)
+
+    def run_insights():
+        from insights import InsightMiner
+        return InsightMiner(processed_data).generate_high_value_insights()
+
+    def run_forecast():
+        from models import ForecastingModel, PROPHET_AVAILABLE
+        model = ForecastingModel(processed_data, date_col, value_col)
+        if PROPHET_AVAILABLE:
+            return model.forecast_with_prophet(periods=12)
+        return model.forecast_with_arima(periods=12)
+
+    def run_regress():
+        from models import RegressionModel
+        # The processed panel has a single numeric column; regress it on calendar features
+        df = processed_data[[value_col]].copy()
+        df['year'] = processed_data[date_col].dt.year
+        df['month'] = processed_data[date_col].dt.month
+        return RegressionModel(df).train_regression_model(
+            target_column=value_col, feature_columns=['year', 'month'], model_type='random_forest'
+        )
+
+    def run_viz():
+        from visualization import VisualizationGenerator
+        return VisualizationGenerator(processed_data).generate_all_visualizations(
+            date_column=date_col, value_columns=[value_col], save_path=plots_dir
+        )
+
+    # Rolling mean/std/min/max per country/indicator series: vectorized kernel vs pandas groupby().rolling()
+    ordered = processed_data.sort_values(['country', 'indicator', date_col], kind='stable')
+    series_codes = ordered.groupby(['country', 'indicator'], sort=False).ngroup().to_numpy()
+    series_values = ordered[value_col].to_numpy(dtype='float64')
+
+    def run_rolling():
+        from rolling import rolling_statistics
+        return rolling_statistics(series_values, ROLLING_WINDOW, series_codes)
+
+    def run_rolling_pandas():
+        import pandas as pd
+        rolling = pd.Series(series_values).groupby(series_codes, sort=False).rolling(ROLLING_WINDOW)
+        return {stat: getattr(rolling, stat)() for stat in ('mean', 'std', 'min', 'max')}
+
+    runners = {'eda': run_eda, 'insights': run_insights, 'forecast': run_forecast,
+               'regress': run_regress, 'viz': run_viz, 'rolling': run_rolling,
+               'rolling_pandas': run_rolling_pandas}
+
+    records = []
+    for name in selected:
+        timing = processed if name == 'process' else measure(runners[name], repeat)
+        result = timing.pop('result')
+        record = {
+            'benchmark': name,
+            'rows': rows,
+            **timing,
+            'rows_per_second': rows / timing['seconds'] if timing['seconds'] > 0 else None
+        }
+        if isinstance(result, dict) and 'error' in result:
+            record['error'] = str(result['error'])
+        records.append(record)
+        print(f"  {name:<14} {rows:>12,} rows  {timing['seconds']:>9.3f}s  "
+              f"{timing['peak_rss_mb'] or 0:>8.0f} MB peak")
+    return records
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float,
+            min_seconds: float) -> List[Dict]:
+    """
+    Compare results against a baseline
+
+    Args:
+        results: Current result records
+        baseline: Baseline result records
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% slower)
+        min_seconds: Ignore benchmarks faster than this in both runs (timer noise)
+
+    Returns:
+        One comparison per benchmark/size present in both
+    """
+    reference = {(r['benchmark'], r['rows']): r for r in baseline}
+    comparisons = []
+    for record in results:
+        base = reference.get((record['benchmark'], record['rows']))
+        if base is None or not base['seconds']:
+            continue
+        ratio = record['seconds'] / base['seconds']
+        noisy = max(record['seconds'], base['seconds']) < min_seconds
+        comparisons.append({
+            'benchmark': record['benchmark'],
+            'rows': record['rows'],
+            'baseline_seconds': base['seconds'],
+            'seconds': record['seconds'],
+            'ratio': ratio,
+            'regression': bool(ratio > 1 + tolerance and not noisy)
+        })
+    return comparisons
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the fiscal analytics pipeline')
+    parser.add_argument('--rows', type=int, nargs='+', default=[23784],
+                        help='Panel sizes to benchmark (e.g. 23784 1000000 10000000)')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='Run only these benchmarks')
+    parser.add_argument('--skip', nargs='+', choices=BENCHMARKS, default=[], help='Benchmarks to skip')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per benchmark (fastest is kept)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/benchmark_<timestamp>.json)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results file')
+    parser.add_argument('--update-baseline', action='store_true', help='Save these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before flagging')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='Ignore regressions below this time')
+    args = parser.parse_args(argv)
+
+    selected = [name for name in (args.only or BENCHMARKS) if name not in args.skip]
+    if 'process' not in selected:
+        print("Note: 'process' always runs (other stages need its output) but is only reported when selected")
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for rows in args.rows:
+            print(f"Benchmarking {rows:,} rows...")
+            results.extend(run_size(rows, selected, work_dir, args.repeat, args.seed))
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'config': {'rows': args.rows, 'benchmarks': selected, 'repeat': args.repeat, 'seed': args.seed},
+        'results': results
+    }
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['comparison'] = compare(results, baseline['results'], args.tolerance, args.min_seconds)
+        print("\nAgainst baseline:")
+        for item in report['comparison']:
+            flag = '  REGRESSION' if item['regression'] else ''
+            print(f"  {item['benchmark']:<10} {item['rows']:>12,} rows  "
+                  f"{item['baseline_seconds']:.3f}s -> {item['seconds']:.3f}s  ({item['ratio']:.2f}x){flag}")
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nResults saved to {output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Baseline updated: {args.baseline}")
+
+    regressions = [item for item in report.get('comparison', []) if item['regression']]
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Synthetic Fiscal Panel Generator
+Builds reproducible long-format panels with the same schema as the hackathon workbook
+"""
+import argparse
+import os
+import pandas as pd
+import numpy as np
+from typing import Optional
+
+# (Country, Country Code, Currency, Source) for the countries in the real workbook
+COUNTRIES = [
+    ('Egypt', 'EGY', 'EGP', 'Central Bank of Egypt'),
+    ('Ethiopia', 'ETH', 'ETB', 'National Bank of Ethiopia'),
+    ('Ghana', 'GHA', 'GHS', 'Bank of Ghana'),
+    ('Ivory Coast', 'CIV', 'XOF', 'Central Bank of West African States'),
+    ('Nigeria', 'NGA', 'NGN', 'Central Bank of Nigeria'),
+    ('South Africa', 'ZAF', 'ZAR', 'South African Reserve Bank'),
+    ('Tanzania', 'TZA', 'TZS', 'Bank of Tanzania'),
+    ('Togo', 'TGO', 'XOF', 'Central Bank of West African States'),
+    ('Senegal', 'SEN', 'XOF', 'Senegal National statistical Site'),
+    ('Kenya', 'KEN', 'Ksh', 'Central Bank of Kenya'),
+    ('Rwanda', 'RWA', 'RWF', 'National Institute of Statistics of Rwanda'),
+    ('Algeria', 'DZA', 'DZD', 'Bank of Algeria'),
+    ('Angola', 'AGO', 'AOA', 'National Bank of Angola'),
+    ('Botswana', 'BWA', 'BWP', 'Bank of Botswana'),
+]
+
+# (Indicator, Unit, is_rate, typical level)
+INDICATORS = [
+    ('Budget Deficit/Surplus', 'Million', True, -2e4),
+    ('Capital Expenditure', 'Million', False, 5e4),
+    ('Consumer Price Index (CPI)', 'Points', False, 150.0),
+    ('Defence Expenditure', 'Million', False, 1e4),
+    ('Education Expenditure', 'Million', False, 2e4),
+    ('Expenditure', 'Billion', False, 800.0),
+    ('Exports', 'Million', False, 3e4),
+    ('Food Inflation YoY', '%', True, 10.0),
+    ('GDP Growth Rate', '%', True, 4.0),
+    ('GDP per Capita', 'USD', False, 2500.0),
+    ('Government Debt', 'Billion', False, 1500.0),
+    ('Health Expenditure', 'Million', False, 1.5e4),
+    ('Imports', 'Million', False, 3.5e4),
+    ('Inflation Rate', '%', True, 8.0),
+    ('Interest Rate', '%', True, 9.0),
+    ('Labour Force', 'Persons', False, 2e7),
+    ('Nominal GDP', 'Billion', False, 5000.0),
+    ('Real GDP', 'Billion', False, 3000.0),
+    ('Revenue', 'Billion', False, 700.0),
+    ('Unemployment Rate', '%', True, 12.0),
+]
+
+# Frequency, share of series, months per period, (min, max) periods per series
+FREQUENCIES = [
+    ('Monthly', 0.55, 1, (24, 400)),
+    ('Quarterly', 0.20, 3, (12, 120)),
+    ('Yearly', 0.25, 12, (8, 60)),
+]
+
+COLUMNS = ['Country', 'Indicator', 'Source', 'Unit', 'Currency', 'Frequency', 'Country Code', 'Time', 'Amount']
+
+
+def generate_panel(rows: int, seed: int = 42, end: str = '2025-09',
+                   missing_amount: float = 0.0025) -> pd.DataFrame:
+    """
+    Generate a synthetic long-format fiscal panel
+
+    Series are (country, indicator) pairs with a fixed frequency and a
+    random-walk history ending at `end`. Past the 14 real countries,
+    synthetic countries are added until the requested row count is reached.
+    Rates and balances can be negative; level series are positive.
+    Percent, points and persons series carry no currency, as in the real data.
+
+    Args:
+        rows: Number of rows to generate
+        seed: Random seed (the same seed and rows give identical output)
+        end: Last period (YYYY-MM)
+        missing_amount: Share of Amount values set to NaN
+
+    Returns:
+        DataFrame with the raw workbook columns, ordered by series then time
+    """
+    rng = np.random.default_rng(seed)
+
+    # Draw series until their lengths cover the requested rows
+    freq_index = np.empty(0, dtype=np.intp)
+    lengths = np.empty(0, dtype=np.int64)
+    shares = np.array([share for _, share, _, _ in FREQUENCIES])
+    while lengths.sum() < rows:
+        batch = max(16, int((rows - lengths.sum()) / 100) + 1)
+        drawn = rng.choice(len(FREQUENCIES), size=batch, p=shares)
+        low = np.array([FREQUENCIES[i][3][0] for i in drawn])
+        high = np.array([FREQUENCIES[i][3][1] for i in drawn])
+        freq_index = np.concatenate([freq_index, drawn])
+        lengths = np.concatenate([lengths, rng.integers(low, high + 1)])
+
+    n_series = int(np.searchsorted(np.cumsum(lengths), rows) + 1)
+    freq_index, lengths = freq_index[:n_series], lengths[:n_series].copy()
+    lengths[-1] -= lengths.sum() - rows
+
+    # Series -> (country, indicator), country-major like the workbook
+    country_index = np.arange(n_series) // len(INDICATORS)
+    indicator_index = np.arange(n_series) % len(INDICATORS)
+    n_countries = int(country_index.max()) + 1
+    countries = list(COUNTRIES[:n_countries])
+    for i in range(len(countries), n_countries):
+        template = COUNTRIES[i % len(COUNTRIES)]
+        countries.append((f'Synthetic {i:05d}', f'S{i:05d}', template[2], f'Statistics Office {i:05d}'))
+
+    # Row position within each series
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    position = np.arange(rows) - np.repeat(offsets, lengths)
+
+    # Dates: count back from the end period in steps of the series frequency
+    step = np.array([months for _, _, months, _ in FREQUENCIES])[freq_index]
+    end_month = (np.datetime64(end, 'M') - np.datetime64('1970-01', 'M')).astype(np.int64)
+    months_back = (np.repeat(lengths, lengths) - 1 - position) * np.repeat(step, lengths)
+    dates = (np.datetime64('1970-01', 'M') + (end_month - months_back)).astype('datetime64[ns]')
+
+    # Values: per-series random walks around each indicator's typical level
+    is_rate = np.array([rate for _, _, rate, _ in INDICATORS])[indicator_index]
+    level = np.array([lvl for _, _, _, lvl in INDICATORS])[indicator_index]
+    level = level * rng.lognormal(0.0, 0.8, n_series)
+    shocks = rng.normal(0.0, 1.0, rows)
+    walk = np.cumsum(shocks)
+    walk -= np.repeat(walk[offsets] - shocks[offsets], lengths)
+
+    rate_rows = np.repeat(is_rate, lengths)
+    scale = np.repeat(np.where(is_rate, np.maximum(np.abs(level), 1.0) * 0.15 + 0.5, 0.0), lengths)
+    amount = np.where(
+        rate_rows,
+        np.repeat(level, lengths) + 0.1 * scale * walk,
+        np.repeat(level, lengths) * np.exp(0.02 * walk)
+    )
+    amount = np.round(amount, 2)
+    amount[rng.random(rows) < missing_amount] = np.nan
+
+    # Categorical columns: index into small object arrays so strings are shared
+    country_rows = np.repeat(country_index, lengths)
+    indicator_rows = np.repeat(indicator_index, lengths)
+    country_table = np.array(countries, dtype=object)
+    indicator_table = np.array([name for name, _, _, _ in INDICATORS], dtype=object)
+    unit_table = np.array([unit for _, unit, _, _ in INDICATORS], dtype=object)
+    frequency_table = np.array([name for name, _, _, _ in FREQUENCIES], dtype=object)
+    currency = country_table[country_rows, 2].copy()
+    currency[np.isin(unit_table[indicator_rows], ['%', 'Points', 'Persons'])] = np.nan
+
+    return pd.DataFrame({
+        'Country': country_table[country_rows, 0],
+        'Indicator': indicator_table[indicator_rows],
+        'Source': country_table[country_rows, 3],
+        'Unit': unit_table[indicator_rows],
+        'Currency': currency,
+        'Frequency': frequency_table[np.repeat(freq_index, lengths)],
+        'Country Code': country_table[country_rows, 1],
+        'Time': dates,
+        'Amount': amount
+    }, columns=COLUMNS)
+
+
+def write_panel(df: pd.DataFrame, path: str) -> str:
+    """
+    Write a generated panel as CSV or Parquet (by file extension)
+
+    Args:
+        df: Panel from generate_panel()
+        path: Output path ending in .csv or .parquet
+
+    Returns:
+        The written path
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic fiscal panel')
+    parser.add_argument('--rows', type=int, default=23784, help='Number of rows')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmarks/data/synthetic_23784.csv',
+                        help='Output file (.csv or .parquet)')
+    args = parser.parse_args(argv)
+
+    df = generate_panel(args.rows, seed=args.seed)
+    print(f"Wrote {len(df):,} rows to {write_panel(df, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,79 @@
 """
 Main Execution Script
 Orchestrates the complete analytics pipeline
+
+Usage:
+    python main.py                                    # all stages on the full workbook
+    python main.py --stages forecast --country Nigeria --indicator Revenue
+    python main.py --stages eda viz --start 2010-01-01 --workers 4 --preset draft
+    python main.py --list-stages
 """
+import argparse
+import importlib
 import sys
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from data_processing import DataProcessor
-from eda import EDAAnalyzer
-from insights import InsightMiner
-from models import ForecastingModel, RegressionModel, RecommendationSystem
-from visualization import VisualizationGenerator
+from pipeline import Pipeline, fingerprint_files
+from profiling import profiler
+from reporting import ReportWriter
 
-# Configuration
+# Configuration (defaults; overridden by command-line options)
 CONFIG = {
     'data_file': '10Alytics Hackathon- Fiscal Data.xlsx',
+    'sheet_name': 'Data',
     'output_dir': 'reports',
     'plots_dir': 'reports/plots',
-    'presentation_dir': 'presentation'
+    'cube_file': 'reports/aggregate_cube.pkl',
+    'cache_dir': '.pipeline_cache',
+    'use_cache': True,
+    'profile_file': 'reports/perf_profile.json',
+    'profile_dump': None,  # None, 'cprofile' or 'pyinstrument' (written to reports/profiles/)
+    'presentation_dir': 'presentation',
+    'filters': {},
+    'amount_basis': 'raw',  # 'raw', 'scaled' (millions), 'usd' (needs fx_rates_file) or 'real'
+    'fx_rates_file': None,  # CSV: currency, year, per_usd
+    'deflator_file': None,  # CSV: country, year, deflator (None derives GDP deflators from the data)
+    'n_workers': None,  # Plot rendering and Granger test workers (default: CPU count)
+    'render_preset': 'publication',
+    'report_formats': ['json', 'markdown'],
+    'table_format': 'auto'  # Report table sidecars: 'parquet', 'csv' or 'auto'
+}
+
+# Stage name -> description, in execution order
+STAGES = {
+    'ingest': 'Load, filter and clean the data',
+    'eda': 'Exploratory data analysis and static plots',
+    'insights': 'Clustering, anomaly detection and insight mining',
+    'forecast': 'Time series forecast',
+    'regress': 'Regression model',
+    'viz': 'Interactive dashboards and static visualizations',
+    'causality': 'Lead-lag scan: lagged cross-correlations and Granger tests per country',
+    'coverage': 'Observation coverage per country and indicator (sparse panel)',
+    'fiscal': 'Fiscal sustainability metrics (deficit, debt, primary balance) per country and year',
+    'scenarios': 'Monte Carlo policy scenarios ranked by simulated impact',
+    'recommend': 'Recommendations',
+    'report': 'Executive summary (needs eda, insights, forecast and regress)'
+}
+REPORT_FORMATS = ['json', 'markdown']
+# Stage name -> modules its function imports on first use
+STAGE_MODULES = {
+    'ingest': ['data_processing', 'normalization'],
+    'cube': ['cube'],
+    'eda': ['eda'],
+    'insights': ['insights'],
+    'forecast': ['models'],
+    'regress': ['models'],
+    'viz': ['visualization'],
+    'causality': ['causality'],
+    'coverage': ['panel'],
+    'fiscal': ['fiscal_metrics'],
+    'scenarios': ['models'],
+    'recommend': ['models']
 }
 
 
@@ -32,136 +83,457 @@ def setup_directories():
         Path(dir_path).mkdir(parents=True, exist_ok=True)
 
 
-def main():
+def get_column_roles(df):
+    """Identify date and numeric columns of the processed data"""
+    date_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
+    return date_cols, numeric_cols
+
+
+# Stage functions import their modules on first use, so a run only pays for the stages it selects
+
+def ingest_stage(data_file, sheet_name, filters, amount_basis, fx_rates_file, deflator_file):
+    """Step 1: Load and process data"""
+    from data_processing import DataProcessor
+    from normalization import Normalizer
+    processor = DataProcessor(data_file)
+    normalizer = Normalizer(fx_rates_file, deflator_file,
+                            cache_dir=CONFIG['cache_dir'] if CONFIG['use_cache'] else None)
+    # Load the 'Data' sheet (not the 'Problem Statement' sheet)
+    return processor.process(sheet_name=sheet_name, filters=filters,
+                             amount_basis=amount_basis, normalizer=normalizer)
+
+
+def cube_stage(ingest):
+    """Build the aggregate cube once; EDA and dashboards roll up from it"""
+    from cube import AggregateCube
+    processed_data, _ = ingest
+    date_cols, numeric_cols = get_column_roles(processed_data)
+    if not (date_cols and numeric_cols):
+        return None
+    return AggregateCube(processed_data, date_cols[0], numeric_cols[0]).build()
+
+
+def eda_stage(ingest, cube, plots_dir, render_preset):
+    """Step 2: Exploratory Data Analysis"""
+    from eda import EDAAnalyzer
+    eda_analyzer = EDAAnalyzer(ingest[0], render_preset=render_preset,
+                               n_workers=CONFIG['n_workers'], cube=cube)
+    return eda_analyzer.generate_eda_report(save_path=plots_dir)
+
+
+def insights_stage(ingest):
+    """Step 3: Advanced Insight Mining"""
+    from insights import InsightMiner
+    insight_miner = InsightMiner(ingest[0])
+    high_value_insights = insight_miner.generate_high_value_insights()
+    return high_value_insights, insight_miner.get_insights_summary()
+
+
+def forecast_stage(ingest, periods):
+    """Step 4a: Forecasting model (if date column exists)"""
+    from models import ForecastingModel
+    processed_data = ingest[0]
+    date_cols, numeric_cols = get_column_roles(processed_data)
+    if not (date_cols and numeric_cols):
+        return None
+    
+    try:
+        forecast_model = ForecastingModel(processed_data, date_cols[0], numeric_cols[0])
+        
+        # Try Prophet
+        if hasattr(forecast_model, 'forecast_with_prophet'):
+            forecast_result = forecast_model.forecast_with_prophet(periods=periods)
+            if 'error' not in forecast_result:
+                print(f"✓ Forecasting model (Prophet) trained")
+                return forecast_result
+            print(f"⚠ Forecasting model skipped: {forecast_result['error']}")
+    except Exception as e:
+        print(f"⚠ Forecasting model skipped: {e}")
+    return None
+
+
+def regress_stage(ingest, model_type):
+    """Step 4b: Regression model"""
+    from models import RegressionModel
+    processed_data = ingest[0]
+    _, numeric_cols = get_column_roles(processed_data)
+    if len(numeric_cols) < 2:
+        return None
+    
+    try:
+        reg_model = RegressionModel(processed_data)
+        reg_result = reg_model.train_regression_model(
+            target_column=numeric_cols[0],
+            feature_columns=numeric_cols[1:min(6, len(numeric_cols))],
+            model_type=model_type
+        )
+        
+        if 'error' not in reg_result:
+            print(f"✓ Regression model trained (R² = {reg_result['test_metrics']['r2']:.3f})")
+            return reg_result
+    except Exception as e:
+        print(f"⚠ Regression model skipped: {e}")
+    return None
+
+
+def viz_stage(ingest, cube, plots_dir, render_preset):
+    """Step 5: Generate Visualizations"""
+    from visualization import VisualizationGenerator
+    processed_data = ingest[0]
+    date_cols, numeric_cols = get_column_roles(processed_data)
+    viz_generator = VisualizationGenerator(processed_data, render_preset=render_preset,
+                                           n_workers=CONFIG['n_workers'], cube=cube)
+    return viz_generator.generate_all_visualizations(
+        date_column=date_cols[0] if date_cols else None,
+        value_columns=numeric_cols[:5] if numeric_cols else [],
+        save_path=plots_dir
+    )
+
+
+def causality_stage(ingest, period, max_lag):
+    """Step 5b: Lead-lag relationships between indicators within each country"""
+    from causality import CausalityScanner
+    processed_data = ingest[0]
+    date_cols, numeric_cols = get_column_roles(processed_data)
+    if 'indicator' not in processed_data.columns or not (date_cols and numeric_cols):
+        return None
+    scanner = CausalityScanner(
+        processed_data, date_cols[0], numeric_cols[0],
+        group_column='country' if 'country' in processed_data.columns else None,
+        period=period, max_lag=max_lag, n_workers=CONFIG['n_workers'],
+        cache_path=f"{CONFIG['cache_dir']}/granger_cache.json" if CONFIG['use_cache'] else None
+    )
+    pairs = scanner.scan()
+    return {'pairs': pairs, 'stats': scanner.get_stats()}
+
+
+def coverage_stage(ingest, period):
+    """Step 5c: Observation coverage of the country x indicator x period panel"""
+    from panel import SparsePanel
+    processed_data = ingest[0]
+    date_cols, numeric_cols = get_column_roles(processed_data)
+    if not {'country', 'indicator'}.issubset(processed_data.columns) or not (date_cols and numeric_cols):
+        return None
+    panel = SparsePanel(processed_data, date_cols[0], numeric_cols[0], period=period)
+    return {'memory': panel.memory_usage(), 'countries': panel.coverage('group'),
+            'indicators': panel.coverage('series'), 'periods_per_pair': panel.coverage_matrix()}
+
+
+def fiscal_stage(ingest):
+    """Step 5d: Fiscal sustainability metrics"""
+    from fiscal_metrics import fiscal_metrics, latest_fiscal_position
+    processed_data = ingest[0]
+    required = {'country', 'indicator', 'unit', 'currency', 'frequency'}
+    if not required.issubset(processed_data.columns):
+        return None
+    metrics = fiscal_metrics(processed_data)
+    return {'latest': latest_fiscal_position(metrics), 'metrics': metrics}
+
+
+def scenario_stage(ingest, outcome, levers, goal, model_type, n_draws):
+    """Step 6a: Simulate policy lever scenarios"""
+    from models import RecommendationSystem
+    processed_data = ingest[0]
+    if not {'country', 'indicator'}.issubset(processed_data.columns):
+        return None
+    
+    try:
+        results = RecommendationSystem(processed_data).simulate_policy_scenarios(
+            outcome=outcome, levers=levers, goal=goal, model_type=model_type, n_draws=n_draws
+        )
+        if 'error' not in results:
+            return results
+        print(f"⚠ Scenario simulation skipped: {results['error']}")
+    except Exception as e:
+        print(f"⚠ Scenario simulation skipped: {e}")
+    return None
+
+
+def recommend_stage(ingest, scenarios):
+    """Step 6b: Generate Recommendations"""
+    from models import RecommendationSystem
+    processed_data = ingest[0]
+    _, numeric_cols = get_column_roles(processed_data)
+    if not numeric_cols:
+        return None
+    rec_system = RecommendationSystem(processed_data)
+    return rec_system.generate_recommendations(target_metric=numeric_cols[0], scenario_results=scenarios)
+
+
+def report_stage(ingest, eda, insights, forecast, regress, output_dir):
+    """Step 7: Generate Summary Report"""
+    model_results = {}
+    if forecast is not None:
+        model_results['forecasting'] = forecast
+    if regress is not None:
+        model_results['regression'] = regress
+    generate_summary_report(ingest[0], eda, insights[0], model_results, output_dir)
+    return f"{output_dir}/executive_summary.md"
+
+
+def import_stage_modules(stages):
+    """
+    Import the modules of the given stages on the calling (main) thread
+
+    Stages run on pipeline threads and start worker processes; importing their
+    modules up front keeps module imports (and their import locks) off those
+    threads while workers are being started.
+    """
+    for name in stages:
+        for module in STAGE_MODULES.get(name, []):
+            importlib.import_module(module)
+
+
+def build_pipeline():
+    """Declare the pipeline stages and their dependencies"""
+    source_files = [str(path) for path in Path(__file__).parent.glob('src/*.py')] + [__file__]
+    profiler.configure(CONFIG['profile_dump'], f"{CONFIG['output_dir']}/profiles")
+    pipeline = Pipeline(
+        cache_dir=CONFIG['cache_dir'] if CONFIG['use_cache'] else None,
+        # Profile dumps hook the interpreter per thread; run stages one at a time
+        max_workers=1 if CONFIG['profile_dump'] else None,
+        code_version=fingerprint_files(source_files),
+        profiler=profiler
+    )
+    
+    pipeline.add('ingest', ingest_stage,
+                 params={'data_file': CONFIG['data_file'], 'sheet_name': CONFIG['sheet_name'],
+                         'filters': CONFIG['filters'], 'amount_basis': CONFIG['amount_basis'],
+                         'fx_rates_file': CONFIG['fx_rates_file'], 'deflator_file': CONFIG['deflator_file']},
+                 inputs=[CONFIG['data_file']] + [path for path in (CONFIG['fx_rates_file'],
+                                                                   CONFIG['deflator_file']) if path])
+    pipeline.add('cube', cube_stage, deps=['ingest'])
+    # EDA, insights, models and visualizations only share the processed data and run concurrently
+    pipeline.add('eda', eda_stage, deps=['ingest', 'cube'],
+                 params={'plots_dir': CONFIG['plots_dir'], 'render_preset': CONFIG['render_preset']})
+    pipeline.add('insights', insights_stage, deps=['ingest'])
+    pipeline.add('forecast', forecast_stage, deps=['ingest'], params={'periods': 12})
+    pipeline.add('regress', regress_stage, deps=['ingest'], params={'model_type': 'random_forest'})
+    pipeline.add('viz', viz_stage, deps=['ingest', 'cube'],
+                 params={'plots_dir': CONFIG['plots_dir'], 'render_preset': CONFIG['render_preset']})
+    pipeline.add('causality', causality_stage, deps=['ingest'], params={'period': 'Y', 'max_lag': 3})
+    pipeline.add('coverage', coverage_stage, deps=['ingest'], params={'period': 'Y'})
+    pipeline.add('fiscal', fiscal_stage, deps=['ingest'])
+    pipeline.add('scenarios', scenario_stage, deps=['ingest'],
+                 params={'outcome': 'Budget Deficit/Surplus', 'goal': 'maximize', 'model_type': 'linear',
+                         'levers': ['Revenue', 'Expenditure', 'Capital Expenditure'], 'n_draws': 2000})
+    pipeline.add('recommend', recommend_stage, deps=['ingest', 'scenarios'])
+    # The summary embeds a generation timestamp, so it is always rewritten
+    pipeline.add('report', report_stage, deps=['ingest', 'eda', 'insights', 'forecast', 'regress'],
+                 params={'output_dir': CONFIG['output_dir']}, cache=False)
+    return pipeline
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(
+        description='Fiscal data analytics pipeline',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='Stages:\n' + '\n'.join(f'  {name:<10} {desc}' for name, desc in STAGES.items())
+    )
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), metavar='STAGE',
+                        help='Stages to run (default: all); required upstream stages run automatically')
+    parser.add_argument('--list-stages', action='store_true', help='List stages and exit')
+    parser.add_argument('--data', default=CONFIG['data_file'], help='Data file (.xlsx, .csv or .parquet)')
+    parser.add_argument('--sheet', default=CONFIG['sheet_name'], help='Excel sheet to load')
+    parser.add_argument('--country', nargs='+', help='Only these countries')
+    parser.add_argument('--indicator', nargs='+', help='Only these indicators')
+    parser.add_argument('--start', help='First date to include (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Last date to include (YYYY-MM-DD)')
+    parser.add_argument('--amounts', choices=['raw', 'scaled', 'usd', 'real'], default=CONFIG['amount_basis'],
+                        help='Amount basis: as reported, millions of local currency, millions of USD '
+                             '(needs --fx-rates) or constant prices')
+    parser.add_argument('--fx-rates', help='CSV of exchange rates (currency, year, per_usd)')
+    parser.add_argument('--deflators', help='CSV of price deflators (country, year, deflator); '
+                                            'default: GDP deflators derived from the data')
+    parser.add_argument('--output-dir', default=CONFIG['output_dir'], help='Directory for reports')
+    parser.add_argument('--workers', type=int,
+                        help='Worker processes for plot rendering and Granger tests (1 runs inline)')
+    parser.add_argument('--preset', choices=['draft', 'web', 'publication', 'vector'],
+                        default=CONFIG['render_preset'], help='Static plot preset (vector writes SVG)')
+    parser.add_argument('--formats', nargs='+', choices=REPORT_FORMATS, default=CONFIG['report_formats'],
+                        help='Report outputs to write')
+    parser.add_argument('--table-format', choices=['auto', 'parquet', 'csv'], default=CONFIG['table_format'],
+                        help='Format of report table sidecars (auto: Parquet when pyarrow is installed)')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every stage')
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help='Also dump a per-stage profile to <output-dir>/profiles/')
+    args = parser.parse_args(argv)
+    if args.amounts == 'usd' and not args.fx_rates:
+        parser.error('--amounts usd needs --fx-rates')
+    return args
+
+
+def configure(args):
+    """Apply command-line options to CONFIG"""
+    CONFIG['data_file'] = args.data
+    CONFIG['sheet_name'] = args.sheet
+    CONFIG['output_dir'] = args.output_dir
+    CONFIG['plots_dir'] = f"{args.output_dir}/plots"
+    CONFIG['cube_file'] = f"{args.output_dir}/aggregate_cube.pkl"
+    CONFIG['profile_file'] = f"{args.output_dir}/perf_profile.json"
+    CONFIG['use_cache'] = not args.no_cache
+    CONFIG['profile_dump'] = args.profile
+    CONFIG['n_workers'] = args.workers
+    CONFIG['render_preset'] = args.preset
+    CONFIG['report_formats'] = args.formats
+    CONFIG['table_format'] = args.table_format
+    CONFIG['amount_basis'] = args.amounts
+    CONFIG['fx_rates_file'] = args.fx_rates
+    CONFIG['deflator_file'] = args.deflators
+    CONFIG['filters'] = {key: value for key, value in {
+        'country': args.country, 'indicator': args.indicator, 'start': args.start, 'end': args.end
+    }.items() if value}
+
+
+def save_json(writer, payload, name):
+    """Write a JSON report (tables go to sidecar files) if JSON output is enabled"""
+    if 'json' in CONFIG['report_formats']:
+        writer.write(payload, name)
+
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
+    if args.list_stages:
+        for name, desc in STAGES.items():
+            print(f"{name:<10} {desc}")
+        return
+    configure(args)
+    
+    targets = list(args.stages or STAGES)
+    if 'markdown' not in CONFIG['report_formats'] and 'report' in targets:
+        targets.remove('report')
+    
     print("=" * 80)
     print("FISCAL DATA ANALYTICS PIPELINE")
     print("=" * 80)
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Stages: {', '.join(targets)}")
+    if CONFIG['filters']:
+        print(f"Filters: {CONFIG['filters']}")
+    if CONFIG['amount_basis'] != 'raw':
+        print(f"Amounts: {CONFIG['amount_basis']}")
+    print()
     
     # Setup directories
     setup_directories()
     
-    # Step 1: Load and Process Data
-    print("Step 1: Loading and processing data...")
-    processor = DataProcessor(CONFIG['data_file'])
-    # Load the 'Data' sheet (not the 'Problem Statement' sheet)
-    processed_data, processing_report = processor.process(sheet_name='Data')
+    print("Running pipeline stages (unchanged stages are loaded from cache)...")
+    pipeline = build_pipeline()
+    import_stage_modules(pipeline.required(targets))
+    results = pipeline.run(targets)
+    print()
+    
+    for name, info in pipeline.get_run_report().items():
+        print(f"  {name:<16} {info['status']:<9} {info['seconds']:.2f}s")
+    print()
+    
+    writer = ReportWriter(CONFIG['output_dir'], table_format=CONFIG['table_format'])
     
+    # Step 1: Load and Process Data
+    processed_data, processing_report = results['ingest']
     print(f"✓ Data loaded: {processed_data.shape[0]} rows × {processed_data.shape[1]} columns")
+    normalization = processing_report.get('normalization')
+    if normalization and normalization['basis'] != 'raw':
+        print(f"✓ Amounts on '{normalization['basis']}' basis ({normalization['dropped_rows']} rows without "
+              f"a rate or deflator dropped)")
     print(f"✓ Processing complete\n")
     
     # Save processing report
-    with open(f"{CONFIG['output_dir']}/data_processing_report.json", 'w') as f:
-        json.dump(processing_report, f, indent=2, default=str)
-    
-    # Step 2: Exploratory Data Analysis
-    print("Step 2: Performing Exploratory Data Analysis...")
-    eda_analyzer = EDAAnalyzer(processed_data)
-    eda_report = eda_analyzer.generate_eda_report(save_path=CONFIG['plots_dir'])
+    save_json(writer, processing_report, 'data_processing_report')
     
-    print(f"✓ EDA complete")
-    print(f"✓ Generated {len(eda_report['top_insights'])} key insights\n")
+    cube = results.get('cube')
+    if cube is not None:
+        cube.save(CONFIG['cube_file'])
+        print(f"✓ Aggregate cube: {len(cube.cube)} cells saved to {CONFIG['cube_file']}\n")
     
-    # Save EDA report
-    with open(f"{CONFIG['output_dir']}/eda_report.json", 'w') as f:
-        json.dump(eda_report, f, indent=2, default=str)
+    # Step 2: Exploratory Data Analysis
+    if 'eda' in results:
+        eda_report = results['eda']
+        print(f"✓ EDA complete")
+        print(f"✓ Generated {len(eda_report['top_insights'])} key insights\n")
+        
+        # Save EDA report
+        save_json(writer, eda_report, 'eda_report')
     
     # Step 3: Advanced Insight Mining
-    print("Step 3: Mining advanced insights...")
-    insight_miner = InsightMiner(processed_data)
-    high_value_insights = insight_miner.generate_high_value_insights()
-    insights_summary = insight_miner.get_insights_summary()
-    
-    print(f"✓ Generated {len(high_value_insights)} high-value insights\n")
-    
-    # Save insights
-    with open(f"{CONFIG['output_dir']}/insights_report.json", 'w') as f:
-        json.dump(insights_summary, f, indent=2, default=str)
+    if 'insights' in results:
+        high_value_insights, insights_summary = results['insights']
+        print(f"✓ Generated {len(high_value_insights)} high-value insights\n")
+        
+        # Save insights
+        save_json(writer, insights_summary, 'insights_report')
     
     # Step 4: Build Models
-    print("Step 4: Building predictive models...")
-    
-    # Identify date and value columns
-    date_cols = processed_data.select_dtypes(include=['datetime64']).columns.tolist()
-    numeric_cols = processed_data.select_dtypes(include=['float64', 'int64']).columns.tolist()
-    
-    model_results = {}
-    
-    # Forecasting model (if date column exists)
-    if date_cols and numeric_cols:
-        try:
-            date_col = date_cols[0]
-            value_col = numeric_cols[0]
-            forecast_model = ForecastingModel(processed_data, date_col, value_col)
-            
-            # Try Prophet
-            if hasattr(forecast_model, 'forecast_with_prophet'):
-                forecast_result = forecast_model.forecast_with_prophet(periods=12)
-                if 'error' not in forecast_result:
-                    model_results['forecasting'] = forecast_result
-                    print(f"✓ Forecasting model (Prophet) trained")
-        except Exception as e:
-            print(f"⚠ Forecasting model skipped: {e}")
-    
-    # Regression model
-    if len(numeric_cols) >= 2:
-        try:
-            reg_model = RegressionModel(processed_data)
-            target = numeric_cols[0]
-            features = numeric_cols[1:min(6, len(numeric_cols))]
-            
-            reg_result = reg_model.train_regression_model(
-                target_column=target,
-                feature_columns=features,
-                model_type='random_forest'
-            )
-            
-            if 'error' not in reg_result:
-                model_results['regression'] = reg_result
-                print(f"✓ Regression model trained (R² = {reg_result['test_metrics']['r2']:.3f})")
-        except Exception as e:
-            print(f"⚠ Regression model skipped: {e}")
-    
-    # Save model results
-    with open(f"{CONFIG['output_dir']}/model_results.json", 'w') as f:
-        json.dump(model_results, f, indent=2, default=str)
-    
-    print()
+    if 'forecast' in results or 'regress' in results:
+        model_results = {}
+        if results.get('forecast') is not None:
+            model_results['forecasting'] = results['forecast']
+        if results.get('regress') is not None:
+            model_results['regression'] = results['regress']
+        
+        # Save model results
+        save_json(writer, model_results, 'model_results')
     
     # Step 5: Generate Visualizations
-    print("Step 5: Generating visualizations...")
-    viz_generator = VisualizationGenerator(processed_data)
+    if 'viz' in results:
+        print(f"✓ Generated {len(results['viz'])} visualization sets\n")
     
-    date_col = date_cols[0] if date_cols else None
-    value_cols = numeric_cols[:5] if numeric_cols else []
+    causality = results.get('causality')
+    if causality is not None:
+        pairs = causality['pairs']
+        causal = pairs[pairs['granger_causal']]
+        save_json(writer, {'stats': causality['stats'], 'granger_causal_pairs': len(causal),
+                           'pairs': pairs}, 'causality_report')
+        print(f"✓ Lead-lag scan: {len(causal)} of {len(pairs)} candidate pairs Granger-causal\n")
     
-    visualizations = viz_generator.generate_all_visualizations(
-        date_column=date_col,
-        value_columns=value_cols,
-        save_path=CONFIG['plots_dir']
-    )
+    coverage = results.get('coverage')
+    if coverage is not None:
+        save_json(writer, coverage, 'coverage_report')
+        memory = coverage['memory']
+        print(f"✓ Panel coverage: {memory['observations']:,} of {memory['dense_cells']:,} country-indicator-years "
+              f"observed ({memory['density']:.0%})\n")
     
-    print(f"✓ Generated {len(visualizations)} visualization sets\n")
+    fiscal = results.get('fiscal')
+    if fiscal is not None:
+        save_json(writer, fiscal, 'fiscal_metrics')
+        print(f"✓ Fiscal metrics: {len(fiscal['metrics'])} country-years, "
+              f"{fiscal['latest']['debt_to_gdp'].notna().sum()} countries with debt/GDP\n")
     
-    # Step 6: Generate Recommendations
-    print("Step 6: Generating recommendations...")
-    if numeric_cols:
-        rec_system = RecommendationSystem(processed_data)
-        recommendations = rec_system.generate_recommendations(
-            target_metric=numeric_cols[0]
-        )
-        
-        with open(f"{CONFIG['output_dir']}/recommendations.json", 'w') as f:
-            json.dump(recommendations, f, indent=2, default=str)
-        
+    # Step 6: Simulate scenarios and generate recommendations
+    scenarios = results.get('scenarios')
+    if scenarios is not None:
+        save_json(writer, scenarios, 'scenario_report')
+        best = scenarios['scenarios'].iloc[0]
+        print(f"✓ Simulated {scenarios['stats']['scenarios']} scenarios x {best['draws']:,} draws "
+              f"({scenarios['stats']['rows_per_second']:,.0f} rows/s); best: {best['scenario']} "
+              f"({scenarios['outcome']} {best['expected_impact']:+,.2f} {scenarios['unit']})\n")
+    
+    recommendations = results.get('recommend')
+    if recommendations is not None:
+        save_json(writer, recommendations, 'recommendations')
         print(f"✓ Generated {len(recommendations)} recommendations\n")
     
     # Step 7: Generate Summary Report
-    print("Step 7: Generating summary report...")
-    generate_summary_report(processed_data, eda_report, high_value_insights, 
-                          model_results, CONFIG['output_dir'])
-    print("✓ Summary report generated\n")
+    if 'report' in results:
+        print(f"✓ Summary report generated: {results['report']}\n")
+    
+    report_stats = writer.get_stats()
+    if report_stats['reports']:
+        print(f"✓ Reports written: {report_stats['total_bytes'] / 1024:.1f} KB in "
+              f"{report_stats['total_seconds'] * 1000:.1f} ms ({writer.table_format} tables, "
+              f"{'orjson' if writer.use_orjson else 'json'})\n")
+    
+    # Save performance profile
+    profile = profiler.write(CONFIG['profile_file'], extra={'pipeline': pipeline.get_run_report(),
+                                                            'reports': report_stats})
+    slowest = list(profile['methods'].items())[:5]
+    print(f"✓ Performance profile saved to {CONFIG['profile_file']}")
+    for name, entry in slowest:
+        print(f"  {name:<45} {entry['wall_seconds']:.2f}s wall, {entry['cpu_seconds']:.2f}s CPU")
+    print()
     
     print("=" * 80)
     print("PIPELINE COMPLETE!")
@@ -1,31 +1,42 @@
 """
 Fiscal Intelligence Analytics Platform
 Source code package
+
+Classes are imported on first access (PEP 562), so `from src import DataLoader`
+does not pay for scikit-learn, plotly or the forecasting backends.
 """
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "10Alytics Hackathon Team"
 
-from .data_processing import DataProcessor, DataLoader, DataCleaner
-from .eda import EDAAnalyzer
-from .insights import InsightMiner, FeatureEngineer, ClusteringAnalyzer, AnomalyDetector
-from .models import ForecastingModel, RegressionModel, ClassificationModel, RecommendationSystem
-from .visualization import DashboardGenerator, VisualizationGenerator
-
-__all__ = [
-    'DataProcessor',
-    'DataLoader',
-    'DataCleaner',
-    'EDAAnalyzer',
-    'InsightMiner',
-    'FeatureEngineer',
-    'ClusteringAnalyzer',
-    'AnomalyDetector',
-    'ForecastingModel',
-    'RegressionModel',
-    'ClassificationModel',
-    'RecommendationSystem',
-    'DashboardGenerator',
-    'VisualizationGenerator'
-]
+_EXPORTS = {
+    'DataProcessor': 'data_processing',
+    'DataLoader': 'data_processing',
+    'DataCleaner': 'data_processing',
+    'EDAAnalyzer': 'eda',
+    'InsightMiner': 'insights',
+    'FeatureEngineer': 'insights',
+    'ClusteringAnalyzer': 'insights',
+    'AnomalyDetector': 'insights',
+    'ForecastingModel': 'models',
+    'RegressionModel': 'models',
+    'ClassificationModel': 'models',
+    'RecommendationSystem': 'models',
+    'DashboardGenerator': 'visualization',
+    'VisualizationGenerator': 'visualization'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,398 @@
+"""
+Causality Module
+Lagged cross-correlation (FFT) and Granger causality scanning across indicators within each country
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .normalization import PERIOD_ALIASES
+    from .panel import to_wide, bh_adjust
+    from .profiling import profiled
+    from .resampling import align_series
+except ImportError:
+    from normalization import PERIOD_ALIASES
+    from panel import to_wide, bh_adjust
+    from profiling import profiled
+    from resampling import align_series
+
+# Columns align_series needs to aggregate each series by its native frequency
+ALIGN_COLUMNS = {'indicator', 'unit', 'currency', 'frequency'}
+
+# Bump when the Granger task changes so cached results are recomputed
+GRANGER_CACHE_VERSION = 1
+
+
+def _cross_sums(a: np.ndarray, b: np.ndarray, nfft: int, max_lag: int) -> np.ndarray:
+    """
+    Lagged cross-products sum_t a[t, i] * b[t + lag, j] for all column pairs via FFT
+
+    Args:
+        a: Array of shape (periods, series)
+        b: Array of shape (periods, series)
+        nfft: FFT length (at least periods + max_lag, so the circular product does not wrap)
+        max_lag: Largest lag returned
+
+    Returns:
+        Array of shape (max_lag + 1, series, series)
+    """
+    fa = np.fft.rfft(a, n=nfft, axis=0)
+    fb = np.fft.rfft(b, n=nfft, axis=0)
+    spectrum = np.conj(fa)[:, :, None] * fb[:, None, :]
+    return np.fft.irfft(spectrum, n=nfft, axis=0)[:max_lag + 1]
+
+
+def lagged_cross_correlation(wide: pd.DataFrame, max_lag: int = 3,
+                             min_periods: int = 8) -> pd.DataFrame:
+    """
+    Pearson correlation of every series with every other series' future values
+
+    For each ordered pair (leader, follower) and lag, correlates leader[t] with
+    follower[t + lag] over the periods where both are observed. All pairs and
+    lags come from six batched FFT cross-products (counts, sums, squares and
+    cross terms), so the exact pairwise-complete correlation is obtained
+    without a per-pair loop.
+
+    Args:
+        wide: Regularly spaced DataFrame, one column per series (NaN where missing)
+        max_lag: Largest lag in periods
+        min_periods: Minimum overlapping observations per pair and lag
+
+    Returns:
+        DataFrame with leader, follower, lag (1..max_lag), n and correlation
+    """
+    columns = list(wide.columns)
+    values = wide.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    if len(columns) < 2 or len(values) <= max_lag:
+        return pd.DataFrame(columns=['leader', 'follower', 'lag', 'n', 'correlation'])
+
+    # Standardize first; r is unchanged and the FFT sums stay well conditioned
+    counts = np.maximum(present.sum(axis=0), 1)
+    means = np.nansum(values, axis=0) / counts
+    scale = np.nanstd(values, axis=0)
+    scale[~(scale > 0)] = 1.0
+    x = np.where(present, (values - means) / scale, 0.0)
+    mask = present.astype(np.float64)
+
+    nfft = 1 << int(np.ceil(np.log2(len(values) + max_lag)))
+    n = np.rint(_cross_sums(mask, mask, nfft, max_lag))
+    sum_x = _cross_sums(x, mask, nfft, max_lag)
+    sum_y = _cross_sums(mask, x, nfft, max_lag)
+    sum_xx = _cross_sums(x * x, mask, nfft, max_lag)
+    sum_yy = _cross_sums(mask, x * x, nfft, max_lag)
+    sum_xy = _cross_sums(x, x, nfft, max_lag)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = (n * sum_xy - sum_x * sum_y) / np.sqrt((n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2))
+    r = np.clip(r, -1.0, 1.0)
+
+    lag, i, j = np.meshgrid(np.arange(max_lag + 1), np.arange(len(columns)), np.arange(len(columns)),
+                            indexing='ij')
+    keep = (lag > 0) & (i != j) & (n >= min_periods) & np.isfinite(r)
+    labels = np.asarray(columns, dtype=object)
+    return pd.DataFrame({
+        'leader': labels[i[keep]],
+        'follower': labels[j[keep]],
+        'lag': lag[keep],
+        'n': n[keep].astype(np.int64),
+        'correlation': r[keep]
+    })
+
+
+def _longest_complete_run(frame: pd.DataFrame) -> pd.DataFrame:
+    """Longest stretch of consecutive rows where every column is observed"""
+    complete = frame.notna().all(axis=1).to_numpy()
+    if not complete.any():
+        return frame.iloc[:0]
+    # Run id increments at every incomplete row; pick the most common id among complete rows
+    run_ids = np.cumsum(~complete)[complete]
+    longest = np.bincount(run_ids).argmax()
+    return frame[complete & (np.cumsum(~complete) == longest)]
+
+
+def series_fingerprint(*arrays: np.ndarray, params: Optional[Dict] = None) -> str:
+    """Content hash of series values and test parameters, used as the result cache key"""
+    hasher = hashlib.sha256(f"granger:{GRANGER_CACHE_VERSION}".encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        hasher.update(f"{array.shape}".encode())
+        hasher.update(array.tobytes())
+    hasher.update(json.dumps(params or {}, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+
+def _granger_task(task: Tuple[str, np.ndarray, int]) -> Tuple[str, Dict]:
+    """
+    Run one Granger causality test (worker process entry point)
+
+    Args:
+        task: (cache key, array of shape (periods, 2) with follower then leader, max lag)
+
+    Returns:
+        (cache key, result dictionary for the lag with the smallest F-test p-value)
+    """
+    key, data, max_lag = task
+    from statsmodels.tsa.stattools import grangercausalitytests
+
+    try:
+        tests = grangercausalitytests(data, maxlag=max_lag)
+    except Exception as e:
+        return key, {'error': str(e)}
+
+    p_values = {lag: float(tests[lag][0]['ssr_ftest'][1]) for lag in tests}
+    f_stats = {lag: float(tests[lag][0]['ssr_ftest'][0]) for lag in tests}
+    best_lag = min(p_values, key=p_values.get)
+    return key, {
+        'granger_lag': int(best_lag),
+        'granger_f': f_stats[best_lag],
+        'granger_p_value': p_values[best_lag]
+    }
+
+
+class CausalityScanner:
+    """Scans indicator pairs within each country for lead-lag relationships"""
+
+    def __init__(self, df: pd.DataFrame, date_column: str = 'time', value_column: str = 'amount',
+                 series_column: str = 'indicator', group_column: Optional[str] = 'country',
+                 period: str = 'Y', max_lag: int = 3, n_workers: Optional[int] = None,
+                 cache_path: Optional[str] = None):
+        """
+        Initialize CausalityScanner
+
+        Args:
+            df: Long DataFrame (one row per observation)
+            date_column: Date column
+            value_column: Value column
+            series_column: Column identifying a series (default: indicator)
+            group_column: Column to scan within (None pools all series)
+            period: Period alias used to align series ('M', 'Q', 'Y'); lags are in these periods.
+                With indicator, unit, currency and frequency columns, series are aligned with
+                resampling.align_series; otherwise they are averaged within each period
+            max_lag: Largest lag scanned and tested
+            n_workers: Processes for Granger tests (default: CPU count, 1 runs inline)
+            cache_path: JSON file persisting Granger results by series fingerprint
+        """
+        self.df = df
+        self.date_column = date_column
+        self.value_column = value_column
+        self.series_column = series_column
+        self.group_column = group_column
+        self.period = period
+        self.max_lag = max_lag
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self.cache_path = cache_path
+        self._cache: Optional[Dict[str, Dict]] = None
+        self._wide: Dict = {}
+        self.stats = {'granger_tests': 0, 'cache_hits': 0, 'granger_seconds': 0.0}
+
+    def _groups(self) -> Dict:
+        """Regularly spaced wide frame per group (missing periods as NaN rows)"""
+        if not self._wide:
+            frequency = {alias: label for label, alias in PERIOD_ALIASES.items()}.get(self.period)
+            if frequency and ALIGN_COLUMNS.issubset(self.df.columns):
+                self._wide = self._aligned_groups(frequency)
+                return self._wide
+            groups = self.df.groupby(self.group_column, observed=True, sort=True) \
+                if self.group_column else [(None, self.df)]
+            for group, group_df in groups:
+                wide = to_wide(group_df, self.date_column, self.value_column, self.series_column, self.period)
+                if wide.shape[1] < 2 or len(wide) == 0:
+                    continue
+                self._wide[group] = wide.reindex(pd.period_range(wide.index.min(), wide.index.max(),
+                                                                 freq=wide.index.freq))
+        return self._wide
+
+    def _aligned_groups(self, frequency: str) -> Dict:
+        """
+        Wide frames cut from one resampling.align_series calendar
+
+        Series are aggregated by their native frequency (flows summed, stocks
+        last, rates averaged; Million/Billion put on one scale) rather than
+        averaged within each period, and coarser series are interpolated.
+        """
+        keys = [self.group_column, self.series_column] if self.group_column else [self.series_column]
+        panel = align_series(self.df, frequency, self.date_column, self.value_column, keys=keys)
+        groups = panel.series[self.group_column] if self.group_column else pd.Series(None, index=panel.series.index)
+        frames = {}
+        for group in (groups.unique() if self.group_column else [None]):
+            wide = panel.select((groups == group).to_numpy() if self.group_column else
+                                np.ones(len(groups), dtype=bool)).to_frame(keys=[self.series_column])
+            wide.columns.name = self.series_column
+            observed = wide.notna().any(axis=1).to_numpy()
+            if wide.shape[1] < 2 or not observed.any():
+                continue
+            first, last = np.flatnonzero(observed)[[0, -1]]
+            frames[group] = wide.iloc[first:last + 1]
+        return frames
+
+    @profiled()
+    def scan_cross_correlations(self, min_periods: int = 8) -> pd.DataFrame:
+        """
+        Lagged cross-correlations for every ordered indicator pair in every group
+
+        Args:
+            min_periods: Minimum overlapping observations per pair and lag
+
+        Returns:
+            DataFrame with group, leader, follower, lag, n and correlation
+        """
+        tables = []
+        for group, wide in self._groups().items():
+            table = lagged_cross_correlation(wide, self.max_lag, min_periods)
+            if self.group_column:
+                table.insert(0, self.group_column, group)
+            tables.append(table)
+        if not tables:
+            return pd.DataFrame(columns=([self.group_column] if self.group_column else []) +
+                                ['leader', 'follower', 'lag', 'n', 'correlation'])
+        return pd.concat(tables, ignore_index=True)
+
+    def select_candidates(self, cross_correlations: pd.DataFrame, min_correlation: float = 0.5,
+                          max_candidates: Optional[int] = 200) -> pd.DataFrame:
+        """
+        Keep the strongest lag per ordered pair where the lagged correlation is promising
+
+        Args:
+            cross_correlations: Output of scan_cross_correlations()
+            min_correlation: Minimum absolute lagged correlation
+            max_candidates: Cap on pairs passed to Granger tests (strongest first)
+
+        Returns:
+            One row per candidate pair (its best lag), strongest first
+        """
+        pair_keys = ([self.group_column] if self.group_column else []) + ['leader', 'follower']
+        strong = cross_correlations[cross_correlations['correlation'].abs() >= min_correlation]
+        if len(strong) == 0:
+            return strong
+        strong = strong.assign(_abs=strong['correlation'].abs()).sort_values('_abs', ascending=False)
+        best = strong.drop_duplicates(pair_keys).drop(columns='_abs')
+        if max_candidates is not None:
+            best = best.head(max_candidates)
+        return best.reset_index(drop=True)
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Read the result cache once; a missing or corrupt file is treated as empty"""
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path:
+                try:
+                    with open(self.cache_path) as f:
+                        self._cache = json.load(f)
+                except (OSError, ValueError):
+                    self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        """Persist the result cache atomically"""
+        if not self.cache_path or self._cache is None:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _run_tasks(self, tasks: List[Tuple[str, np.ndarray, int]]) -> Dict[str, Dict]:
+        """Run Granger tasks on the worker pool (inline for one worker or few tasks)"""
+        if self.n_workers > 1 and len(tasks) > 1:
+            try:
+                # Spawned, not forked: scans run on pipeline threads (see rendering.PlotRenderer)
+                with ProcessPoolExecutor(max_workers=min(self.n_workers, len(tasks)),
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    return dict(executor.map(_granger_task, tasks, chunksize=max(1, len(tasks) // (4 * self.n_workers))))
+            except (OSError, NotImplementedError):
+                # Restricted environments (no semaphores/fork) fall back to inline tests
+                self.n_workers = 1
+        return dict(_granger_task(task) for task in tasks)
+
+    @profiled()
+    def run_granger_tests(self, candidates: pd.DataFrame, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Granger-test candidate pairs (does the leader's past help predict the follower?)
+
+        Each pair is tested on its longest run of consecutive periods where both
+        series are observed. Results are cached by a fingerprint of the two
+        series and the lag, so unchanged pairs are not retested. P-values are
+        adjusted with Benjamini-Hochberg over all tested pairs.
+
+        Args:
+            candidates: Output of select_candidates()
+            alpha: False discovery rate
+
+        Returns:
+            Candidates with granger_lag, granger_f, granger_p_value, granger_q_value,
+            granger_causal and error columns
+        """
+        start = time.perf_counter()
+        cache = self._load_cache()
+        wide_by_group = self._groups()
+        keys, tasks = [], []
+        errors: Dict[int, str] = {}
+        finished: Dict[str, Dict] = {}
+
+        for position, row in enumerate(candidates.itertuples(index=False)):
+            row = row._asdict()
+            wide = wide_by_group[row.get(self.group_column) if self.group_column else None]
+            data = _longest_complete_run(wide[[row['follower'], row['leader']]]).to_numpy(dtype=np.float64)
+            if len(data) < 3 * self.max_lag + 3:
+                keys.append(None)
+                errors[position] = f'Insufficient consecutive overlap ({len(data)} periods)'
+                continue
+            key = series_fingerprint(data, params={'max_lag': self.max_lag})
+            keys.append(key)
+            if key in cache:
+                self.stats['cache_hits'] += 1
+            elif key not in {task[0] for task in tasks}:
+                tasks.append((key, data, self.max_lag))
+
+        if tasks:
+            # Failed tests are reported but not cached
+            finished = self._run_tasks(tasks)
+            cache.update({key: result for key, result in finished.items() if 'error' not in result})
+            self.stats['granger_tests'] += len(tasks)
+            self._save_cache()
+
+        results = [cache.get(key) or finished.get(key) if key else {'error': errors[position]}
+                   for position, key in enumerate(keys)]
+        table = candidates.reset_index(drop=True).copy()
+        for column in ('granger_lag', 'granger_f', 'granger_p_value'):
+            table[column] = [result.get(column, np.nan) for result in results]
+        table['error'] = [result.get('error') for result in results]
+        table['granger_q_value'] = bh_adjust(table['granger_p_value'].to_numpy(dtype=np.float64))
+        table['granger_causal'] = table['granger_q_value'] < alpha
+        self.stats['granger_seconds'] += time.perf_counter() - start
+        return table.sort_values('granger_p_value', na_position='last').reset_index(drop=True)
+
+    def scan(self, min_correlation: float = 0.5, min_periods: int = 8, alpha: float = 0.05,
+             max_candidates: Optional[int] = 200) -> pd.DataFrame:
+        """
+        Full scan: FFT cross-correlations for all pairs, Granger tests for promising ones
+
+        Args:
+            min_correlation: Minimum absolute lagged correlation to Granger-test a pair
+            min_periods: Minimum overlapping observations per pair and lag
+            alpha: False discovery rate for the Granger tests
+            max_candidates: Cap on Granger-tested pairs
+
+        Returns:
+            Granger results for candidate pairs (see run_granger_tests)
+        """
+        candidates = self.select_candidates(self.scan_cross_correlations(min_periods),
+                                            min_correlation, max_candidates)
+        return self.run_granger_tests(candidates, alpha)
+
+    def get_stats(self) -> Dict:
+        """Number of Granger tests run, cache hits and time spent testing"""
+        return dict(self.stats, n_workers=self.n_workers, groups=len(self._groups()))
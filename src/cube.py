@@ -0,0 +1,149 @@
+"""
+Aggregate Cube Module
+Materialized sum/mean/count/min/max rollups over country, indicator, and calendar periods
+"""
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+import warnings
+warnings.filterwarnings('ignore')
+
+PERIOD_LEVELS = ['year', 'quarter', 'month']
+MEASURES = ['sum', 'count', 'min', 'max']
+
+
+class AggregateCube:
+    """Pre-aggregated value cube keyed by dimensions and calendar periods"""
+
+    def __init__(self, df: Optional[pd.DataFrame], date_column: str, value_column: str,
+                 dimensions: Sequence[str] = ('country', 'indicator')):
+        """
+        Initialize AggregateCube
+
+        Args:
+            df: Long-format source data (None when loading a persisted cube)
+            date_column: Name of date column
+            value_column: Name of value column to aggregate
+            dimensions: Categorical columns to keep as cube axes (missing ones are skipped)
+        """
+        self.df = df
+        self.date_column = date_column
+        self.value_column = value_column
+        if df is not None:
+            dimensions = [dim for dim in dimensions if dim in df.columns]
+        self.dimensions = list(dimensions)
+        self.keys = self.dimensions + PERIOD_LEVELS
+        self.cube: Optional[pd.DataFrame] = None
+
+    def _aggregate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aggregate rows to cube cells in a single groupby"""
+        dates = pd.to_datetime(df[self.date_column], errors='coerce')
+        keys = [df[dim] for dim in self.dimensions] + [
+            dates.dt.year.rename('year'),
+            dates.dt.quarter.rename('quarter'),
+            dates.dt.month.rename('month')
+        ]
+        values = pd.to_numeric(df[self.value_column], errors='coerce')
+        cells = values.groupby(keys, sort=True).agg(MEASURES).reset_index()
+        cells[PERIOD_LEVELS] = cells[PERIOD_LEVELS].astype(np.int64)
+        return cells
+
+    def build(self) -> 'AggregateCube':
+        """
+        Build the cube from the source data
+
+        Returns:
+            self, for chaining
+        """
+        if self.df is None:
+            raise ValueError("No source data. Pass a DataFrame or use AggregateCube.load().")
+
+        self.cube = self._aggregate(self.df)
+        self.cube['mean'] = self.cube['sum'] / self.cube['count']
+        return self
+
+    def update(self, new_rows: pd.DataFrame) -> 'AggregateCube':
+        """
+        Fold newly arrived rows into the cube without rescanning old data
+
+        Only rows not already aggregated should be passed; cells they touch
+        are merged (sums and counts add, min/max combine), others are untouched.
+
+        Args:
+            new_rows: New long-format rows with the same columns as the source
+
+        Returns:
+            self, for chaining
+        """
+        if self.cube is None:
+            self.df = new_rows
+            return self.build()
+
+        delta = self._aggregate(new_rows)
+        combined = pd.concat([self.cube[self.keys + MEASURES], delta], ignore_index=True)
+        self.cube = combined.groupby(self.keys, sort=True).agg(
+            {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+        ).reset_index()
+        self.cube['mean'] = self.cube['sum'] / self.cube['count']
+        return self
+
+    def rollup(self, by: List[str], filters: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Roll the cube up to coarser keys
+
+        Args:
+            by: Keys to keep, any of the dimensions and 'year', 'quarter', 'month'
+            filters: Optional equality filters, e.g. {'country': 'Nigeria'}
+
+        Returns:
+            DataFrame indexed by `by` with sum, count, min, max and mean
+        """
+        if self.cube is None:
+            self.build()
+
+        cube = self.cube
+        for column, value in (filters or {}).items():
+            cube = cube[cube[column] == value]
+
+        rolled = cube.groupby(by, sort=True).agg(
+            {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+        )
+        rolled['mean'] = rolled['sum'] / rolled['count']
+        return rolled
+
+    def matches(self, date_column: str, value_column: str) -> bool:
+        """Check whether the cube aggregates the given date/value columns"""
+        return self.date_column == date_column and self.value_column == value_column
+
+    def save(self, path: str):
+        """
+        Persist the cube and its metadata
+
+        Args:
+            path: Output file path (pickle)
+        """
+        if self.cube is None:
+            self.build()
+
+        pd.to_pickle({
+            'date_column': self.date_column,
+            'value_column': self.value_column,
+            'dimensions': self.dimensions,
+            'cube': self.cube
+        }, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'AggregateCube':
+        """
+        Load a persisted cube
+
+        Args:
+            path: File written by save()
+
+        Returns:
+            AggregateCube ready for rollups and updates
+        """
+        payload = pd.read_pickle(path)
+        cube = cls(None, payload['date_column'], payload['value_column'], payload['dimensions'])
+        cube.cube = payload['cube']
+        return cube
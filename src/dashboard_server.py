@@ -0,0 +1,405 @@
+"""
+Dashboard Server Module
+Local, offline dashboard server that serves per-country/per-indicator slices on demand
+"""
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .visualization import lttb_downsample
+except ImportError:
+    from visualization import lttb_downsample
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Fiscal Data Explorer</title>
+<script src="/static/plotly.min.js"></script>
+<style>
+  body { font-family: sans-serif; margin: 20px; }
+  select { margin-right: 12px; min-width: 200px; }
+  #status { color: #666; font-size: 12px; margin-top: 8px; }
+</style>
+</head>
+<body>
+<h2>Fiscal Data Explorer</h2>
+<label>Country <select id="country"></select></label>
+<label>Indicator <select id="indicator"></select></label>
+<div id="chart" style="height: 600px;"></div>
+<div id="status"></div>
+<script>
+async function getJSON(url) { const r = await fetch(url); return r.json(); }
+function fill(select, values) {
+  // Option(text, value) sets both as text, so labels are never parsed as HTML
+  select.replaceChildren(...values.map(v => new Option(v, v)));
+}
+async function draw() {
+  const country = document.getElementById('country').value;
+  const indicator = document.getElementById('indicator').value;
+  const started = performance.now();
+  const params = new URLSearchParams({country, indicator, max_points: 2000});
+  const data = await getJSON('/api/series?' + params);
+  // One trace per frequency/unit/currency variant; they are never added together
+  const traces = data.series.map(s => ({x: s.dates, y: s.values, type: 'scattergl', mode: 'lines+markers',
+                                        name: [s.frequency, s.unit, s.currency].filter(Boolean).join(' ')}));
+  const units = [...new Set(data.series.map(s => s.unit))];
+  Plotly.react('chart', traces,
+               {title: `${indicator} - ${country}`, template: 'plotly_white', showlegend: true,
+                yaxis: {title: units.length === 1 ? (units[0] || '') : ''}});
+  document.getElementById('status').textContent =
+    `${data.points_out} of ${data.points_in} points, fetched and drawn in ${(performance.now() - started).toFixed(0)} ms`;
+}
+async function init() {
+  const dims = await getJSON('/api/dimensions');
+  fill(document.getElementById('country'), dims.countries);
+  const updateIndicators = async () => {
+    const country = document.getElementById('country').value;
+    const res = await getJSON('/api/indicators?' + new URLSearchParams({country}));
+    fill(document.getElementById('indicator'), res.indicators);
+    draw();
+  };
+  document.getElementById('country').onchange = updateIndicators;
+  document.getElementById('indicator').onchange = draw;
+  updateIndicators();
+}
+init();
+</script>
+</body>
+</html>
+"""
+
+# Columns that split a country/indicator into separate series (rows are never added across them)
+VARIANT_COLUMNS = ('frequency', 'unit', 'currency')
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of encoded API responses"""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize ResponseCache
+
+        Args:
+            max_entries: Maximum number of responses kept
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, value: bytes):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+
+class PanelQueryAPI:
+    """Answers slice queries against the processed long-format panel"""
+
+    def __init__(self, df: pd.DataFrame, country_column: str = 'country',
+                 indicator_column: str = 'indicator', date_column: str = 'time',
+                 value_column: str = 'amount', variant_columns: Sequence[str] = VARIANT_COLUMNS):
+        """
+        Initialize PanelQueryAPI
+
+        Args:
+            df: Processed long-format panel (one row per country/indicator/period)
+            country_column: Name of country column
+            indicator_column: Name of indicator column
+            date_column: Name of date column
+            value_column: Name of value column
+            variant_columns: Columns that split a country/indicator into
+                separate series (those missing from df are ignored)
+        """
+        self.df = df
+        self.country_column = country_column
+        self.indicator_column = indicator_column
+        self.date_column = date_column
+        self.value_column = value_column
+        self.variant_columns = [col for col in variant_columns if col in df.columns]
+
+        # Row positions per (country, indicator), one entry per variant; slices are materialized lazily
+        self._groups: Dict[Tuple, List[Tuple[Dict, np.ndarray]]] = {}
+        keys = [country_column, indicator_column] + self.variant_columns
+        for key, positions in df.groupby(keys, sort=True, dropna=False).indices.items():
+            variant = {col: None if pd.isna(value) else value
+                       for col, value in zip(self.variant_columns, key[2:])}
+            self._groups.setdefault(key[:2], []).append((variant, positions))
+        self._dates = pd.to_datetime(df[date_column]).to_numpy()
+        self._values = pd.to_numeric(df[value_column], errors='coerce').to_numpy(dtype=np.float64)
+
+    def dimensions(self) -> Dict:
+        """List countries, indicators and the overall date range"""
+        return {
+            'countries': sorted({country for country, _ in self._groups}),
+            'indicators': sorted({indicator for _, indicator in self._groups}),
+            'date_range': [str(pd.Timestamp(np.nanmin(self._dates)).date()),
+                           str(pd.Timestamp(np.nanmax(self._dates)).date())],
+            'n_series': len(self._groups),
+            'n_rows': len(self.df)
+        }
+
+    def indicators(self, country: str) -> Dict:
+        """List indicators reported by a country"""
+        return {
+            'country': country,
+            'indicators': sorted(indicator for c, indicator in self._groups if c == country)
+        }
+
+    def series(self, country: str, indicator: str, max_points: int = 2000,
+               variant: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Get a country/indicator's series, one per frequency/unit/currency, downsampled
+
+        Rows of different variants (e.g. a Yearly total and a Quarterly figure
+        stamped on the same date, or Million and Billion rows) are served as
+        separate series rather than added up. Repeated observations of one
+        variant on the same date are averaged.
+
+        Args:
+            country: Country name
+            indicator: Indicator name
+            max_points: Maximum points returned per series
+            variant: Optional filter on the variant columns (e.g. {'frequency': 'Yearly'})
+
+        Returns:
+            Dictionary with one entry per variant (its labels, dates, values and
+            point counts) and the point totals
+        """
+        variant = {col: str(value) for col, value in (variant or {}).items()}
+        variants = [(labels, positions) for labels, positions in self._groups.get((country, indicator), [])
+                    if all(str(labels.get(col)) == value for col, value in variant.items())]
+        if not variants:
+            return {'error': f'No data for {country} / {indicator}' +
+                             (f' with {variant}' if variant else '')}
+
+        entries = []
+        for labels, positions in variants:
+            series = pd.Series(self._values[positions], index=self._dates[positions])
+            series = series.groupby(level=0).mean().sort_index().dropna()
+            if series.empty:
+                continue
+            selected = series
+            if len(series) > max_points:
+                x = series.index.values.astype('datetime64[ns]').astype(np.int64)
+                selected = series.iloc[lttb_downsample(x, series.values, max_points)]
+            entries.append({
+                **labels,
+                'dates': [str(d.date()) for d in selected.index],
+                'values': selected.tolist(),
+                'points_in': int(len(series)),
+                'points_out': int(len(selected))
+            })
+
+        return {
+            'country': country,
+            'indicator': indicator,
+            'series': entries,
+            'points_in': sum(entry['points_in'] for entry in entries),
+            'points_out': sum(entry['points_out'] for entry in entries)
+        }
+
+    def summary(self, by: str = 'country') -> Dict:
+        """
+        Get row counts and date coverage per country or indicator
+
+        Args:
+            by: 'country' or 'indicator'
+
+        Returns:
+            Dictionary mapping each group to its coverage summary
+        """
+        column = self.country_column if by == 'country' else self.indicator_column
+        grouped = self.df.groupby(column)[self.date_column].agg(['count', 'min', 'max'])
+        return {
+            str(name): {'rows': int(row['count']), 'first': str(row['min']), 'last': str(row['max'])}
+            for name, row in grouped.iterrows()
+        }
+
+
+class DashboardServer:
+    """Serves the interactive explorer page and the slice query API"""
+
+    def __init__(self, df: pd.DataFrame, host: str = '127.0.0.1', port: int = 8050,
+                 cache_size: int = 256, **column_names):
+        """
+        Initialize DashboardServer
+
+        Args:
+            df: Processed long-format panel
+            host: Interface to bind (local only by default)
+            port: Port to listen on
+            cache_size: Maximum cached API responses
+            **column_names: Column overrides passed to PanelQueryAPI
+        """
+        self.api = PanelQueryAPI(df, **column_names)
+        self.cache = ResponseCache(cache_size)
+        self.host = host
+        self.port = port
+        self._plotlyjs: Optional[bytes] = None
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def _get_plotlyjs(self) -> bytes:
+        """Load the plotly.js bundle shipped with the plotly package (no network)"""
+        if self._plotlyjs is None:
+            from plotly.offline import get_plotlyjs
+            self._plotlyjs = get_plotlyjs().encode('utf-8')
+        return self._plotlyjs
+
+    def handle_query(self, path: str, params: Dict[str, List[str]]) -> Tuple[int, bytes]:
+        """
+        Answer an API request, serving repeated queries from the LRU cache
+
+        Args:
+            path: Request path (e.g. '/api/series')
+            params: Parsed query string
+
+        Returns:
+            Tuple of (HTTP status, JSON body)
+        """
+        key = (path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return 200, cached
+
+        first = {k: v[0] for k, v in params.items()}
+        if path == '/api/dimensions':
+            payload = self.api.dimensions()
+        elif path == '/api/indicators':
+            payload = self.api.indicators(first.get('country', ''))
+        elif path == '/api/series':
+            try:
+                max_points = int(first.get('max_points', 2000))
+            except ValueError:
+                max_points = 0
+            if max_points < 1:
+                error = f"max_points must be a positive integer, got {first['max_points']!r}"
+                return 400, json.dumps({'error': error}).encode('utf-8')
+            variant = {col: first[col] for col in self.api.variant_columns if col in first}
+            payload = self.api.series(first.get('country', ''), first.get('indicator', ''), max_points, variant)
+        elif path == '/api/summary':
+            payload = self.api.summary(first.get('by', 'country'))
+        elif path == '/api/cache_stats':
+            return 200, json.dumps(self.cache.get_stats()).encode('utf-8')
+        else:
+            return 404, json.dumps({'error': f'Unknown endpoint: {path}'}).encode('utf-8')
+
+        body = json.dumps(payload, default=str).encode('utf-8')
+        if 'error' in payload:
+            return 404, body
+
+        self.cache.put(key, body)
+        return 200, body
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path in ('/', '/index.html'):
+                    self._send(200, INDEX_HTML.encode('utf-8'), 'text/html; charset=utf-8')
+                elif parsed.path == '/static/plotly.min.js':
+                    self._send(200, server._get_plotlyjs(), 'application/javascript',
+                               cache_control='public, max-age=86400')
+                elif parsed.path.startswith('/api/'):
+                    status, body = server.handle_query(parsed.path, parse_qs(parsed.query))
+                    self._send(status, body, 'application/json')
+                else:
+                    self._send(404, b'Not found', 'text/plain')
+
+            def _send(self, status, body, content_type, cache_control='no-cache'):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', cache_control)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self):
+        """Start serving until interrupted"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        print(f"Dashboard server running at http://{self.host}:{self.port}/ (Ctrl+C to stop)")
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def start_background(self) -> threading.Thread:
+        """Start serving on a daemon thread (useful from notebooks)"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.port = self._httpd.server_address[1]
+        thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        """Stop a running server"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+def main():
+    """Load and process the workbook, then serve it locally"""
+    try:
+        from .data_processing import DataProcessor
+    except ImportError:
+        from data_processing import DataProcessor
+
+    parser = argparse.ArgumentParser(description='Serve the fiscal data explorer locally')
+    parser.add_argument('--data', default='10Alytics Hackathon- Fiscal Data.xlsx', help='Path to the data file')
+    parser.add_argument('--sheet', default='Data', help='Sheet name to load')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    processed_data, _ = DataProcessor(args.data).process(sheet_name=args.sheet)
+    print(f"Loaded {len(processed_data):,} rows in {time.perf_counter() - started_at:.1f}s")
+    DashboardServer(processed_data, host=args.host, port=args.port).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,34 +2,64 @@
 Data Processing Module
 Handles dataset loading, cleaning, and preprocessing
 """
+import os
 import pandas as pd
 import numpy as np
 from typing import Tuple, Dict, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .normalization import Normalizer
+    from .outliers import OutlierEngine
+    from .profiling import profiled
+    from .results import RowMask
+except ImportError:
+    from normalization import Normalizer
+    from outliers import OutlierEngine
+    from profiling import profiled
+    from results import RowMask
+
 
 class DataLoader:
-    """Handles loading of fiscal data from Excel files"""
+    """Handles loading of fiscal data from Excel, CSV and Parquet files"""
     
     def __init__(self, file_path: str):
         """
         Initialize DataLoader
         
         Args:
-            file_path: Path to the Excel file
+            file_path: Path to the data file (.xlsx/.xls, .csv or .parquet)
         """
         self.file_path = file_path
+        self.file_format = os.path.splitext(file_path)[1].lower().lstrip('.')
         self.raw_data: Optional[pd.DataFrame] = None
         self.sheets_info: Dict = {}
     
+    def _read_flat_file(self) -> pd.DataFrame:
+        """Read a single-table CSV or Parquet file (Parquet needs pyarrow or fastparquet)"""
+        if self.file_format == 'parquet':
+            return pd.read_parquet(self.file_path)
+        return pd.read_csv(self.file_path)
+    
+    @profiled()
     def load_all_sheets(self) -> Dict[str, pd.DataFrame]:
         """
-        Load all sheets from Excel file
+        Load all sheets from Excel file (CSV/Parquet files hold a single sheet)
         
         Returns:
             Dictionary mapping sheet names to DataFrames
         """
+        if self.file_format in ('csv', 'parquet'):
+            df = self._read_flat_file()
+            sheet_name = os.path.splitext(os.path.basename(self.file_path))[0]
+            self.sheets_info[sheet_name] = {
+                'shape': df.shape,
+                'columns': list(df.columns),
+                'dtypes': df.dtypes.to_dict()
+            }
+            return {sheet_name: df}
+        
         excel_file = pd.ExcelFile(self.file_path)
         sheets_data = {}
         
@@ -44,16 +74,21 @@ class DataLoader:
         
         return sheets_data
     
+    @profiled()
     def load_primary_sheet(self, sheet_name: Optional[str] = None) -> pd.DataFrame:
         """
         Load primary sheet (first sheet if not specified)
         
         Args:
-            sheet_name: Name of sheet to load (default: first sheet)
+            sheet_name: Name of sheet to load (default: first sheet; ignored for CSV/Parquet)
         
         Returns:
             DataFrame with raw data
         """
+        if self.file_format in ('csv', 'parquet'):
+            self.raw_data = self._read_flat_file()
+            return self.raw_data
+        
         excel_file = pd.ExcelFile(self.file_path)
         
         if sheet_name is None:
@@ -102,6 +137,7 @@ class DataCleaner:
         self.df = df.copy()
         self.cleaning_log: list = []
     
+    @profiled()
     def standardize_column_names(self) -> pd.DataFrame:
         """
         Standardize column names (lowercase, replace spaces with underscores)
@@ -127,6 +163,7 @@ class DataCleaner:
         
         return self.df
     
+    @profiled()
     def fix_data_types(self, date_columns: Optional[list] = None, 
                       numeric_columns: Optional[list] = None) -> pd.DataFrame:
         """
@@ -161,6 +198,7 @@ class DataCleaner:
         
         return self.df
     
+    @profiled()
     def handle_missing_values(self, strategy: str = 'auto', 
                             threshold: float = 0.5) -> pd.DataFrame:
         """
@@ -227,6 +265,7 @@ class DataCleaner:
         
         return self.df
     
+    @profiled()
     def remove_duplicates(self) -> pd.DataFrame:
         """
         Remove duplicate rows
@@ -245,39 +284,35 @@ class DataCleaner:
         
         return self.df
     
-    def detect_outliers(self, method: str = 'iqr', threshold: float = 3.0) -> Dict:
+    @profiled()
+    def detect_outliers(self, method: str = 'iqr', threshold: float = 3.0,
+                        return_indices: bool = False) -> Dict:
         """
         Detect outliers in numeric columns
         
         Args:
             method: 'iqr' or 'zscore'
             threshold: Threshold for outlier detection
+            return_indices: Also materialize outlier row indices as lists
         
         Returns:
-            Dictionary with outlier information
+            Dictionary with outlier information (a RowMask of flagged rows per column)
         """
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        # Statistics are computed for all columns in one pass on the current frame
+        engine = OutlierEngine(self.df)
+        summary = engine.summarize(method, threshold)
+        bitmaps = engine.get_bitmaps(method, threshold)
         outliers = {}
         
-        for col in numeric_cols:
-            if method == 'iqr':
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outlier_mask = (self.df[col] < lower_bound) | (self.df[col] > upper_bound)
-            
-            elif method == 'zscore':
-                z_scores = np.abs((self.df[col] - self.df[col].mean()) / self.df[col].std())
-                outlier_mask = z_scores > threshold
-            
-            outlier_count = outlier_mask.sum()
+        for col in engine.columns:
+            outlier_count = int(summary.at[col, 'count'])
             outliers[col] = {
                 'count': outlier_count,
-                'percentage': (outlier_count / len(self.df)) * 100,
-                'indices': self.df[outlier_mask].index.tolist()
+                'percentage': (outlier_count / len(self.df)) * 100 if len(self.df) else np.nan,
+                'rows': RowMask(bitmaps[col], len(self.df), self.df.index)
             }
+            if return_indices:
+                outliers[col]['indices'] = engine.outlier_indices(col, method, threshold).tolist()
         
         return outliers
     
@@ -313,26 +348,75 @@ class DataProcessor:
         Initialize DataProcessor
         
         Args:
-            file_path: Path to the Excel file
+            file_path: Path to the data file (.xlsx/.xls, .csv or .parquet)
         """
         self.loader = DataLoader(file_path)
         self.cleaner: Optional[DataCleaner] = None
         self.processed_data: Optional[pd.DataFrame] = None
     
+    def _apply_filters(self, df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
+        """
+        Keep only rows matching the requested countries, indicators and time range
+        
+        Columns are matched by name ignoring case, spaces and underscores, and
+        category values ignoring case and surrounding whitespace.
+        
+        Args:
+            df: Raw data
+            filters: Dictionary with optional 'country', 'indicator' (lists),
+                'start' and 'end' (date strings, inclusive)
+        
+        Returns:
+            Filtered DataFrame
+        """
+        columns = {str(col).lower().replace(' ', '').replace('_', ''): col for col in df.columns}
+        mask = pd.Series(True, index=df.index)
+        
+        for key in ('country', 'indicator'):
+            values = filters.get(key)
+            if values:
+                if key not in columns:
+                    raise ValueError(f"Cannot filter by {key}: no such column")
+                wanted = {str(v).strip().lower() for v in values}
+                mask &= df[columns[key]].astype(str).str.strip().str.lower().isin(wanted)
+        
+        if filters.get('start') or filters.get('end'):
+            time_col = columns.get('time') or columns.get('date')
+            if time_col is None:
+                raise ValueError("Cannot filter by time range: no time/date column")
+            dates = pd.to_datetime(df[time_col], errors='coerce')
+            if filters.get('start'):
+                mask &= dates >= pd.Timestamp(filters['start'])
+            if filters.get('end'):
+                mask &= dates <= pd.Timestamp(filters['end'])
+        
+        return df[mask].reset_index(drop=True)
+    
+    @profiled()
     def process(self, sheet_name: Optional[str] = None, 
-               cleaning_config: Optional[Dict] = None) -> Tuple[pd.DataFrame, Dict]:
+               cleaning_config: Optional[Dict] = None,
+               filters: Optional[Dict] = None,
+               amount_basis: str = 'raw',
+               normalizer: Optional[Normalizer] = None) -> Tuple[pd.DataFrame, Dict]:
         """
         Complete data processing pipeline
         
         Args:
             sheet_name: Sheet name to process
             cleaning_config: Configuration for cleaning operations
+            filters: Row filters applied before cleaning (see _apply_filters)
+            amount_basis: Basis for the amount column after cleaning: 'raw',
+                'scaled', 'usd' or 'real' (see Normalizer.normalize)
+            normalizer: Normalizer with FX/deflator tables (default: one without)
         
         Returns:
             Tuple of (processed DataFrame, processing report)
         """
         # Load data
         raw_data = self.loader.load_primary_sheet(sheet_name)
+        if filters:
+            raw_data = self._apply_filters(raw_data, filters)
+            self.loader.raw_data = raw_data
         summary = self.loader.get_dataset_summary()
         
         # Initialize cleaner
@@ -389,10 +473,21 @@ class DataProcessor:
         # Get processed data
         self.processed_data = self.cleaner.get_cleaned_data()
         
+        # Put amounts on a common unit/currency basis (the raw basis only reports coverage)
+        normalization_report = None
+        if {'unit', 'currency', 'country', 'time', 'amount'}.issubset(self.processed_data.columns):
+            normalizer = normalizer or Normalizer()
+            self.processed_data = normalizer.normalize(self.processed_data, basis=amount_basis)
+            normalization_report = normalizer.get_report()
+        elif amount_basis != 'raw':
+            raise ValueError("Amount normalization needs unit, currency, country, time and amount columns")
+        
         # Generate report
         report = {
             'original_summary': summary,
             'cleaning_report': self.cleaner.get_cleaning_report(),
+            'filters': filters or {},
+            'normalization': normalization_report,
             'processing_successful': True
         }
         
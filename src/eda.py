@@ -2,35 +2,80 @@
 Exploratory Data Analysis Module
 Provides comprehensive EDA capabilities including distributions, correlations, trends, and outliers
 """
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style for better-looking plots
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 10
+try:
+    from .cube import AggregateCube
+    from .outliers import OutlierEngine
+    from .profiling import profiled
+    from .rendering import PlotRenderer, PlotSpec
+    from .rolling import rolling_statistics
+    from .stats_cache import StatisticsCache
+    from .trends import series_trends
+except ImportError:
+    from cube import AggregateCube
+    from outliers import OutlierEngine
+    from profiling import profiled
+    from rendering import PlotRenderer, PlotSpec
+    from rolling import rolling_statistics
+    from stats_cache import StatisticsCache
+    from trends import series_trends
+
+# Plot style overrides (the renderer applies the whitegrid base style)
+PLOT_RC = {'font.size': 10}
 
 
 class EDAAnalyzer:
     """Comprehensive EDA analysis class"""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, render_preset: str = 'publication',
+                 n_workers: Optional[int] = None, cube: Optional[AggregateCube] = None):
         """
         Initialize EDA Analyzer
         
         Args:
             df: DataFrame to analyze
+            render_preset: Plot output preset ('draft', 'web', 'publication', 'vector')
+            n_workers: Plot rendering worker processes (default: CPU count, 1 renders inline)
+            cube: Prebuilt aggregate cube for df (built on demand if not given)
         """
         self.df = df.copy()
         self.numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
         self.categorical_cols = self.df.select_dtypes(include=['object']).columns.tolist()
         self.datetime_cols = self.df.select_dtypes(include=['datetime64']).columns.tolist()
         self.insights: List[Dict] = []
+        self.stats_cache = StatisticsCache(self.df)
+        self.outlier_engine = OutlierEngine(self.df, self.numeric_cols, self.stats_cache)
+        self.stage_timings: Dict[str, float] = {}
+        self.render_preset = render_preset
+        self.n_workers = n_workers
+        self.render_stats: List[Dict] = []
+        self._cubes: Dict[tuple, AggregateCube] = {}
+        if cube is not None:
+            self._cubes[(cube.date_column, cube.value_column)] = cube
+    
+    def _get_cube(self, date_column: str, value_column: str) -> AggregateCube:
+        """Get the aggregate cube for a date/value column pair, building it once"""
+        key = (date_column, value_column)
+        if key not in self._cubes:
+            self._cubes[key] = AggregateCube(self.df, date_column, value_column).build()
+        return self._cubes[key]
+    
+    def _render(self, specs: List[PlotSpec], save_path: str) -> List[str]:
+        """Render plot specs on the worker pool and record throughput"""
+        if not specs:
+            return []
+        
+        with PlotRenderer(save_path, self.render_preset, self.n_workers) as renderer:
+            paths = renderer.render(specs)
+        self.render_stats.append(renderer.get_stats())
+        return paths
     
     def get_basic_statistics(self) -> Dict:
         """
@@ -41,7 +86,7 @@ class EDAAnalyzer:
         """
         stats = {
             'shape': self.df.shape,
-            'numeric_summary': self.df[self.numeric_cols].describe().to_dict() if self.numeric_cols else {},
+            'numeric_summary': self.stats_cache.describe(self.numeric_cols) if self.numeric_cols else {},
             'categorical_summary': {},
             'memory_usage_mb': self.df.memory_usage(deep=True).sum() / 1024**2
         }
@@ -56,6 +101,7 @@ class EDAAnalyzer:
         
         return stats
     
+    @profiled()
     def analyze_distributions(self, save_path: Optional[str] = None) -> Dict:
         """
         Analyze and plot distributions of numeric columns
@@ -67,51 +113,39 @@ class EDAAnalyzer:
             Dictionary with distribution statistics
         """
         distribution_stats = {}
+        moments = self.stats_cache.moments(self.numeric_cols)
         
         for col in self.numeric_cols:
-            data = self.df[col].dropna()
-            
-            # Calculate distribution metrics
-            skewness = data.skew()
-            kurtosis = data.kurtosis()
+            # Distribution metrics come from the shared statistics cache
+            skewness = moments.at[col, 'skewness']
+            kurtosis = moments.at[col, 'kurtosis']
+            mean, median = moments.at[col, 'mean'], moments.at[col, 'median']
             
             distribution_stats[col] = {
-                'mean': data.mean(),
-                'median': data.median(),
-                'std': data.std(),
+                'mean': mean,
+                'median': median,
+                'std': moments.at[col, 'std'],
                 'skewness': skewness,
                 'kurtosis': kurtosis,
                 'distribution_type': self._classify_distribution(skewness, kurtosis)
             }
             
-            # Create distribution plot
-            fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-            
-            # Histogram with KDE
-            axes[0].hist(data, bins=30, edgecolor='black', alpha=0.7, color='steelblue')
-            axes[0].axvline(data.mean(), color='red', linestyle='--', label=f'Mean: {data.mean():.2f}')
-            axes[0].axvline(data.median(), color='green', linestyle='--', label=f'Median: {data.median():.2f}')
-            axes[0].set_title(f'Distribution of {col}', fontsize=12, fontweight='bold')
-            axes[0].set_xlabel(col)
-            axes[0].set_ylabel('Frequency')
-            axes[0].legend()
-            axes[0].grid(True, alpha=0.3)
-            
-            # Q-Q plot for normality check
-            from scipy import stats as scipy_stats
-            scipy_stats.probplot(data, dist="norm", plot=axes[1])
-            axes[1].set_title(f'Q-Q Plot: {col}', fontsize=12, fontweight='bold')
-            axes[1].grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            
-            if save_path:
-                plt.savefig(f"{save_path}/distribution_{col}.png", dpi=300, bbox_inches='tight')
-            
-            plt.close()
+        if save_path:
+            self._render(self._distribution_plot_specs(), save_path)
         
         return distribution_stats
     
+    def _distribution_plot_specs(self) -> List[PlotSpec]:
+        """Build one histogram/Q-Q plot spec per numeric column"""
+        moments = self.stats_cache.moments(self.numeric_cols)
+        return [
+            PlotSpec('distribution_qq', f'eda_distribution_{col}',
+                     data={'values': self.df[col].dropna().to_numpy(),
+                           'mean': moments.at[col, 'mean'], 'median': moments.at[col, 'median']},
+                     params={'column': col}, figsize=(14, 5), rc=PLOT_RC)
+            for col in self.numeric_cols
+        ]
+    
     def _classify_distribution(self, skewness: float, kurtosis: float) -> str:
         """Classify distribution based on skewness and kurtosis"""
         if abs(skewness) < 0.5:
@@ -124,6 +158,7 @@ class EDAAnalyzer:
         else:
             return "Left-skewed (negative skew)"
     
+    @profiled()
     def analyze_correlations(self, save_path: Optional[str] = None) -> pd.DataFrame:
         """
         Analyze correlations between numeric variables
@@ -137,20 +172,11 @@ class EDAAnalyzer:
         if len(self.numeric_cols) < 2:
             return pd.DataFrame()
         
-        corr_matrix = self.df[self.numeric_cols].corr()
+        corr_matrix = self.stats_cache.correlation(self.numeric_cols)
         
         # Create correlation heatmap
-        plt.figure(figsize=(12, 10))
-        mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-        sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', cmap='coolwarm',
-                   center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8})
-        plt.title('Correlation Heatmap of Numeric Variables', fontsize=14, fontweight='bold', pad=20)
-        plt.tight_layout()
-        
         if save_path:
-            plt.savefig(f"{save_path}/correlation_heatmap.png", dpi=300, bbox_inches='tight')
-        
-        plt.close()
+            self._render(self._correlation_plot_specs(), save_path)
         
         # Find strong correlations
         strong_corrs = []
@@ -173,6 +199,17 @@ class EDAAnalyzer:
         
         return corr_matrix
     
+    def _correlation_plot_specs(self) -> List[PlotSpec]:
+        """Build the correlation heatmap spec"""
+        if len(self.numeric_cols) < 2:
+            return []
+        
+        return [PlotSpec('correlation_heatmap', 'eda_correlation_heatmap',
+                         data={'corr_matrix': self.stats_cache.correlation(self.numeric_cols)},
+                         params={'title': 'Correlation Heatmap of Numeric Variables'},
+                         figsize=(12, 10), rc=PLOT_RC)]
+    
+    @profiled()
     def analyze_trends(self, date_column: Optional[str] = None, 
                       value_columns: Optional[List[str]] = None,
                       save_path: Optional[str] = None) -> Dict:
@@ -193,73 +230,89 @@ class EDAAnalyzer:
             if value_columns is None:
                 value_columns = self.numeric_cols[:5]  # Analyze top 5 numeric columns
             
+            present_cols = [col for col in value_columns if col in self.df.columns]
+            moments = self.stats_cache.moments(present_cols) if present_cols else None
+            
+            # Plot and smooth in date order (rows arrive grouped by series)
+            order = np.argsort(pd.to_datetime(self.df[date_column]).to_numpy(), kind='stable')
+            dates = self.df[date_column].to_numpy()[order]
+            
+            specs = []
             for col in value_columns:
                 if col in self.df.columns:
-                    # Create trend plot
-                    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
-                    
-                    # Time series plot
-                    axes[0].plot(self.df[date_column], self.df[col], linewidth=2, color='steelblue')
-                    axes[0].set_title(f'Trend Analysis: {col} over Time', fontsize=12, fontweight='bold')
-                    axes[0].set_xlabel('Date')
-                    axes[0].set_ylabel(col)
-                    axes[0].grid(True, alpha=0.3)
-                    
-                    # Rolling average
+                    # Build trend plot spec; data is reduced here, drawn in the render pool
+                    values = self.df[col].to_numpy(dtype=np.float64)[order]
+                    rolling_mean, window = None, None
                     if len(self.df) > 12:
                         window = min(12, len(self.df) // 4)
-                        rolling_mean = self.df[col].rolling(window=window).mean()
-                        axes[0].plot(self.df[date_column], rolling_mean, 
-                                   color='red', linestyle='--', linewidth=2, label=f'{window}-period moving average')
-                        axes[0].legend()
+                        rolling_mean = rolling_statistics(values, window, statistics=('mean',))['mean']
                     
-                    # Monthly/Yearly aggregation if applicable
+                    # Yearly aggregation from the cube
+                    yearly_mean = None
                     try:
-                        self.df['year'] = pd.to_datetime(self.df[date_column]).dt.year
-                        yearly_agg = self.df.groupby('year')[col].agg(['mean', 'sum'])
-                        
-                        axes[1].bar(yearly_agg.index, yearly_agg['mean'], color='steelblue', alpha=0.7)
-                        axes[1].set_title(f'Yearly Average: {col}', fontsize=12, fontweight='bold')
-                        axes[1].set_xlabel('Year')
-                        axes[1].set_ylabel(f'Average {col}')
-                        axes[1].grid(True, alpha=0.3, axis='y')
-                    except:
+                        yearly_mean = self._get_cube(date_column, col).rollup(['year'])['mean']
+                    except Exception:
                         pass
                     
-                    plt.tight_layout()
-                    
-                    if save_path:
-                        plt.savefig(f"{save_path}/trend_{col}.png", dpi=300, bbox_inches='tight')
-                    
-                    plt.close()
+                    specs.append(PlotSpec(
+                        'trend', f'trend_{col}',
+                        data={'dates': dates, 'values': values,
+                              'rolling_mean': rolling_mean, 'yearly_mean': yearly_mean},
+                        params={'column': col, 'window': window}, figsize=(14, 10), rc=PLOT_RC
+                    ))
                     
                     # Calculate trend statistics
                     trend_results[col] = {
-                        'mean': self.df[col].mean(),
-                        'std': self.df[col].std(),
-                        'min': self.df[col].min(),
-                        'max': self.df[col].max(),
-                        'trend_direction': self._calculate_trend_direction(self.df[col])
+                        'mean': moments.at[col, 'mean'],
+                        'std': moments.at[col, 'std'],
+                        'min': moments.at[col, 'min'],
+                        'max': moments.at[col, 'max'],
+                        **self._calculate_trend(date_column, col)
                     }
+            
+            if save_path:
+                self._render(specs, save_path)
         
         return trend_results
     
-    def _calculate_trend_direction(self, series: pd.Series) -> str:
-        """Calculate overall trend direction"""
-        if len(series) < 2:
-            return "Insufficient data"
-        
-        # Simple linear regression slope
-        x = np.arange(len(series))
-        slope = np.polyfit(x, series.values, 1)[0]
-        
-        if slope > 0:
-            return "Increasing"
-        elif slope < 0:
-            return "Decreasing"
-        else:
-            return "Stable"
+    @profiled()
+    def analyze_series_trends(self, date_column: str, value_column: str,
+                              keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Estimate OLS and Mann-Kendall/Sen trends for every series over time
+        
+        Args:
+            date_column: Name of date column
+            value_column: Column to estimate trends for
+            keys: Columns identifying a series (default: country and indicator when present)
+        
+        Returns:
+            DataFrame with one row per series (see trends.series_trends)
+        """
+        if keys is None:
+            keys = [key for key in ('country', 'indicator') if key in self.df.columns]
+        return series_trends(self.df, date_column, value_column, keys=keys)
     
+    def _calculate_trend(self, date_column: str, column: str) -> Dict:
+        """Calculate the overall trend over time and the direction of each series"""
+        overall = self.analyze_series_trends(date_column, column, keys=[])
+        if overall.empty:
+            return {'trend_direction': 'Insufficient data'}
+        
+        trend = overall.iloc[0]
+        result = {
+            'trend_direction': trend['direction'],
+            'slope_per_year': trend['slope'],
+            'slope_se': trend['slope_se'],
+            'sen_slope_per_year': trend['sen_slope'],
+            'mann_kendall_p_value': trend['mk_p_value']
+        }
+        per_series = self.analyze_series_trends(date_column, column)
+        if len(per_series) > 1:
+            result['series_directions'] = per_series['direction'].value_counts().to_dict()
+        return result
+    
+    @profiled()
     def detect_outliers(self, method: str = 'iqr') -> Dict:
         """
         Detect outliers using multiple methods
@@ -271,30 +324,19 @@ class EDAAnalyzer:
             Dictionary with outlier information
         """
         outlier_results = {}
+        summary = self.outlier_engine.summarize(method, threshold=3.0)
         
         for col in self.numeric_cols:
-            data = self.df[col].dropna()
-            
-            if method == 'iqr':
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outliers = data[(data < lower_bound) | (data > upper_bound)]
-            
-            elif method == 'zscore':
-                z_scores = np.abs((data - data.mean()) / data.std())
-                outliers = data[z_scores > 3]
-            
+            n_outliers = int(summary.at[col, 'count'])
             outlier_results[col] = {
-                'count': len(outliers),
-                'percentage': (len(outliers) / len(data)) * 100,
-                'outlier_values': outliers.tolist()[:10]  # Top 10 outliers
+                'count': n_outliers,
+                'percentage': (n_outliers / summary.at[col, 'valid_count']) * 100,
+                'outlier_values': self.outlier_engine.outlier_values(col, method, threshold=3.0)  # Top 10 outliers
             }
         
         return outlier_results
     
+    @profiled()
     def analyze_seasonality(self, date_column: Optional[str] = None,
                            value_column: Optional[str] = None) -> Dict:
         """
@@ -317,22 +359,19 @@ class EDAAnalyzer:
             return {}
         
         try:
-            df_temp = self.df[[date_column, value_column]].copy()
-            df_temp[date_column] = pd.to_datetime(df_temp[date_column])
-            df_temp['month'] = df_temp[date_column].dt.month
-            df_temp['quarter'] = df_temp[date_column].dt.quarter
-            df_temp['year'] = df_temp[date_column].dt.year
+            cube = self._get_cube(date_column, value_column)
             
             seasonality = {
-                'monthly_pattern': df_temp.groupby('month')[value_column].mean().to_dict(),
-                'quarterly_pattern': df_temp.groupby('quarter')[value_column].mean().to_dict(),
-                'yearly_pattern': df_temp.groupby('year')[value_column].mean().to_dict()
+                'monthly_pattern': cube.rollup(['month'])['mean'].to_dict(),
+                'quarterly_pattern': cube.rollup(['quarter'])['mean'].to_dict(),
+                'yearly_pattern': cube.rollup(['year'])['mean'].to_dict()
             }
             
             return seasonality
         except Exception as e:
             return {'error': str(e)}
     
+    @profiled()
     def generate_top_insights(self, top_n: int = 10) -> List[Dict]:
         """
         Generate top non-obvious insights from EDA
@@ -356,8 +395,9 @@ class EDAAnalyzer:
             })
         
         # Insight 2: Distribution patterns
+        moments = self.stats_cache.moments(self.numeric_cols)
         for col in self.numeric_cols[:3]:
-            skew = self.df[col].skew()
+            skew = moments.at[col, 'skewness']
             if abs(skew) > 1:
                 insights.append({
                     'rank': len(insights) + 1,
@@ -368,7 +408,7 @@ class EDAAnalyzer:
         
         # Insight 3: Correlation insights
         if len(self.numeric_cols) >= 2:
-            corr_matrix = self.df[self.numeric_cols].corr()
+            corr_matrix = self.stats_cache.correlation(self.numeric_cols)
             max_corr = corr_matrix.unstack().sort_values(ascending=False)
             max_corr = max_corr[max_corr < 1.0].iloc[0]
             if abs(max_corr) > 0.8:
@@ -385,23 +425,106 @@ class EDAAnalyzer:
         
         return insights[:top_n]
     
-    def generate_eda_report(self, save_path: Optional[str] = None) -> Dict:
+    @profiled()
+    def generate_eda_report(self, save_path: Optional[str] = None,
+                            n_workers: Optional[int] = None) -> Dict:
         """
         Generate comprehensive EDA report
         
+        Statistics are computed once up front. Plot specs for every section
+        are then fanned out to the render pool, and the sections themselves
+        are computed concurrently on a thread pool, so total time is bounded
+        by the slowest section rather than their sum.
+        
         Args:
             save_path: Path to save plots and report
+            n_workers: Worker processes for plot rendering (default: analyzer setting)
         
         Returns:
             Dictionary with complete EDA report
         """
-        report = {
-            'basic_statistics': self.get_basic_statistics(),
-            'distributions': self.analyze_distributions(save_path),
-            'correlations': self.analyze_correlations(save_path),
-            'outliers': self.detect_outliers(),
-            'top_insights': self.generate_top_insights(10)
+        report_start = time.perf_counter()
+        
+        # Warm the statistics cache; every section below reads from it
+        if self.numeric_cols:
+            self.stats_cache.moments(self.numeric_cols)
+            if len(self.numeric_cols) >= 2:
+                self.stats_cache.correlation(self.numeric_cols)
+        self.stage_timings['statistics'] = time.perf_counter() - report_start
+        
+        plot_specs = {
+            'distributions': self._distribution_plot_specs() if save_path else [],
+            'correlations': self._correlation_plot_specs() if save_path else []
+        }
+        n_specs = sum(len(specs) for specs in plot_specs.values())
+        if n_workers is None:
+            n_workers = self.n_workers
+        
+        fan_out_start = time.perf_counter()
+        completed_at: Dict[str, float] = {}
+        render_seconds = {name: 0.0 for name in plot_specs}
+        
+        def mark_done(section):
+            def callback(future):
+                completed_at[section] = max(completed_at.get(section, 0.0), time.perf_counter())
+                if future.exception() is None:
+                    render_seconds[section] += future.result()['seconds']
+            return callback
+        
+        renderer = PlotRenderer(save_path, self.render_preset, n_workers) if n_specs else None
+        try:
+            futures = []
+            if renderer is not None:
+                for section, specs in plot_specs.items():
+                    for spec in specs:
+                        future = renderer.submit(spec)
+                        future.add_done_callback(mark_done(section))
+                        futures.append(future)
+            
+            # Sections are computed without plots, concurrently; rendering happens in the process pool
+            stages = {
+                'basic_statistics': self.get_basic_statistics,
+                'distributions': lambda: self.analyze_distributions(None),
+                'correlations': lambda: self.analyze_correlations(None),
+                'outliers': self.detect_outliers,
+                'top_insights': lambda: self.generate_top_insights(10)
+            }
+            
+            def timed(stage):
+                start = time.perf_counter()
+                result = stage()
+                return result, time.perf_counter() - start, time.perf_counter()
+            
+            report = {}
+            compute_seconds = {}
+            with ThreadPoolExecutor(max_workers=len(stages)) as sections:
+                section_futures = {name: sections.submit(timed, stage) for name, stage in stages.items()}
+                for name, future in section_futures.items():
+                    report[name], compute_seconds[name], finished = future.result()
+                    completed_at[name] = max(completed_at.get(name, 0.0), finished)
+            
+            for future in futures:
+                future.result()
+        finally:
+            if renderer is not None:
+                renderer.close()
+                self.render_stats.append(renderer.get_stats())
+        
+        section_timings = {}
+        for name in report:
+            section_timings[name] = {
+                'compute_seconds': compute_seconds[name],
+                'render_seconds': render_seconds.get(name, 0.0),
+                'wall_seconds': completed_at[name] - fan_out_start
+            }
+            self.stage_timings[name] = section_timings[name]['wall_seconds']
+        
+        report['performance'] = {
+            'total_seconds': time.perf_counter() - report_start,
+            'rendering': renderer.get_stats() if renderer is not None else None,
+            'section_timings': section_timings,
+            'stage_timings_seconds': dict(self.stage_timings),
+            'statistics_cache': self.stats_cache.get_cache_info()
         }
         
         return report
-
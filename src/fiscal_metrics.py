@@ -0,0 +1,180 @@
+"""
+Fiscal Metrics Module
+Deficit, debt and revenue ratios, primary balance and debt dynamics per country and year
+"""
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .normalization import Normalizer, UNIT_KINDS, canonical_unit, harmonize_frequency
+    from .profiling import profiled
+except ImportError:
+    from normalization import Normalizer, UNIT_KINDS, canonical_unit, harmonize_frequency
+    from profiling import profiled
+
+# Metric name -> indicator in the long table
+FISCAL_INDICATORS = {
+    'balance': 'Budget Deficit/Surplus',
+    'revenue': 'Revenue',
+    'expenditure': 'Expenditure',
+    'debt': 'Government Debt',
+    'gdp': 'Nominal GDP',
+    'interest_rate': 'Interest Rate'
+}
+# Percentages averaged over the year (no scale or currency)
+RATES = ('interest_rate',)
+
+
+def annualize(df: pd.DataFrame, indicators: Optional[Dict[str, str]] = None,
+              date_column: str = 'time', value_column: str = 'amount') -> pd.DataFrame:
+    """
+    Reduce each country's fiscal indicators to one value per year, in millions
+
+    Amounts are scaled to millions before aggregating, so Million and Billion
+    rows of one series mix correctly, then harmonized to years (see
+    normalization.harmonize_frequency): yearly figures win, flows are summed
+    over complete years and debt takes its year-end level. Rates must be in
+    '%' and amounts in a known currency unit; other rows are ignored.
+
+    Args:
+        df: Long DataFrame with country, indicator, unit, currency and frequency columns
+        indicators: Metric name -> indicator name (default: FISCAL_INDICATORS)
+        date_column: Date column
+        value_column: Value column
+
+    Returns:
+        DataFrame indexed by (country, year) with a value column per metric
+        (millions of currency; percent for rates) and a '<metric>_currency'
+        column per amount metric
+    """
+    indicators = indicators or FISCAL_INDICATORS
+    metric_of = {indicator: metric for metric, indicator in indicators.items()}
+    data = df[df['indicator'].isin(metric_of)]
+    kind = canonical_unit(data['unit']).map(UNIT_KINDS)
+    is_rate = data['indicator'].map(metric_of).isin(RATES)
+    data = data[np.where(is_rate, kind == 'percent', kind == 'amount')]
+
+    scaled = Normalizer().normalize(data, basis='scaled', date_column=date_column, value_column=value_column)
+    annual = harmonize_frequency(scaled, 'Yearly', date_column, value_column, keys=('country', 'indicator'))
+    metric = annual['indicator'].map(metric_of)
+    index = pd.MultiIndex.from_arrays([annual['country'], annual['period'].dt.year, metric],
+                                      names=['country', 'year', 'metric'])
+    wide = pd.Series(annual[value_column].to_numpy(), index=index).unstack('metric')
+    currencies = pd.Series(annual['currency'].astype(str).to_numpy(), index=index).unstack('metric')
+    amounts = [name for name in wide.columns if name not in RATES]
+    currencies = currencies[amounts].add_suffix('_currency')
+    return pd.concat([wide, currencies], axis=1).sort_index()
+
+
+def _lagged(frame: pd.DataFrame) -> pd.DataFrame:
+    """Previous year's row for each (country, year), aligned by joining on year + 1"""
+    shifted = frame.copy()
+    shifted.index = pd.MultiIndex.from_arrays([frame.index.get_level_values('country'),
+                                               frame.index.get_level_values('year') + 1],
+                                              names=frame.index.names)
+    return shifted.reindex(frame.index)
+
+
+def _ratio(annual: pd.DataFrame, numerator: str, denominator: str) -> pd.Series:
+    """numerator / denominator where both exist in the same currency and the denominator is non-zero"""
+    if numerator not in annual or denominator not in annual:
+        return pd.Series(np.nan, index=annual.index)
+    same_currency = annual[f'{numerator}_currency'] == annual[f'{denominator}_currency']
+    denominator_values = annual[denominator].where(same_currency & (annual[denominator] != 0))
+    return annual[numerator] / denominator_values
+
+
+@profiled()
+def fiscal_metrics(df: pd.DataFrame, indicators: Optional[Dict[str, str]] = None,
+                   date_column: str = 'time', value_column: str = 'amount') -> pd.DataFrame:
+    """
+    Compute fiscal sustainability metrics per country and year
+
+    Ratios are only formed between amounts in the same currency (e.g. debt in
+    USD is not divided by GDP in local currency). Where the budget balance is
+    not reported it is taken as revenue minus expenditure. The dataset has no
+    interest payments, so they are estimated as the average interest rate
+    times the previous year's debt; the primary balance and the
+    debt-stabilizing primary balance ((r - g) / (1 + g) x previous debt/GDP,
+    with nominal r and g) build on that estimate.
+
+    Args:
+        df: Long DataFrame (see annualize)
+        indicators: Metric name -> indicator name (default: FISCAL_INDICATORS)
+        date_column: Date column
+        value_column: Value column
+
+    Returns:
+        DataFrame indexed by (country, year) with the annual amounts (millions of
+        currency) and: balance_to_gdp, deficit_to_gdp, debt_to_gdp,
+        revenue_to_gdp, expenditure_to_gdp (percent of GDP),
+        revenue_to_expenditure, nominal_gdp_growth, interest_payments,
+        primary_balance, primary_balance_to_gdp,
+        debt_stabilizing_primary_balance and primary_balance_gap (percent of GDP)
+    """
+    annual = annualize(df, indicators, date_column, value_column)
+    for name in FISCAL_INDICATORS:
+        if name not in annual:
+            annual[name] = np.nan
+            if name not in RATES:
+                annual[f'{name}_currency'] = None
+
+    # Fill a missing balance from revenue - expenditure (same currency only)
+    derived = (annual['revenue'] - annual['expenditure']).where(
+        annual['revenue_currency'] == annual['expenditure_currency'])
+    missing = annual['balance'].isna() & derived.notna()
+    annual['balance'] = annual['balance'].where(~missing, derived)
+    annual['balance_currency'] = annual['balance_currency'].where(~missing, annual['revenue_currency'])
+    annual['balance_derived'] = missing
+
+    metrics = annual.copy()
+    metrics['balance_to_gdp'] = _ratio(annual, 'balance', 'gdp') * 100
+    metrics['deficit_to_gdp'] = -metrics['balance_to_gdp']
+    metrics['debt_to_gdp'] = _ratio(annual, 'debt', 'gdp') * 100
+    metrics['revenue_to_gdp'] = _ratio(annual, 'revenue', 'gdp') * 100
+    metrics['expenditure_to_gdp'] = _ratio(annual, 'expenditure', 'gdp') * 100
+    metrics['revenue_to_expenditure'] = _ratio(annual, 'revenue', 'expenditure')
+
+    previous = _lagged(metrics[['gdp', 'gdp_currency', 'debt', 'debt_currency', 'debt_to_gdp']])
+    same_gdp_currency = previous['gdp_currency'] == annual['gdp_currency']
+    growth = annual['gdp'] / previous['gdp'].where(same_gdp_currency & (previous['gdp'] != 0)) - 1
+    metrics['nominal_gdp_growth'] = growth * 100
+
+    # Interest on last year's debt; the primary balance excludes it
+    rate = annual['interest_rate'] / 100
+    interest = rate * previous['debt'].where(previous['debt_currency'] == annual['balance_currency'])
+    metrics['interest_payments'] = interest
+    metrics['primary_balance'] = annual['balance'] + interest
+    same_currency = annual['balance_currency'] == annual['gdp_currency']
+    metrics['primary_balance_to_gdp'] = metrics['primary_balance'] / annual['gdp'].where(same_currency) * 100
+
+    # Primary balance (% of GDP) that keeps debt/GDP constant
+    metrics['debt_stabilizing_primary_balance'] = (rate - growth) / (1 + growth) * previous['debt_to_gdp']
+    metrics['primary_balance_gap'] = metrics['primary_balance_to_gdp'] - metrics['debt_stabilizing_primary_balance']
+    return metrics.replace([np.inf, -np.inf], np.nan)
+
+
+def latest_fiscal_position(metrics: pd.DataFrame,
+                           columns=('deficit_to_gdp', 'debt_to_gdp', 'revenue_to_expenditure',
+                                    'primary_balance_to_gdp', 'debt_stabilizing_primary_balance',
+                                    'primary_balance_gap')) -> pd.DataFrame:
+    """
+    Latest year with a value for each metric, per country
+
+    Args:
+        metrics: Output of fiscal_metrics
+        columns: Metrics to report
+
+    Returns:
+        DataFrame indexed by country with each metric and the year it refers to
+    """
+    columns = [col for col in columns if col in metrics]
+    stacked = metrics[columns].stack().rename('value').reset_index()
+    stacked.columns = ['country', 'year', 'metric', 'value']
+    latest = stacked.sort_values('year').groupby(['country', 'metric']).tail(1)
+    values = latest.pivot(index='country', columns='metric', values='value')[columns]
+    years = latest.pivot(index='country', columns='metric', values='year')[columns].add_suffix('_year')
+    return pd.concat([values, years], axis=1)
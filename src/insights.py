@@ -13,6 +13,19 @@ from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .outliers import OutlierEngine
+    from .profiling import profiled
+    from .results import LabelResult, RowMask, ScoreResult
+    from .panel import correlation_significance, grouped_correlation_significance, series_normality
+    from .rolling import add_rolling_features
+except ImportError:
+    from outliers import OutlierEngine
+    from profiling import profiled
+    from results import LabelResult, RowMask, ScoreResult
+    from panel import correlation_significance, grouped_correlation_significance, series_normality
+    from rolling import add_rolling_features
+
 
 class FeatureEngineer:
     """Handles feature engineering operations"""
@@ -77,35 +90,30 @@ class FeatureEngineer:
         
         return self.df
     
-    def create_rolling_features(self, columns: List[str], windows: List[int] = [3, 6, 12]) -> pd.DataFrame:
+    def create_rolling_features(self, columns: List[str], windows: List[int] = [3, 6, 12],
+                                by: Optional[List[str]] = None,
+                                order_by: Optional[str] = None) -> pd.DataFrame:
         """
         Create rolling window features
         
         Args:
             columns: List of column names
             windows: List of window sizes
+            by: Series key columns (e.g. ['country', 'indicator']) so windows stay
+                within a series; None rolls over all rows
+            order_by: Column giving time order within each series (None keeps row order)
         
         Returns:
             DataFrame with rolling features added
         """
-        for col in columns:
-            if col in self.df.columns:
-                for window in windows:
-                    # Rolling mean
-                    self.df[f'{col}_rolling_mean_{window}'] = self.df[col].rolling(window=window).mean()
-                    # Rolling std
-                    self.df[f'{col}_rolling_std_{window}'] = self.df[col].rolling(window=window).std()
-                    # Rolling max
-                    self.df[f'{col}_rolling_max_{window}'] = self.df[col].rolling(window=window).max()
-                    # Rolling min
-                    self.df[f'{col}_rolling_min_{window}'] = self.df[col].rolling(window=window).min()
-                    
-                    self.engineered_features.extend([
-                        f'{col}_rolling_mean_{window}',
-                        f'{col}_rolling_std_{window}',
-                        f'{col}_rolling_max_{window}',
-                        f'{col}_rolling_min_{window}'
-                    ])
+        columns = [col for col in columns if col in self.df.columns]
+        statistics = ('mean', 'std', 'max', 'min')
+        # One vectorized sweep per column and window instead of four pandas rolling passes
+        add_rolling_features(self.df, columns, windows, by=by, order_by=order_by, statistics=statistics)
+        self.engineered_features.extend(
+            f'{col}_rolling_{statistic}_{window}'
+            for col in columns for window in windows for statistic in statistics
+        )
         
         return self.df
     
@@ -164,6 +172,7 @@ class ClusteringAnalyzer:
         self.scaler = StandardScaler()
         self.clusters: Optional[np.ndarray] = None
     
+    @profiled()
     def perform_kmeans_clustering(self, n_clusters: int = 3, 
                                   columns: Optional[List[str]] = None) -> Dict:
         """
@@ -174,7 +183,8 @@ class ClusteringAnalyzer:
             columns: Columns to use for clustering (default: all numeric)
         
         Returns:
-            Dictionary with clustering results
+            Dictionary with clustering results (cluster_labels is a LabelResult;
+            call to_array() for the per-row labels)
         """
         if columns is None:
             columns = self.df.select_dtypes(include=[np.number]).columns.tolist()
@@ -209,9 +219,10 @@ class ClusteringAnalyzer:
             'n_clusters': n_clusters,
             'inertia': kmeans.inertia_,
             'cluster_analysis': cluster_analysis,
-            'cluster_labels': clusters.tolist()
+            'cluster_labels': LabelResult(clusters, X.index)
         }
     
+    @profiled()
     def perform_dbscan_clustering(self, eps: float = 0.5, min_samples: int = 5,
                                   columns: Optional[List[str]] = None) -> Dict:
         """
@@ -238,13 +249,14 @@ class ClusteringAnalyzer:
         
         # Analyze clusters
         n_clusters = len(set(clusters)) - (1 if -1 in clusters else 0)
-        n_noise = list(clusters).count(-1)
+        n_noise = int((clusters == -1).sum())
         
         cluster_analysis = {
             'method': 'DBSCAN',
             'n_clusters': n_clusters,
             'n_noise_points': n_noise,
-            'noise_percentage': (n_noise / len(clusters)) * 100 if len(clusters) > 0 else 0
+            'noise_percentage': (n_noise / len(clusters)) * 100 if len(clusters) > 0 else 0,
+            'cluster_labels': LabelResult(clusters, X.index)
         }
         
         self.clusters = clusters
@@ -263,7 +275,9 @@ class AnomalyDetector:
             df: DataFrame to analyze
         """
         self.df = df.copy()
+        self.outlier_engine = OutlierEngine(self.df)
     
+    @profiled()
     def detect_with_isolation_forest(self, contamination: float = 0.1,
                                    columns: Optional[List[str]] = None) -> Dict:
         """
@@ -274,7 +288,8 @@ class AnomalyDetector:
             columns: Columns to use for detection
         
         Returns:
-            Dictionary with anomaly detection results
+            Dictionary with anomaly detection results (anomaly_indices is a RowMask
+            and anomaly_scores a ScoreResult; both materialize rows on request)
         """
         if columns is None:
             columns = self.df.select_dtypes(include=[np.number]).columns.tolist()
@@ -291,12 +306,14 @@ class AnomalyDetector:
         
         return {
             'method': 'Isolation Forest',
-            'n_anomalies': anomaly_mask.sum(),
+            'n_anomalies': int(anomaly_mask.sum()),
             'anomaly_percentage': (anomaly_mask.sum() / len(anomalies)) * 100,
-            'anomaly_indices': X[anomaly_mask].index.tolist(),
-            'anomaly_scores': iso_forest.score_samples(X).tolist()
+            'anomaly_indices': RowMask.from_mask(anomaly_mask, X.index),
+            # Lower scores are more anomalous
+            'anomaly_scores': ScoreResult(iso_forest.score_samples(X), X.index, lower_is_extreme=True)
         }
     
+    @profiled()
     def detect_statistical_anomalies(self, columns: Optional[List[str]] = None,
                                     threshold: float = 3.0) -> Dict:
         """
@@ -313,18 +330,15 @@ class AnomalyDetector:
             columns = self.df.select_dtypes(include=[np.number]).columns.tolist()
         
         anomaly_results = {}
-        
-        for col in columns:
-            if col in self.df.columns:
-                data = self.df[col].dropna()
-                z_scores = np.abs((data - data.mean()) / data.std())
-                anomalies = data[z_scores > threshold]
-                
-                anomaly_results[col] = {
-                    'n_anomalies': len(anomalies),
-                    'anomaly_percentage': (len(anomalies) / len(data)) * 100,
-                    'anomaly_values': anomalies.tolist()[:10]  # Top 10
-                }
+        summary = self.outlier_engine.summarize('zscore', threshold, columns=columns)
+        
+        for col in summary.index:
+            n_anomalies = int(summary.at[col, 'count'])
+            anomaly_results[col] = {
+                'n_anomalies': n_anomalies,
+                'anomaly_percentage': (n_anomalies / summary.at[col, 'valid_count']) * 100,
+                'anomaly_values': self.outlier_engine.outlier_values(col, 'zscore', threshold)  # Top 10
+            }
         
         return anomaly_results
 
@@ -341,6 +355,7 @@ class HypothesisTester:
         """
         self.df = df.copy()
     
+    @profiled()
     def test_normality(self, columns: Optional[List[str]] = None) -> Dict:
         """
         Test for normality using Shapiro-Wilk test
@@ -408,6 +423,80 @@ class HypothesisTester:
             'interpretation': self._interpret_correlation(corr_coef, p_value)
         }
     
+    @profiled()
+    def test_series_normality(self, value_column: Optional[str] = None,
+                              keys: Optional[List[str]] = None, max_samples: Optional[int] = 5000,
+                              alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Test every series (e.g. each country/indicator pair) for normality at once
+        
+        Uses vectorized moment tests (Jarque-Bera and D'Agostino-Pearson K²) over
+        all series, sampling series longer than max_samples.
+        
+        Args:
+            value_column: Value column (default: first numeric column)
+            keys: Columns identifying a series (default: country and indicator, where present)
+            max_samples: Maximum observations tested per series
+            alpha: Significance level
+        
+        Returns:
+            DataFrame with one row per series (see panel.series_normality)
+        """
+        if value_column is None:
+            value_column = self.df.select_dtypes(include=[np.number]).columns[0]
+        if keys is None:
+            keys = [col for col in ('country', 'indicator') if col in self.df.columns]
+        if not keys:
+            raise ValueError("No series columns found; pass keys")
+        return series_normality(self.df, value_column, keys, max_samples=max_samples, alpha=alpha)
+    
+    @profiled()
+    def test_all_correlations(self, columns: Optional[List[str]] = None, min_periods: int = 3,
+                              alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Test correlation significance for every pair of columns in one vectorized pass
+        
+        Args:
+            columns: Columns to test (default: all numeric)
+            min_periods: Minimum overlapping observations per pair
+            alpha: False discovery rate (Benjamini-Hochberg)
+        
+        Returns:
+            DataFrame with one row per pair, most significant first
+        """
+        if columns is None:
+            columns = self.df.select_dtypes(include=[np.number]).columns.tolist()
+        columns = [col for col in columns if col in self.df.columns]
+        return correlation_significance(self.df[columns], min_periods=min_periods, alpha=alpha)
+    
+    @profiled()
+    def test_panel_correlations(self, date_column: str, value_column: str,
+                                series_column: str = 'indicator', group_column: Optional[str] = 'country',
+                                period: str = 'Y', min_periods: int = 3, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Test correlation significance for every pair of series in a long panel
+        
+        Series are aligned by period within each group and every pair is tested on
+        the periods both observe (see panel.SparsePanel), so e.g. every indicator
+        pair is tested within each country.
+        
+        Args:
+            date_column: Date column
+            value_column: Value column
+            series_column: Column identifying a series (default: indicator)
+            group_column: Column to test within (None pools all series)
+            period: Period alias used to align series ('M', 'Q', 'Y')
+            min_periods: Minimum overlapping periods per pair
+            alpha: False discovery rate (Benjamini-Hochberg over all pairs)
+        
+        Returns:
+            DataFrame with one row per pair, most significant first
+        """
+        return grouped_correlation_significance(
+            self.df, date_column, value_column, series_column, group_column,
+            period=period, min_periods=min_periods, alpha=alpha
+        )
+    
     def _interpret_correlation(self, corr: float, p_value: float) -> str:
         """Interpret correlation results"""
         if p_value >= 0.05:
@@ -442,6 +531,7 @@ class InsightMiner:
         self.hypothesis_tester = HypothesisTester(df)
         self.high_value_insights: List[Dict] = []
     
+    @profiled()
     def generate_high_value_insights(self) -> List[Dict]:
         """
         Generate high-value insights with explanations
@@ -483,19 +573,57 @@ class InsightMiner:
                 }
             })
         
-        # Insight 3: Feature relationships
-        if len(numeric_cols) >= 2:
-            corr_test = self.hypothesis_tester.test_correlation_significance(
-                numeric_cols[0], numeric_cols[1]
+        # Insight 3: Feature relationships (all pairs at once, FDR-corrected)
+        date_cols = self.df.select_dtypes(include=['datetime64']).columns.tolist()
+        pairs = None
+        if 'indicator' in self.df.columns and date_cols and numeric_cols:
+            pairs = self.hypothesis_tester.test_panel_correlations(
+                date_cols[0], numeric_cols[0],
+                group_column='country' if 'country' in self.df.columns else None
             )
-            if 'correlation_coefficient' in corr_test:
+        elif len(numeric_cols) >= 2:
+            pairs = self.hypothesis_tester.test_all_correlations(numeric_cols)
+        
+        if pairs is not None and len(pairs) > 0:
+            significant = pairs[pairs['is_significant']]
+            top_pairs = (significant if len(significant) > 0 else pairs).head(5)
+            strongest = top_pairs.iloc[0]
+            scope = f" in {strongest['country']}" if 'country' in top_pairs.columns else ''
+            insights.append({
+                'insight_number': 3,
+                'category': 'Relationships',
+                'title': 'Statistically Significant Relationships',
+                'description': f"{len(significant)} of {len(pairs)} variable pairs are significantly correlated "
+                               f"after FDR correction; strongest: {strongest['var_1']} vs {strongest['var_2']}"
+                               f"{scope} ({strongest['interpretation']})",
+                'business_impact': 'Reveals causal or predictive relationships for better decision-making',
+                'evidence': {
+                    'pairs_tested': len(pairs),
+                    'significant_pairs': len(significant),
+                    'top_pairs': top_pairs.to_dict('records')
+                }
+            })
+        
+        # Insight 4: Distribution shape across all series
+        if 'indicator' in self.df.columns and numeric_cols:
+            normality = self.hypothesis_tester.test_series_normality(numeric_cols[0])
+            tested = normality[normality['is_normal'].notna()]
+            if len(tested) > 0:
+                non_normal = int((~tested['is_normal'].astype(bool)).sum())
                 insights.append({
-                    'insight_number': 3,
-                    'category': 'Relationships',
-                    'title': 'Statistically Significant Relationships',
-                    'description': f"Found {corr_test['interpretation']} between key variables",
-                    'business_impact': 'Reveals causal or predictive relationships for better decision-making',
-                    'evidence': corr_test
+                    'insight_number': 4,
+                    'category': 'Distributions',
+                    'title': ('Most Series Are Not Normally Distributed' if non_normal > len(tested) / 2
+                              else 'Most Series Are Approximately Normal'),
+                    'description': f"{non_normal} of {len(tested)} series reject normality "
+                                   f"(D'Agostino-Pearson K², α = 0.05)",
+                    'business_impact': 'Favors median/IQR-based thresholds and robust models over mean/std assumptions',
+                    'evidence': {
+                        'series_tested': len(tested),
+                        'non_normal_series': non_normal,
+                        'median_skewness': float(tested['skewness'].median()),
+                        'median_excess_kurtosis': float(tested['excess_kurtosis'].median())
+                    }
                 })
         
         # Add more insights...
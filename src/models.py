@@ -2,6 +2,7 @@
 Predictive and Prescriptive Models Module
 Provides forecasting, regression, classification, and recommendation models
 """
+import importlib.util
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
@@ -13,19 +14,21 @@ from typing import Dict, Optional, Tuple, List
 import warnings
 warnings.filterwarnings('ignore')
 
-try:
-    from prophet import Prophet
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
-    print("Prophet not available. Install with: pip install prophet")
+# Forecasting backends are heavy (Prophet loads cmdstanpy); check for them here
+# without importing, and import only when a forecast is requested
+PROPHET_AVAILABLE = importlib.util.find_spec('prophet') is not None
+ARIMA_AVAILABLE = importlib.util.find_spec('statsmodels') is not None
 
 try:
-    from statsmodels.tsa.arima.model import ARIMA
-    ARIMA_AVAILABLE = True
+    from .profiling import profiled
+    from .resampling import DATE_OFFSETS, infer_frequency
+    from .scenarios import DEFAULT_STEPS, ScenarioEngine, country_panel
+    from .trends import series_trends
 except ImportError:
-    ARIMA_AVAILABLE = False
-    print("statsmodels not available. Install with: pip install statsmodels")
+    from profiling import profiled
+    from resampling import DATE_OFFSETS, infer_frequency
+    from scenarios import DEFAULT_STEPS, ScenarioEngine, country_panel
+    from trends import series_trends
 
 
 class ForecastingModel:
@@ -46,39 +49,51 @@ class ForecastingModel:
         self.model = None
         self.forecast_results: Optional[pd.DataFrame] = None
     
+    @profiled()
     def forecast_with_prophet(self, periods: int = 12, 
-                             freq: str = 'M') -> Dict:
+                             freq: Optional[str] = None) -> Dict:
         """
         Forecast using Facebook Prophet
         
+        Observations at the same date are averaged. Fiscal data has no
+        within-week or within-day pattern, so only yearly seasonality is
+        fitted, and only for sub-annual series.
+        
         Args:
             periods: Number of periods to forecast
-            freq: Frequency ('D', 'M', 'Y')
+            freq: Frequency ('Monthly', 'Quarterly', 'Yearly' or a pandas offset
+                alias such as 'MS'); inferred from the dates when None
         
         Returns:
             Dictionary with forecast results and metrics
         """
         if not PROPHET_AVAILABLE:
-            return {'error': 'Prophet not available'}
+            return {'error': 'Prophet not available. Install with: pip install prophet'}
         
         try:
-            # Prepare data for Prophet
+            from prophet import Prophet
+            
+            # Prepare data for Prophet: one row per date, in date order
             prophet_df = self.df[[self.date_column, self.value_column]].copy()
             prophet_df.columns = ['ds', 'y']
             prophet_df['ds'] = pd.to_datetime(prophet_df['ds'])
-            prophet_df = prophet_df.dropna()
+            prophet_df = prophet_df.dropna().groupby('ds', as_index=False)['y'].mean()
+            
+            # Seasonality follows the data's spacing; an explicit offset alias only sets the horizon step
+            frequency = freq if freq in DATE_OFFSETS else infer_frequency(prophet_df['ds']) or 'Yearly'
+            offset = DATE_OFFSETS[frequency] if freq is None or freq in DATE_OFFSETS else freq
             
             # Fit model
             self.model = Prophet(
-                yearly_seasonality=True,
-                weekly_seasonality=True,
+                yearly_seasonality=frequency != 'Yearly',
+                weekly_seasonality=False,
                 daily_seasonality=False,
                 seasonality_mode='multiplicative'
             )
             self.model.fit(prophet_df)
             
             # Make forecast
-            future = self.model.make_future_dataframe(periods=periods, freq=freq)
+            future = self.model.make_future_dataframe(periods=periods, freq=offset)
             forecast = self.model.predict(future)
             
             self.forecast_results = forecast
@@ -94,6 +109,7 @@ class ForecastingModel:
             
             return {
                 'method': 'Prophet',
+                'frequency': frequency,
                 'forecast_periods': periods,
                 'metrics': {
                     'mse': mse,
@@ -102,11 +118,31 @@ class ForecastingModel:
                     'mape': np.mean(np.abs((y_true - y_pred) / y_true)) * 100
                 },
                 'forecast_data': forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(periods).to_dict('records'),
-                'model_components': self.model.plot_components(forecast) if hasattr(self.model, 'plot_components') else None
+                # Component ranges only; plot_components() draws the figure on request
+                'model_components': {
+                    component: {
+                        'min': float(forecast[component].min()),
+                        'max': float(forecast[component].max()),
+                        'mean': float(forecast[component].mean())
+                    }
+                    for component in ('trend', 'yearly') if component in forecast.columns
+                }
             }
         except Exception as e:
             return {'error': str(e)}
     
+    def plot_components(self):
+        """
+        Plot the fitted Prophet model's components
+        
+        Returns:
+            Matplotlib figure, or None before forecast_with_prophet() has run
+        """
+        if self.model is None or self.forecast_results is None or not hasattr(self.model, 'plot_components'):
+            return None
+        return self.model.plot_components(self.forecast_results)
+    
+    @profiled()
     def forecast_with_arima(self, order: Tuple[int, int, int] = (1, 1, 1),
                            periods: int = 12) -> Dict:
         """
@@ -120,9 +156,11 @@ class ForecastingModel:
             Dictionary with forecast results
         """
         if not ARIMA_AVAILABLE:
-            return {'error': 'ARIMA not available'}
+            return {'error': 'ARIMA not available. Install with: pip install statsmodels'}
         
         try:
+            from statsmodels.tsa.arima.model import ARIMA
+            
             # Prepare data
             ts_data = self.df.set_index(self.date_column)[self.value_column].dropna()
             ts_data = ts_data.sort_index()
@@ -172,6 +210,7 @@ class RegressionModel:
         self.models = {}
         self.scaler = StandardScaler()
     
+    @profiled()
     def train_regression_model(self, target_column: str,
                               feature_columns: Optional[List[str]] = None,
                               test_size: float = 0.2,
@@ -292,6 +331,7 @@ class ClassificationModel:
         self.df = df.copy()
         self.model = None
     
+    @profiled()
     def train_classification_model(self, target_column: str,
                                   feature_columns: Optional[List[str]] = None,
                                   test_size: float = 0.2) -> Dict:
@@ -356,14 +396,82 @@ class RecommendationSystem:
         """
         self.df = df.copy()
     
+    @profiled()
+    def simulate_policy_scenarios(self, outcome: str, levers: List[str],
+                                  goal: str = 'maximize', model_type: str = 'random_forest',
+                                  steps: Tuple[float, ...] = DEFAULT_STEPS, n_draws: int = 2000,
+                                  period: str = 'Y', basis: str = 'gdp') -> Dict:
+        """
+        Rank lever changes by their simulated effect on an outcome indicator
+        
+        The long panel is pivoted to one row per country and period on a common
+        basis (see scenarios.country_panel; amounts in percent of GDP by default,
+        so one model can be pooled across currencies), a regression model of
+        the outcome on the levers is trained, and each lever step is simulated
+        by Monte Carlo from the latest complete year of every country.
+        
+        Args:
+            outcome: Outcome indicator (e.g. 'Budget Deficit/Surplus')
+            levers: Indicators a policy can move (e.g. 'Revenue', 'Expenditure')
+            goal: 'maximize' or 'minimize' the outcome
+            model_type: Regression model type (see RegressionModel)
+            steps: Relative lever changes to simulate
+            n_draws: Monte Carlo draws per scenario
+            period: Pandas period alias for the country panel
+            basis: Panel basis, 'gdp' or 'scaled' (only comparable within a
+                country; see scenarios.PANEL_BASES)
+        
+        Returns:
+            Dictionary with the ranked scenario table, the outcome's unit, model
+            metrics and simulation stats, or an 'error' entry
+        """
+        missing = {'unit', 'currency', 'frequency'} - set(self.df.columns)
+        if missing:
+            return {'error': f'Columns needed to align the panel are missing: {sorted(missing)}'}
+        panel = country_panel(self.df, [outcome] + list(levers), period=period, basis=basis)
+        levers = [lever for lever in levers if lever in panel.columns]
+        if outcome not in panel.columns or not levers:
+            return {'error': f'Outcome or levers not found in the data: {outcome}, {levers}'}
+        
+        regression = RegressionModel(panel.dropna(subset=[outcome]).reset_index(drop=True))
+        model_result = regression.train_regression_model(
+            target_column=outcome, feature_columns=levers, model_type=model_type
+        )
+        if 'error' in model_result:
+            return model_result
+        
+        # Start every scenario from each country's latest year with all levers observed
+        baseline = panel.dropna(subset=levers).groupby(level=0).tail(1)[levers]
+        engine = ScenarioEngine(lambda X: regression.predict(X, model_type), baseline,
+                                residual_std=model_result['test_metrics']['rmse'], n_draws=n_draws)
+        ranked = engine.run(engine.build_scenarios(levers, steps), goal=goal)
+        return {
+            'outcome': outcome,
+            'unit': panel.attrs['units'][outcome],
+            'lever_units': {lever: panel.attrs['units'][lever] for lever in levers},
+            'basis': basis,
+            'goal': goal,
+            'levers': levers,
+            'model': {key: model_result[key] for key in ('model_type', 'test_metrics', 'n_samples_train')},
+            'baseline_countries': baseline.index.get_level_values(0).tolist(),
+            'scenarios': ranked,
+            'stats': engine.get_stats()
+        }
+    
+    @profiled()
     def generate_recommendations(self, target_metric: str,
-                                constraint_columns: Optional[List[str]] = None) -> List[Dict]:
+                                constraint_columns: Optional[List[str]] = None,
+                                scenario_results: Optional[Dict] = None,
+                                top_scenarios: int = 3) -> List[Dict]:
         """
         Generate fiscal policy recommendations
         
         Args:
             target_metric: Metric to optimize
             constraint_columns: Columns that represent constraints
+            scenario_results: Output of simulate_policy_scenarios; its best-ranked
+                scenarios are added as recommendations
+            top_scenarios: Number of scenario recommendations to add
         
         Returns:
             List of recommendation dictionaries
@@ -375,7 +483,7 @@ class RecommendationSystem:
         
         # Recommendation 1: Based on trends
         if target_metric in self.df.select_dtypes(include=[np.number]).columns:
-            trend = self._calculate_trend(self.df[target_metric])
+            trend = self._calculate_trend(target_metric)
             recommendations.append({
                 'priority': 'High',
                 'category': 'Trend Optimization',
@@ -400,24 +508,42 @@ class RecommendationSystem:
                     'implementation': 'Medium-term'
                 })
         
-        # Add more recommendation logic...
+        # Recommendation 3: Lever changes ranked by simulated impact
+        if scenario_results and 'error' not in scenario_results:
+            recommendations.extend(self._scenario_recommendations(scenario_results, top_scenarios))
         
         return recommendations
     
-    def _calculate_trend(self, series: pd.Series) -> str:
-        """Calculate trend direction"""
-        if len(series) < 2:
-            return "stable"
+    def _scenario_recommendations(self, scenario_results: Dict, top: int) -> List[Dict]:
+        """Turn the best-ranked simulated scenarios into recommendations"""
+        outcome = scenario_results['outcome']
+        unit = scenario_results['unit']
+        ranked = scenario_results['scenarios']
+        # Only scenarios that move the outcome the right way in most draws
+        ranked = ranked[ranked['prob_improvement'] > 0.5].head(top)
         
-        x = np.arange(len(series))
-        slope = np.polyfit(x, series.values, 1)[0]
-        
-        if slope > 0:
-            return "increasing"
-        elif slope < 0:
-            return "decreasing"
-        else:
+        recommendations = []
+        for _, row in ranked.iterrows():
+            recommendations.append({
+                'priority': 'High' if row['rank'] == 1 else 'Medium',
+                'category': 'Scenario Simulation',
+                'recommendation': (f"{row['scenario']}: simulated change in {outcome} of "
+                                   f"{row['expected_impact']:+,.2f} {unit} (90% interval "
+                                   f"{row['impact_p5']:+,.2f} to {row['impact_p95']:+,.2f}; improves it in "
+                                   f"{row['prob_improvement']:.0%} of {row['draws']:,} draws)"),
+                'expected_impact': f"{row['expected_impact']:+,.2f} {unit}",
+                'implementation': 'Medium-term',
+                'simulated_rank': int(row['rank'])
+            })
+        return recommendations
+    
+    def _calculate_trend(self, column: str) -> str:
+        """Calculate trend direction over time (row order when there is no date column)"""
+        date_cols = self.df.select_dtypes(include=['datetime64']).columns
+        trend = series_trends(self.df, date_cols[0] if len(date_cols) else None, column, keys=[])
+        if trend.empty or trend['direction'].iloc[0] == 'Insufficient data':
             return "stable"
+        return trend['direction'].iloc[0].lower()
     
     def _generate_trend_recommendation(self, trend: str, metric: str) -> str:
         """Generate recommendation based on trend"""
@@ -0,0 +1,389 @@
+"""
+Normalization Module
+Unit scaling, currency conversion, deflation and frequency harmonization of the long fiscal table
+"""
+import os
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Sequence
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .pipeline import fingerprint_files
+    from .profiling import profiled
+except ImportError:
+    from pipeline import fingerprint_files
+    from profiling import profiled
+
+# Canonical unit -> multiplier to currency units (amounts only)
+UNIT_SCALES = {'million': 1e6, 'billion': 1e9, 'usd': 1.0}
+# Canonical unit -> kind; amounts are the only kind that is scaled, converted or deflated
+UNIT_KINDS = {'million': 'amount', 'billion': 'amount', 'usd': 'amount',
+              '%': 'percent', 'point': 'index', 'person': 'count'}
+# Amount indicators that are levels rather than flows (canonical names)
+STOCK_INDICATORS = ('government debt',)
+AVERAGED_INDICATORS = ('gdp per capita',)
+# Amount indicators already in constant prices (never deflated)
+REAL_INDICATORS = ('real gdp',)
+# Frequency label -> observations per year and period alias
+PERIODS_PER_YEAR = {'Monthly': 12, 'Quarterly': 4, 'Yearly': 1}
+PERIOD_ALIASES = {'Monthly': 'M', 'Quarterly': 'Q', 'Yearly': 'Y'}
+AMOUNT_BASES = ('raw', 'scaled', 'usd', 'real')
+
+
+def _map_labels(labels: pd.Series, func) -> pd.Series:
+    """Apply a string transform to each distinct label once and broadcast it back by code"""
+    codes, uniques = pd.factorize(labels.astype(str))
+    mapped = func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(mapped[codes], index=labels.index)
+
+
+def canonical_unit(units: pd.Series) -> pd.Series:
+    """Lowercase, trimmed, singular unit labels ('Billions' -> 'billion', 'points' -> 'point')"""
+    return _map_labels(units, lambda labels: labels.str.strip().str.lower()
+                       .str.replace(r'(?<=[a-z])s$', '', regex=True))
+
+
+def canonical_indicator(indicators: pd.Series) -> pd.Series:
+    """Lowercase, whitespace-normalized indicator names ('GDP per Capita ' -> 'gdp per capita')"""
+    return _map_labels(indicators, lambda labels: labels.str.strip().str.lower()
+                       .str.replace(r'\s+', ' ', regex=True))
+
+
+def aggregation_method(indicators: pd.Series, units: pd.Series) -> np.ndarray:
+    """
+    How each row's series aggregates over time: 'sum' (flows), 'last' (stocks) or 'mean'
+
+    Args:
+        indicators: Indicator names
+        units: Unit labels
+
+    Returns:
+        Array of method names aligned with the rows
+    """
+    kind = canonical_unit(units).map(UNIT_KINDS).fillna('unknown').to_numpy()
+    name = canonical_indicator(indicators)
+    stock = name.isin(STOCK_INDICATORS).to_numpy()
+    averaged = name.isin(AVERAGED_INDICATORS).to_numpy()
+    return np.select([kind == 'count', (kind == 'amount') & stock, (kind == 'amount') & ~averaged],
+                     ['last', 'last', 'sum'], 'mean')
+
+
+class RateTable:
+    """Dense (key x year) lookup table, e.g. FX rates per currency or deflators per country"""
+
+    def __init__(self, keys: Sequence[str], years: np.ndarray, values: np.ndarray):
+        """
+        Initialize RateTable
+
+        Args:
+            keys: Row keys (e.g. currency codes)
+            years: Consecutive years covered by the columns
+            values: Array of shape (len(keys), len(years)), NaN where unknown
+        """
+        self.keys = pd.Index([str(key) for key in keys])
+        self.years = np.asarray(years, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, key_column: str, value_column: str,
+                   year_column: str = 'year', fill_forward: bool = True) -> 'RateTable':
+        """
+        Build from a long table with one row per key and year
+
+        Args:
+            frame: Long table
+            key_column: Key column
+            value_column: Value column
+            year_column: Year column
+            fill_forward: Carry each key's last known value into later years
+
+        Returns:
+            RateTable
+        """
+        frame = frame.dropna(subset=[key_column, year_column, value_column])
+        if frame.empty:
+            return cls([], np.array([], dtype=np.int64), np.empty((0, 0)))
+        years = frame[year_column].astype(np.int64)
+        span = np.arange(years.min(), years.max() + 1)
+        matrix = frame.assign(**{year_column: years}).pivot_table(
+            index=key_column, columns=year_column, values=value_column, aggfunc='mean'
+        ).reindex(columns=span)
+        if fill_forward:
+            matrix = matrix.ffill(axis=1)
+        return cls(matrix.index, span, matrix.to_numpy())
+
+    @classmethod
+    def load(cls, path: str, key_column: str, value_column: str, year_column: str = 'year',
+             cache_dir: Optional[str] = None, fill_forward: bool = True) -> 'RateTable':
+        """
+        Load a CSV rate table, reusing a parsed copy cached under cache_dir
+
+        The cache is keyed by the file's content hash, so editing the file
+        invalidates it.
+
+        Args:
+            path: CSV file with key, year and value columns
+            key_column: Key column
+            value_column: Value column
+            year_column: Year column
+            cache_dir: Directory for the parsed table (None disables caching)
+            fill_forward: Carry each key's last known value into later years
+
+        Returns:
+            RateTable
+        """
+        cache_path = None
+        if cache_dir:
+            fingerprint = fingerprint_files([path])[:16]
+            cache_path = os.path.join(cache_dir, f'rates_{fingerprint}_{int(fill_forward)}.npz')
+            if os.path.exists(cache_path):
+                cached = np.load(cache_path, allow_pickle=False)
+                return cls(cached['keys'], cached['years'], cached['values'])
+
+        table = cls.from_frame(pd.read_csv(path), key_column, value_column, year_column, fill_forward)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez(cache_path, keys=np.asarray(table.keys, dtype=str), years=table.years, values=table.values)
+        return table
+
+    def lookup(self, keys: pd.Series, years: np.ndarray) -> np.ndarray:
+        """
+        Values for each (key, year) pair, NaN where the table has none
+
+        Keys are mapped to integer codes once, so the lookup is a single fancy
+        index into the dense matrix regardless of the number of rows.
+
+        Args:
+            keys: Key per row
+            years: Year per row
+
+        Returns:
+            Float array aligned with the rows
+        """
+        result = np.full(len(keys), np.nan)
+        if self.values.size == 0:
+            return result
+        codes = pd.Categorical(keys.astype(str), categories=self.keys).codes
+        offsets = np.asarray(years, dtype=np.int64) - self.years[0]
+        # Years past the end use the last column (the table's latest value)
+        offsets = np.minimum(offsets, len(self.years) - 1)
+        valid = (codes >= 0) & (offsets >= 0)
+        result[valid] = self.values[codes[valid], offsets[valid]]
+        return result
+
+
+def derive_gdp_deflator(df: pd.DataFrame, nominal: str = 'Nominal GDP', real: str = 'Real GDP',
+                        date_column: str = 'time', value_column: str = 'amount') -> RateTable:
+    """
+    GDP deflator (nominal / real x 100) per country and year from the data itself
+
+    Both series are scaled by unit and compared at the same frequency; yearly
+    figures are preferred over quarterly and monthly ones.
+
+    Args:
+        df: Long DataFrame with country, indicator, unit and frequency columns
+        nominal: Nominal GDP indicator
+        real: Real GDP indicator
+        date_column: Date column
+        value_column: Value column
+
+    Returns:
+        RateTable keyed by country
+    """
+    nominal, real = canonical_indicator(pd.Series([nominal, real])).tolist()
+    name = canonical_indicator(df['indicator'])
+    data = df[name.isin([nominal, real])]
+    scale = canonical_unit(data['unit']).map(UNIT_SCALES)
+    frame = pd.DataFrame({
+        'country': data['country'].astype(str).to_numpy(),
+        'year': pd.to_datetime(data[date_column]).dt.year.to_numpy(),
+        'frequency': data['frequency'].astype(str).to_numpy(),
+        'series': np.where(name[data.index] == nominal, 'nominal', 'real'),
+        'value': (data[value_column] * scale).to_numpy(dtype=np.float64)
+    }).dropna()
+    wide = frame.groupby(['country', 'year', 'frequency', 'series'])['value'].mean().unstack('series')
+    if not {'nominal', 'real'}.issubset(wide.columns):
+        return RateTable.from_frame(pd.DataFrame(columns=['country', 'year', 'deflator']), 'country', 'deflator')
+    wide['deflator'] = wide['nominal'] / wide['real'].where(wide['real'] > 0) * 100
+    wide = wide.dropna(subset=['deflator']).reset_index()
+    # Coarsest frequency first, so yearly deflators win
+    wide = wide.sort_values('frequency', key=lambda f: f.map(PERIODS_PER_YEAR), kind='stable')
+    return RateTable.from_frame(wide.drop_duplicates(['country', 'year']), 'country', 'deflator')
+
+
+@profiled()
+def harmonize_frequency(df: pd.DataFrame, target: str = 'Yearly', date_column: str = 'time',
+                        value_column: str = 'amount',
+                        keys: Sequence[str] = ('country', 'indicator')) -> pd.DataFrame:
+    """
+    Aggregate every series to one value per target period
+
+    Observations at the same time are averaged first (e.g. duplicate sources).
+    Where a series has several native frequencies in one period, the coarsest
+    wins (a reported annual figure over the sum of its months), and repeated
+    observations at the target frequency are averaged. Finer series are
+    aggregated per aggregation_method: flows are summed over complete
+    periods only (incomplete ones are dropped), stocks take the last value and
+    rates and indices the mean. Series coarser than the target are left out.
+    Scale values to a common unit first (Normalizer basis 'scaled').
+
+    Args:
+        df: Long DataFrame with indicator, unit, currency and frequency columns
+        target: 'Yearly', 'Quarterly' or 'Monthly'
+        date_column: Date column
+        value_column: Value column
+        keys: Columns identifying a series
+
+    Returns:
+        Long DataFrame with keys, period (pandas Period), value, unit, currency,
+        source_frequency and observations columns
+    """
+    if target not in PERIODS_PER_YEAR:
+        raise ValueError(f"Unknown target frequency: {target}")
+    keys = list(keys)
+    target_per_year = PERIODS_PER_YEAR[target]
+    per_year = df['frequency'].astype(str).str.strip().map(PERIODS_PER_YEAR)
+    data = df[per_year >= target_per_year]
+    dates = pd.to_datetime(data[date_column])
+
+    frame = pd.DataFrame({key: data[key].to_numpy() for key in keys})
+    frame['period'] = dates.dt.to_period(PERIOD_ALIASES[target]).to_numpy()
+    frame['time'] = dates.to_numpy()
+    frame['per_year'] = per_year[data.index].to_numpy()
+    frame['method'] = aggregation_method(data['indicator'], data['unit'])
+    frame['unit'] = data['unit'].to_numpy()
+    frame['currency'] = data['currency'].to_numpy()
+    frame['value'] = pd.to_numeric(data[value_column], errors='coerce').to_numpy()
+    frame = frame.dropna(subset=['value', 'time'])
+
+    # Average duplicates at the same time, then keep the coarsest native frequency per period
+    frame = frame.groupby(keys + ['period', 'time', 'per_year'], sort=False, observed=True).agg(
+        value=('value', 'mean'), method=('method', 'first'), unit=('unit', 'last'),
+        currency=('currency', 'last')).reset_index()
+    coarsest = frame.groupby(keys + ['period'], sort=False, observed=True)['per_year'].transform('min')
+    frame = frame[frame['per_year'] == coarsest].sort_values('time', kind='stable')
+
+    grouped = frame.groupby(keys + ['period'], sort=False, observed=True)
+    result = grouped.agg(total=('value', 'sum'), mean=('value', 'mean'), last=('value', 'last'),
+                         observations=('value', 'size'), per_year=('per_year', 'first'),
+                         method=('method', 'first'), unit=('unit', 'last'),
+                         currency=('currency', 'last')).reset_index()
+    # Series already at the target frequency average repeated observations in a period
+    native = result['per_year'] == target_per_year
+    result[value_column] = np.select([native, result['method'] == 'sum', result['method'] == 'last'],
+                                     [result['mean'], result['total'], result['last']], result['mean'])
+    complete = native | (result['observations'] >= result['per_year'] / target_per_year)
+    result = result[(result['method'] != 'sum') | complete]
+    frequency_of = {count: label for label, count in PERIODS_PER_YEAR.items()}
+    result['source_frequency'] = result['per_year'].map(frequency_of)
+    columns = keys + ['period', value_column, 'unit', 'currency', 'source_frequency', 'observations']
+    return result[columns].sort_values(keys + ['period'], kind='stable').reset_index(drop=True)
+
+
+class Normalizer:
+    """Convert amounts to comparable units: common scale, USD and constant prices"""
+
+    def __init__(self, fx_rates_file: Optional[str] = None, deflator_file: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Initialize Normalizer
+
+        Args:
+            fx_rates_file: CSV with currency, year and per_usd (units of the
+                currency per US dollar) columns; None disables USD conversion
+            deflator_file: CSV with country, year and deflator (index, base year
+                = 100) columns; None derives GDP deflators from Nominal and Real GDP
+            cache_dir: Directory for parsed rate tables (None disables caching)
+        """
+        self.fx_rates_file = fx_rates_file
+        self.deflator_file = deflator_file
+        self.cache_dir = cache_dir
+        self.report: Dict = {}
+
+    def _fx_table(self) -> Optional[RateTable]:
+        if not self.fx_rates_file:
+            return None
+        return RateTable.load(self.fx_rates_file, 'currency', 'per_usd', cache_dir=self.cache_dir)
+
+    def _deflator_table(self, df: pd.DataFrame) -> RateTable:
+        if self.deflator_file:
+            return RateTable.load(self.deflator_file, 'country', 'deflator', cache_dir=self.cache_dir)
+        return derive_gdp_deflator(df)
+
+    @profiled()
+    def normalize(self, df: pd.DataFrame, basis: str = 'scaled', date_column: str = 'time',
+                  value_column: str = 'amount') -> pd.DataFrame:
+        """
+        Express amounts on one basis
+
+        Bases: 'raw' (unchanged; only the coverage report is computed),
+        'scaled' (millions of local currency), 'usd' (millions of US dollars)
+        and 'real' (millions of local currency at deflator base-year prices;
+        indicators already in constant prices are only scaled). Percentages,
+        indices and counts are never converted. For 'usd' and
+        'real', amount rows without a rate or deflator are dropped.
+
+        Args:
+            df: Long DataFrame with country, unit and currency columns
+            basis: Target basis (see AMOUNT_BASES)
+            date_column: Date column
+            value_column: Value column
+
+        Returns:
+            DataFrame with value_column (and unit/currency labels) on the new basis
+        """
+        if basis not in AMOUNT_BASES:
+            raise ValueError(f"Unknown amount basis: {basis}")
+        unit = canonical_unit(df['unit'])
+        kind = unit.map(UNIT_KINDS).fillna('unknown')
+        is_amount = (kind == 'amount').to_numpy()
+        years = pd.to_datetime(df[date_column]).dt.year.to_numpy()
+        values = pd.to_numeric(df[value_column], errors='coerce').to_numpy(dtype=np.float64)
+
+        scaled = values * unit.map(UNIT_SCALES).to_numpy(dtype=np.float64) / 1e6
+        currency = df['currency'].astype(str).str.strip()
+
+        fx_table = self._fx_table()
+        per_usd = np.where(currency.str.upper() == 'USD', 1.0, np.nan)
+        if fx_table is not None:
+            per_usd = np.where(np.isnan(per_usd), fx_table.lookup(currency, years), per_usd)
+        usd = np.where(is_amount, scaled / per_usd, np.nan)
+
+        deflators = self._deflator_table(df).lookup(df['country'], years) if basis == 'real' else None
+
+        self.report = {
+            'basis': basis,
+            'rows': len(df),
+            'unit_kinds': kind.value_counts().to_dict(),
+            'unknown_units': sorted(df.loc[kind == 'unknown', 'unit'].astype(str).unique().tolist()),
+            'amount_rows': int(is_amount.sum()),
+            'usd_convertible_rows': int(np.isfinite(usd).sum()),
+            'rows_without_fx': currency[is_amount & np.isnan(per_usd)].value_counts().to_dict(),
+            'fx_rates_file': self.fx_rates_file,
+            'deflator_source': self.deflator_file or ('derived from GDP' if basis == 'real' else None)
+        }
+
+        result = df.copy()
+        if basis == 'raw':
+            return result
+        if basis == 'scaled':
+            converted, keep = scaled, np.ones(len(df), dtype=bool)
+        elif basis == 'usd':
+            converted, keep = usd, ~is_amount | np.isfinite(usd)
+            result.loc[is_amount, 'currency'] = 'USD'
+        else:
+            already_real = canonical_indicator(df['indicator']).isin(REAL_INDICATORS).to_numpy()
+            converted = np.where(already_real, scaled, scaled / deflators * 100)
+            keep = ~is_amount | np.isfinite(converted)
+            self.report['deflated_rows'] = int((is_amount & np.isfinite(converted)).sum())
+
+        result[value_column] = np.where(is_amount, converted, values)
+        result.loc[is_amount, 'unit'] = 'Million'
+        self.report['dropped_rows'] = int((~keep).sum())
+        return result[keep].reset_index(drop=True)
+
+    def get_report(self) -> Dict:
+        """Coverage report of the last normalize() call"""
+        return self.report
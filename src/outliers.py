@@ -0,0 +1,160 @@
+"""
+Outlier Detection Module
+Shared single-pass outlier engine used by data cleaning, EDA, and anomaly detection
+"""
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .stats_cache import StatisticsCache
+except ImportError:
+    from stats_cache import StatisticsCache
+
+
+class OutlierEngine:
+    """Computes outlier statistics and masks for all numeric columns at once"""
+
+    def __init__(self, df: pd.DataFrame, columns: Optional[List[str]] = None,
+                 stats_cache: Optional[StatisticsCache] = None):
+        """
+        Initialize OutlierEngine
+
+        Args:
+            df: DataFrame to analyze (not copied; callers own the frame)
+            columns: Columns to analyze (default: all numeric)
+            stats_cache: Shared statistics cache for df (default: a private one)
+        """
+        self.df = df
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        self.columns = list(columns)
+        self.stats_cache = stats_cache if stats_cache is not None else StatisticsCache(df)
+        self._statistics: Optional[pd.DataFrame] = None
+        self._masks: Dict[Tuple[str, float], np.ndarray] = {}
+
+    def _get_values(self) -> np.ndarray:
+        """Get the numeric columns as a contiguous float64 block"""
+        return self.stats_cache.values(self.columns)
+
+    def get_statistics(self) -> pd.DataFrame:
+        """
+        Get quantiles and moments for every column, computed in one vectorized call
+
+        Returns:
+            DataFrame indexed by column with count, mean, std, q1, q3 and iqr
+        """
+        if self._statistics is None:
+            moments = self.stats_cache.moments(self.columns)
+            self._statistics = moments[['count', 'mean', 'std', 'q1', 'q3']].copy()
+            self._statistics['iqr'] = self._statistics['q3'] - self._statistics['q1']
+
+        return self._statistics
+
+    def get_masks(self, method: str = 'iqr', threshold: float = 3.0) -> np.ndarray:
+        """
+        Get boolean outlier masks for all columns
+
+        Args:
+            method: 'iqr' or 'zscore'
+            threshold: Z-score threshold (ignored for 'iqr')
+
+        Returns:
+            Boolean array of shape (rows, columns); NaN is never an outlier
+        """
+        if method not in ('iqr', 'zscore'):
+            raise ValueError(f"Unknown outlier method: {method}")
+
+        key = (method, threshold if method == 'zscore' else 1.5)
+        if key not in self._masks:
+            values = self._get_values()
+            stats = self.get_statistics()
+
+            if method == 'iqr':
+                lower_bound = (stats['q1'] - 1.5 * stats['iqr']).to_numpy()
+                upper_bound = (stats['q3'] + 1.5 * stats['iqr']).to_numpy()
+                mask = (values < lower_bound) | (values > upper_bound)
+            else:
+                z_scores = np.abs((values - stats['mean'].to_numpy()) / stats['std'].to_numpy())
+                mask = z_scores > threshold
+
+            self._masks[key] = mask
+
+        return self._masks[key]
+
+    def get_bitmaps(self, method: str = 'iqr', threshold: float = 3.0) -> Dict[str, np.ndarray]:
+        """
+        Get packed outlier bitmaps (one bit per row) for each column
+
+        Args:
+            method: 'iqr' or 'zscore'
+            threshold: Z-score threshold
+
+        Returns:
+            Dictionary mapping column name to a uint8 bitmap
+        """
+        packed = np.packbits(self.get_masks(method, threshold), axis=0)
+        return {col: packed[:, i] for i, col in enumerate(self.columns)}
+
+    def summarize(self, method: str = 'iqr', threshold: float = 3.0,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Summarize outlier counts per column
+
+        Args:
+            method: 'iqr' or 'zscore'
+            threshold: Z-score threshold
+            columns: Subset of columns to summarize (default: all)
+
+        Returns:
+            DataFrame indexed by column with outlier count, valid count and row count
+        """
+        counts = self.get_masks(method, threshold).sum(axis=0)
+        summary = pd.DataFrame({
+            'count': counts,
+            'valid_count': self.get_statistics()['count'].to_numpy(),
+            'total_rows': len(self.df)
+        }, index=self.columns)
+
+        if columns is not None:
+            summary = summary.loc[[col for col in columns if col in summary.index]]
+
+        return summary
+
+    def outlier_values(self, column: str, method: str = 'iqr',
+                       threshold: float = 3.0, limit: Optional[int] = 10) -> List:
+        """
+        Get outlier values for a column in row order
+
+        Args:
+            column: Column name
+            method: 'iqr' or 'zscore'
+            threshold: Z-score threshold
+            limit: Maximum number of values to return (None for all)
+
+        Returns:
+            List of outlier values
+        """
+        j = self.columns.index(column)
+        values = self._get_values()[self.get_masks(method, threshold)[:, j], j]
+        if limit is not None:
+            values = values[:limit]
+        return values.tolist()
+
+    def outlier_indices(self, column: str, method: str = 'iqr',
+                        threshold: float = 3.0) -> pd.Index:
+        """
+        Materialize the index labels of outliers for a single column
+
+        Args:
+            column: Column name
+            method: 'iqr' or 'zscore'
+            threshold: Z-score threshold
+
+        Returns:
+            Index of outlier rows
+        """
+        j = self.columns.index(column)
+        return self.df.index[self.get_masks(method, threshold)[:, j]]
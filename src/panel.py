@@ -0,0 +1,586 @@
+"""
+Panel Module
+Long-to-wide reshaping of the country/indicator panel and vectorized all-pairs statistics
+"""
+import pandas as pd
+import numpy as np
+from scipy import stats
+from typing import Dict, Optional, Sequence, Union
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .normalization import PERIOD_ALIASES, UNIT_KINDS, Normalizer, canonical_unit, harmonize_frequency
+except ImportError:
+    from normalization import PERIOD_ALIASES, UNIT_KINDS, Normalizer, canonical_unit, harmonize_frequency
+
+# Columns needed to harmonize series by unit, currency and native frequency
+HARMONIZE_COLUMNS = {'indicator', 'unit', 'currency', 'frequency'}
+
+
+def harmonized_cells(df: pd.DataFrame, date_column: str = 'time', value_column: str = 'amount',
+                     keys: Sequence[str] = ('country', 'indicator'),
+                     period: Optional[str] = 'Y') -> Optional[pd.DataFrame]:
+    """
+    One value per series and period on a common scale
+
+    Amounts are put on one scale (Normalizer basis 'scaled') and each series
+    keeps only its most reported unit kind and currency, so Million and
+    Billion rows, amounts in different currencies, or a rate and an amount
+    never share a cell. Rows are then aggregated by their native frequency
+    (normalization.harmonize_frequency: reported yearly figures over sums of
+    quarters or months, flows summed, stocks last, rates averaged).
+
+    Args:
+        df: Long DataFrame with indicator, unit, currency and frequency columns
+        date_column: Date column
+        value_column: Value column
+        keys: Columns identifying a series
+        period: Pandas period alias ('M', 'Q' or 'Y')
+
+    Returns:
+        Long DataFrame with keys, period and value_column, or None when the
+        period alias has no frequency label or the columns are missing
+    """
+    frequency = {alias: label for label, alias in PERIOD_ALIASES.items()}.get(period)
+    if frequency is None or not HARMONIZE_COLUMNS.issubset(df.columns):
+        return None
+    keys = list(keys)
+    data = Normalizer().normalize(df, 'scaled', date_column, value_column)
+    kind = canonical_unit(data['unit']).map(UNIT_KINDS).fillna('unknown')
+    currency = np.where(kind == 'amount', data['currency'].astype(str).str.strip(), '')
+    frame = pd.DataFrame({key: data[key].to_numpy() for key in keys}).assign(
+        variant=(kind + '|' + currency).to_numpy())
+    counts = frame.groupby(keys + ['variant'], observed=True).size().rename('rows').reset_index()
+    best = counts.sort_values('rows', ascending=False, kind='stable').drop_duplicates(keys)
+    keep = pd.MultiIndex.from_frame(frame[keys + ['variant']]).isin(
+        pd.MultiIndex.from_frame(best[keys + ['variant']]))
+    harmonized = harmonize_frequency(data[keep], frequency, date_column, value_column, keys)
+    return harmonized[keys + ['period', value_column]].dropna(subset=[value_column])
+
+
+def to_wide(df: pd.DataFrame, date_column: str = 'time', value_column: str = 'amount',
+            columns: Union[str, Sequence[str]] = 'indicator', period: Optional[str] = 'Y',
+            aggfunc: str = 'mean', harmonize: bool = True) -> pd.DataFrame:
+    """
+    Pivot a long panel to one column per series and one row per period
+
+    With unit, currency and frequency columns (and period 'M', 'Q' or 'Y'),
+    series are first harmonized (see harmonized_cells); otherwise they are
+    aligned by aggregating within `period`.
+
+    Args:
+        df: Long DataFrame (one row per observation)
+        date_column: Date column
+        value_column: Value column
+        columns: Column(s) identifying a series (e.g. 'indicator' or ['country', 'indicator'])
+        period: Pandas period alias to align on ('M', 'Q', 'Y'); None keeps raw dates
+        aggfunc: Aggregation for several observations in one period (unharmonized only)
+        harmonize: Harmonize units, currencies and frequencies where possible
+
+    Returns:
+        Wide DataFrame indexed by period, one column per series (NaN where missing)
+    """
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    harmonized = harmonized_cells(df, date_column, value_column, columns, period) if harmonize else None
+    if harmonized is not None:
+        wide = harmonized.set_index(['period'] + columns)[value_column].unstack(columns)
+        wide.index = pd.PeriodIndex(wide.index, freq=period, name='period')
+        return wide.sort_index()
+    dates = pd.to_datetime(df[date_column])
+    rows = dates.dt.to_period(period) if period else dates
+    wide = df.groupby([rows.rename('period')] + [df[col] for col in columns], observed=True)[value_column] \
+        .agg(aggfunc).unstack(columns)
+    return wide.sort_index()
+
+
+def bh_adjust(p_values: np.ndarray) -> np.ndarray:
+    """Benjamini-Hochberg adjusted p-values (q-values); NaN entries are ignored"""
+    q_values = np.full_like(p_values, np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    m = len(valid)
+    if m == 0:
+        return q_values
+    order = valid[np.argsort(p_values[valid], kind='stable')]
+    ranked = p_values[order] * m / np.arange(1, m + 1)
+    # Step-up: each q is the smallest ratio at its rank or above
+    q_values[order] = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return q_values
+
+
+def _interpret(correlation: np.ndarray, significant: np.ndarray) -> np.ndarray:
+    """Vectorized strength/direction wording, as HypothesisTester._interpret_correlation"""
+    magnitude = np.abs(correlation)
+    strength = np.select([magnitude < 0.3, magnitude < 0.7], ['weak', 'moderate'], 'strong')
+    direction = np.where(correlation > 0, 'positive', 'negative')
+    wording = np.char.add(np.char.add(strength, ' '), np.char.add(direction, ' correlation'))
+    return np.where(significant, wording, 'Not statistically significant').astype(object)
+
+
+def correlation_significance(wide: pd.DataFrame, min_periods: int = 3,
+                             alpha: float = 0.05) -> pd.DataFrame:
+    """
+    Test every column pair for correlation in one vectorized pass
+
+    Pearson correlations use pairwise-complete observations (as DataFrame.corr),
+    computed for all pairs at once with masked matrix products. Two-sided
+    p-values come from the t-distribution with n - 2 degrees of freedom, and
+    are adjusted with Benjamini-Hochberg over all tested pairs.
+
+    Args:
+        wide: DataFrame with one numeric column per variable
+        min_periods: Minimum overlapping observations for a pair to be tested
+        alpha: False discovery rate
+
+    Returns:
+        DataFrame with one row per tested pair (var_1, var_2, n, correlation,
+        t_statistic, p_value, q_value, is_significant, interpretation), sorted
+        by q-value then absolute correlation
+    """
+    labels = [' | '.join(map(str, col)) if isinstance(col, tuple) else col for col in wide.columns]
+    values = wide.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+
+    # Centre and scale each column first; r is unchanged and the sums stay well conditioned
+    counts = present.sum(axis=0)
+    means = np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), 0.0)
+    scale = np.nanstd(values, axis=0)
+    scale[~(scale > 0)] = 1.0
+    x = np.where(present, (values - means) / scale, 0.0)
+    mask = present.astype(np.float64)
+
+    n = mask.T @ mask                 # overlapping observations per pair
+    sum_x = x.T @ mask                # sum of column i over rows where j is present
+    sum_xx = (x * x).T @ mask
+    sum_xy = x.T @ x
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = n * sum_xy - sum_x * sum_x.T
+        variance = (n * sum_xx - sum_x ** 2) * (n * sum_xx - sum_x ** 2).T
+        r = np.clip(covariance / np.sqrt(variance), -1.0, 1.0)
+
+    i, j = np.triu_indices(len(labels), k=1)
+    labels = np.asarray(labels, dtype=object)
+    return _pair_table(labels[i], labels[j], n[i, j], r[i, j], min_periods, alpha)
+
+
+def _pair_table(var_1: np.ndarray, var_2: np.ndarray, n_pairs: np.ndarray, r_pairs: np.ndarray,
+                min_periods: int, alpha: float, leading: Optional[Dict[str, np.ndarray]] = None) -> pd.DataFrame:
+    """t-test and BH-adjust pair correlations; keeps pairs with enough overlap and a finite r"""
+    testable = (n_pairs >= max(min_periods, 3)) & np.isfinite(r_pairs)
+    var_1, var_2, n_pairs, r_pairs = var_1[testable], var_2[testable], n_pairs[testable], r_pairs[testable]
+    leading = {name: values[testable] for name, values in (leading or {}).items()}
+
+    dof = n_pairs - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = r_pairs * np.sqrt(dof / (1.0 - r_pairs ** 2))
+    p_values = 2 * stats.t.sf(np.abs(t_stat), dof)
+    q_values = bh_adjust(p_values)
+
+    significant = q_values < alpha
+    result = pd.DataFrame({
+        **leading,
+        'var_1': var_1,
+        'var_2': var_2,
+        'n': n_pairs.astype(np.int64),
+        'correlation': r_pairs,
+        't_statistic': t_stat,
+        'p_value': p_values,
+        'q_value': q_values,
+        'is_significant': significant,
+        'interpretation': _interpret(r_pairs, significant)
+    })
+    result['_abs'] = np.abs(r_pairs)
+    return result.sort_values(['q_value', '_abs'], ascending=[True, False]) \
+        .drop(columns='_abs').reset_index(drop=True)
+
+
+def grouped_correlation_significance(df: pd.DataFrame, date_column: str = 'time',
+                                     value_column: str = 'amount', series_column: str = 'indicator',
+                                     group_column: Optional[str] = 'country', period: Optional[str] = 'Y',
+                                     min_periods: int = 3, alpha: float = 0.05) -> pd.DataFrame:
+    """
+    Test all series pairs within each group (e.g. indicators within each country)
+
+    Pairs are formed from overlapping observations of a SparsePanel, so no
+    group is pivoted to a dense wide frame; the FDR correction is applied once
+    over the pairs of all groups.
+
+    Args:
+        df: Long DataFrame
+        date_column: Date column
+        value_column: Value column
+        series_column: Column identifying series within a group
+        group_column: Column to group by (None tests all series together)
+        period: Period alias used to align series
+        min_periods: Minimum overlapping periods per pair
+        alpha: False discovery rate
+
+    Returns:
+        Pair table as correlation_significance(), with a group column when grouped
+    """
+    panel = SparsePanel(df, date_column, value_column, series_column, group_column, period)
+    return panel.pairwise_correlation(min_periods, alpha)
+
+
+# Set bits per byte value, for popcounts over packed bitmaps
+POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+class SparsePanel:
+    """Group x series x period panel held as its observations only, with per-series coverage bitmaps"""
+
+    def __init__(self, df: pd.DataFrame, date_column: str = 'time', value_column: str = 'amount',
+                 series_column: str = 'indicator', group_column: Optional[str] = 'country',
+                 period: Optional[str] = 'Y', aggfunc: str = 'mean', harmonize: bool = True):
+        """
+        Initialize SparsePanel
+
+        Observations are aggregated to one value per group, series and period
+        (harmonized as in to_wide where possible) and stored as coordinate
+        arrays, so memory follows the number of observations rather than
+        groups x series x periods.
+
+        Args:
+            df: Long DataFrame (one row per observation)
+            date_column: Date column
+            value_column: Value column
+            series_column: Column identifying a series (e.g. indicator)
+            group_column: Column identifying a group (e.g. country); None is one group
+            period: Pandas period alias to align on ('M', 'Q', 'Y'); None keeps raw dates
+            aggfunc: Aggregation for several observations in one period (unharmonized only)
+            harmonize: Harmonize units, currencies and frequencies where possible
+                (see harmonized_cells)
+        """
+        self.series_column = series_column
+        self.group_column = group_column
+        keys = [group_column, series_column] if group_column else [series_column]
+        harmonized = harmonized_cells(df, date_column, value_column, keys, period) if harmonize else None
+        if harmonized is not None:
+            groups = harmonized[group_column] if group_column else np.zeros(len(harmonized), dtype=np.int64)
+            cells = pd.Series(harmonized[value_column].to_numpy(), index=pd.MultiIndex.from_arrays(
+                [groups, harmonized['period'], harmonized[series_column]])).sort_index()
+        else:
+            dates = pd.to_datetime(df[date_column])
+            periods = (dates.dt.to_period(period) if period else dates).rename('period')
+            groups = df[group_column] if group_column else pd.Series(0, index=df.index, name='_group')
+            values = pd.to_numeric(df[value_column], errors='coerce')
+            observed = values.notna() & periods.notna()
+            cells = values[observed].groupby([groups[observed], periods[observed], df.loc[observed, series_column]],
+                                             observed=True, sort=True).agg(aggfunc).dropna()
+
+        group_codes, self.groups = pd.factorize(cells.index.get_level_values(0), sort=True)
+        series_codes, self.series = pd.factorize(cells.index.get_level_values(2), sort=True)
+        if period:
+            # Regular calendar from the first to the last period
+            ordinals = pd.PeriodIndex(cells.index.get_level_values(1)).asi8
+            first = ordinals.min() if len(ordinals) else 0
+            period_codes = ordinals - first
+            self.periods = pd.period_range(pd.Period(ordinal=first, freq=period),
+                                           periods=int(period_codes.max() + 1), freq=period) \
+                if len(ordinals) else pd.PeriodIndex([], freq=period)
+        else:
+            period_codes, self.periods = pd.factorize(cells.index.get_level_values(1), sort=True)
+
+        # Coordinates sorted by group, period, series: one run per (group, period) cell
+        self.group_codes = group_codes.astype(np.int32)
+        self.period_codes = np.asarray(period_codes).astype(np.int32)
+        self.series_codes = series_codes.astype(np.int32)
+        self.values = cells.to_numpy(dtype=np.float64)
+        self._bitmaps: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def shape(self):
+        """Dense (groups, series, periods) shape"""
+        return len(self.groups), len(self.series), len(self.periods)
+
+    @property
+    def bitmaps(self) -> np.ndarray:
+        """
+        Packed coverage bitmaps, one row per series and one bit per (group, period) cell
+
+        Bit g * n_periods + p of row s is set where series s is observed for
+        group g in period p (np.packbits bit order).
+        """
+        if self._bitmaps is None:
+            n_groups, n_series, n_periods = self.shape
+            n_bytes = (n_groups * n_periods + 7) // 8
+            cell = self.group_codes.astype(np.int64) * n_periods + self.period_codes
+            bitmaps = np.zeros((n_series, n_bytes), dtype=np.uint8)
+            np.bitwise_or.at(bitmaps, (self.series_codes, cell >> 3),
+                             (1 << (7 - (cell & 7))).astype(np.uint8))
+            self._bitmaps = bitmaps
+        return self._bitmaps
+
+    def overlap_counts(self) -> pd.DataFrame:
+        """Cells where both series of each pair are observed (diagonal: each series' own count)"""
+        bitmaps = self.bitmaps
+        counts = np.empty((len(self.series), len(self.series)), dtype=np.int64)
+        for row, bitmap in enumerate(bitmaps):
+            counts[row] = POPCOUNT[bitmaps & bitmap].sum(axis=1, dtype=np.int64)
+        return pd.DataFrame(counts, index=pd.Index(self.series, name=self.series_column),
+                            columns=pd.Index(self.series, name=self.series_column))
+
+    def coverage_matrix(self) -> pd.DataFrame:
+        """Observed periods per group (rows) and series (columns); 0 where a group lacks a series"""
+        counts = np.zeros((len(self.groups), len(self.series)), dtype=np.int64)
+        np.add.at(counts, (self.group_codes, self.series_codes), 1)
+        return pd.DataFrame(counts, index=pd.Index(self.groups, name=self.group_column),
+                            columns=pd.Index(self.series, name=self.series_column))
+
+    def coverage(self, by: str = 'group') -> pd.DataFrame:
+        """
+        Coverage report per group or per series
+
+        Args:
+            by: 'group' (e.g. per country) or 'series' (e.g. per indicator)
+
+        Returns:
+            DataFrame with observations, the number of series (or groups)
+            present, first and last period, coverage (observed share of that
+            slice of the dense cube) and span_coverage (observed share of the
+            periods between each series' own first and last observation)
+        """
+        if by not in ('group', 'series'):
+            raise ValueError(f"Unknown coverage axis: {by}")
+        n_groups, n_series, n_periods = self.shape
+        own, other = (self.group_codes, self.series_codes) if by == 'group' else (self.series_codes, self.group_codes)
+        labels, n_other = (self.groups, n_series) if by == 'group' else (self.series, n_groups)
+        other_name = 'series' if by == 'group' else 'groups'
+
+        # Span of every (group, series) pair, summed per label
+        pair = self.group_codes.astype(np.int64) * n_series + self.series_codes
+        spans = pd.DataFrame({'own': own, 'pair': pair, 'period': self.period_codes}) \
+            .groupby(['own', 'pair'], sort=True)['period'].agg(['min', 'max'])
+        span_length = (spans['max'] - spans['min'] + 1).groupby(level='own').sum()
+
+        observations = np.bincount(own, minlength=len(labels))
+        present = pd.Series(other).groupby(own).nunique().reindex(range(len(labels)), fill_value=0)
+        first = np.full(len(labels), np.iinfo(np.int64).max)
+        last = np.full(len(labels), -1)
+        np.minimum.at(first, own, self.period_codes)
+        np.maximum.at(last, own, self.period_codes)
+        name = (self.group_column or 'group') if by == 'group' else self.series_column
+        report = pd.DataFrame({
+            'observations': observations,
+            other_name: present.to_numpy(),
+            'first': np.asarray(self.periods[np.minimum(first, max(n_periods - 1, 0))], dtype=object),
+            'last': np.asarray(self.periods[np.maximum(last, 0)], dtype=object),
+            'coverage': observations / max(n_other * n_periods, 1),
+            'span_coverage': observations / span_length.reindex(range(len(labels))).to_numpy()
+        }, index=pd.Index(labels, name=name))
+        return report.sort_values('coverage', ascending=False, kind='stable')
+
+    def to_wide(self, group=None) -> pd.DataFrame:
+        """
+        Dense wide frame (periods x series), for models that need one
+
+        Args:
+            group: Group to materialize (None: all groups, columns keyed by (group, series))
+
+        Returns:
+            DataFrame with only the series observed in the selection
+        """
+        rows = np.ones(len(self), dtype=bool) if group is None else \
+            self.group_codes == self.groups.get_loc(group)
+        columns = [self.groups[self.group_codes[rows]], self.series[self.series_codes[rows]]] \
+            if group is None and self.group_column else [self.series[self.series_codes[rows]]]
+        names = [self.group_column, self.series_column] if len(columns) == 2 else [self.series_column]
+        frame = pd.Series(self.values[rows], index=pd.MultiIndex.from_arrays(
+            [self.periods[self.period_codes[rows]]] + columns, names=['period'] + names))
+        return frame.unstack(names).reindex(self.periods)
+
+    def memory_usage(self) -> Dict:
+        """Bytes held by the sparse panel versus a dense float64 cube of the same shape"""
+        n_groups, n_series, n_periods = self.shape
+        sparse = sum(array.nbytes for array in (self.group_codes, self.period_codes,
+                                                self.series_codes, self.values))
+        return {
+            'observations': len(self),
+            'dense_cells': n_groups * n_series * n_periods,
+            'density': len(self) / max(n_groups * n_series * n_periods, 1),
+            'sparse_bytes': sparse,
+            'bitmap_bytes': self.bitmaps.nbytes,
+            'dense_bytes': n_groups * n_series * n_periods * 8
+        }
+
+    def _pairs(self):
+        """Index pairs (first, second) of observations sharing a (group, period) cell, second series later"""
+        cell = self.group_codes.astype(np.int64) * max(len(self.periods), 1) + self.period_codes
+        starts = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]]) if len(cell) else np.array([], dtype=np.int64)
+        sizes = np.diff(np.r_[starts, len(cell)])
+        remaining = np.repeat(sizes, sizes) - (np.arange(len(cell)) - np.repeat(starts, sizes)) - 1
+        firsts, seconds = [], []
+        active = np.flatnonzero(remaining > 0)
+        lag = 1
+        while len(active):
+            firsts.append(active)
+            seconds.append(active + lag)
+            lag += 1
+            active = active[remaining[active] >= lag]
+        if not firsts:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def pairwise_correlation(self, min_periods: int = 3, alpha: float = 0.05,
+                             within_groups: bool = True) -> pd.DataFrame:
+        """
+        Pearson correlation of every series pair over their overlapping observations only
+
+        Pair sums are accumulated over the cells both series observe (no dense
+        pivot). Values are centred and scaled per series (per group and series
+        when within_groups) first, which leaves r unchanged and keeps the sums
+        well conditioned. Tests and the Benjamini-Hochberg correction are as
+        in correlation_significance, applied once over all pairs.
+
+        Args:
+            min_periods: Minimum overlapping observations for a pair to be tested
+            alpha: False discovery rate
+            within_groups: Correlate within each group (False pools all groups)
+
+        Returns:
+            Pair table as correlation_significance(), with a group column when
+            grouping within groups of a grouped panel
+        """
+        n_series = len(self.series)
+        grouped = within_groups and self.group_column is not None
+        columns = ([self.group_column] if grouped else []) + \
+            ['var_1', 'var_2', 'n', 'correlation', 't_statistic', 'p_value', 'q_value',
+             'is_significant', 'interpretation']
+        first, second = self._pairs()
+        if len(first) == 0:
+            return pd.DataFrame(columns=columns)
+
+        # Standardize each column of the (notional) wide frames
+        column = self.series_codes.astype(np.int64) + (self.group_codes.astype(np.int64) * n_series if grouped else 0)
+        count = np.bincount(column)
+        mean = np.bincount(column, self.values) / np.maximum(count, 1)
+        scale = np.sqrt(np.bincount(column, (self.values - mean[column]) ** 2) / np.maximum(count, 1))
+        scale[~(scale > 0)] = 1.0
+        x = (self.values - mean[column]) / scale[column]
+
+        # Accumulate pair sums by (group, series, series)
+        groups = self.group_codes[first].astype(np.int64) if grouped else np.zeros(len(first), dtype=np.int64)
+        key = (groups * n_series + self.series_codes[first]) * n_series + self.series_codes[second]
+        keys, inverse = np.unique(key, return_inverse=True)
+        a, b = x[first], x[second]
+        n = np.bincount(inverse).astype(np.float64)
+        sum_a, sum_b = np.bincount(inverse, a), np.bincount(inverse, b)
+        sum_aa, sum_bb, sum_ab = np.bincount(inverse, a * a), np.bincount(inverse, b * b), np.bincount(inverse, a * b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = n * sum_ab - sum_a * sum_b
+            variance = (n * sum_aa - sum_a ** 2) * (n * sum_bb - sum_b ** 2)
+            r = np.clip(covariance / np.sqrt(variance), -1.0, 1.0)
+
+        labels = np.asarray(self.series, dtype=object)
+        leading = {self.group_column: np.asarray(self.groups, dtype=object)[keys // (n_series * n_series)]} \
+            if grouped else None
+        result = _pair_table(labels[keys // n_series % n_series], labels[keys % n_series], n, r,
+                             min_periods, alpha, leading)
+        return result
+
+
+def _skewtest_z(skewness: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """D'Agostino skewness z-scores (as scipy.stats.skewtest), vectorized over series"""
+    y = skewness * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3)
+             / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = np.where(y == 0, 1, y)
+    return delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+
+def _kurtosistest_z(kurtosis: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Anscombe-Glynn kurtosis z-scores (as scipy.stats.kurtosistest); kurtosis is Pearson's"""
+    expected = 3.0 * (n - 1) / (n + 1)
+    variance = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+    x = (kurtosis - expected) / np.sqrt(variance)
+    sqrt_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                  * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3))))
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    term2 = np.sign(denom) * np.where(denom == 0.0, np.nan,
+                                      ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0))
+    return (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+
+def series_normality(df: pd.DataFrame, value_column: str = 'amount',
+                     keys: Sequence[str] = ('country', 'indicator'), max_samples: Optional[int] = 5000,
+                     min_samples: int = 8, alpha: float = 0.05, seed: int = 42) -> pd.DataFrame:
+    """
+    Test every series in a long panel for normality in one vectorized pass
+
+    Moments are computed for all series at once with grouped reductions over
+    the long values (no per-series loop and no padded 2-D array), then the
+    Jarque-Bera and D'Agostino-Pearson K² statistics are evaluated as arrays.
+    Series longer than max_samples are tested on a reproducible random sample.
+
+    Args:
+        df: Long DataFrame
+        value_column: Value column
+        keys: Columns identifying a series
+        max_samples: Maximum observations per series (None uses all)
+        min_samples: Minimum observations to test a series (K² needs at least 8)
+        alpha: Significance level
+        seed: Sampling seed
+
+    Returns:
+        DataFrame with one row per series: keys, n, n_tested, mean, std,
+        skewness, excess_kurtosis, jarque_bera, jb_p_value, k2, k2_p_value,
+        is_normal (K² p-value above alpha; <NA> where untested)
+    """
+    keys = list(keys)
+    data = df[keys + [value_column]]
+    values = pd.to_numeric(data[value_column], errors='coerce').to_numpy(dtype=np.float64)
+    groups = data.groupby(keys, observed=True, sort=True)
+    codes = groups.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    n_groups = groups.ngroups
+    # Rows with a missing key belong to no series (ngroup leaves them NaN or -1)
+    valid = np.isfinite(values) & (codes >= 0)
+    labels = groups.size().index.to_frame(index=False)
+
+    totals = np.bincount(codes[valid], minlength=n_groups)
+    keep = valid.copy()
+    if max_samples is not None and (totals > max_samples).any():
+        # Random rank within each series; keep the first max_samples
+        order = np.random.default_rng(seed).random(len(values))
+        order[~valid] = np.inf
+        ranks = pd.Series(order).groupby(codes).rank(method='first').to_numpy()
+        keep &= ranks <= max_samples
+
+    g, x = codes[keep], values[keep]
+    n = np.bincount(g, minlength=n_groups).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(g, weights=x, minlength=n_groups) / n
+        d = x - mean[g]
+        m2 = np.bincount(g, weights=d ** 2, minlength=n_groups) / n
+        m3 = np.bincount(g, weights=d ** 3, minlength=n_groups) / n
+        m4 = np.bincount(g, weights=d ** 4, minlength=n_groups) / n
+        skewness = m3 / m2 ** 1.5
+        kurtosis = m4 / m2 ** 2
+
+        testable = (n >= max(min_samples, 8)) & (m2 > 0)
+        jarque_bera = np.where(testable, n / 6.0 * (skewness ** 2 + (kurtosis - 3) ** 2 / 4.0), np.nan)
+        k2 = np.where(testable, _skewtest_z(skewness, n) ** 2 + _kurtosistest_z(kurtosis, n) ** 2, np.nan)
+
+    k2_p = stats.chi2.sf(k2, 2)
+    result = labels.assign(
+        n=totals,
+        n_tested=n.astype(np.int64),
+        mean=mean,
+        std=np.sqrt(m2 * n / np.maximum(n - 1, 1)),
+        skewness=np.where(m2 > 0, skewness, np.nan),
+        excess_kurtosis=np.where(m2 > 0, kurtosis - 3, np.nan),
+        jarque_bera=jarque_bera,
+        jb_p_value=stats.chi2.sf(jarque_bera, 2),
+        k2=k2,
+        k2_p_value=k2_p
+    )
+    result['is_normal'] = pd.Series(k2_p > alpha).where(testable).astype('boolean')
+    return result
@@ -0,0 +1,263 @@
+"""
+Pipeline Module
+Small DAG runner with fingerprinted, on-disk cached stages and concurrent execution
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .profiling import Profiler, count_rows
+except ImportError:
+    from profiling import Profiler, count_rows
+
+
+def fingerprint_files(paths: Iterable[str]) -> str:
+    """
+    Hash the contents of a set of files
+
+    Args:
+        paths: File paths (missing files hash as absent)
+
+    Returns:
+        Hex digest identifying the file contents
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        if not os.path.exists(path):
+            digest.update(b'<missing>')
+            continue
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PipelineNode:
+    """A named pipeline stage with its dependencies and fingerprinted parameters"""
+
+    def __init__(self, name: str, func: Callable, deps: Sequence[str] = (),
+                 params: Optional[Dict] = None, inputs: Sequence[str] = (), cache: bool = True):
+        """
+        Initialize PipelineNode
+
+        Args:
+            name: Unique stage name
+            func: Callable receiving dependency results as keyword arguments
+                (by dependency name) followed by params
+            deps: Names of stages whose results this stage consumes
+            params: JSON-serializable parameters (part of the fingerprint)
+            inputs: Files the stage reads; their contents are part of the fingerprint
+            cache: Whether results may be served from / written to the disk cache
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.params = params or {}
+        self.inputs = list(inputs)
+        self.cache = cache
+
+    def source_fingerprint(self) -> str:
+        """Hash the stage function's source so edits invalidate its cache"""
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = f"{self.func.__module__}.{getattr(self.func, '__qualname__', repr(self.func))}"
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """Runs stages in dependency order, concurrently where possible, with result caching"""
+
+    def __init__(self, cache_dir: Optional[str] = '.pipeline_cache',
+                 max_workers: Optional[int] = None, code_version: str = '',
+                 profiler: Optional[Profiler] = None):
+        """
+        Initialize Pipeline
+
+        Args:
+            cache_dir: Directory for cached stage results (None disables caching)
+            max_workers: Concurrent stages (default: number of independent stages)
+            code_version: Extra fingerprint input, e.g. a hash of the library sources
+            profiler: Profiler recording wall/CPU/memory per stage (optional)
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.code_version = code_version
+        self.profiler = profiler
+        self.nodes: Dict[str, PipelineNode] = {}
+        self.run_report: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable, deps: Sequence[str] = (),
+            params: Optional[Dict] = None, inputs: Sequence[str] = (),
+            cache: bool = True) -> PipelineNode:
+        """
+        Declare a stage
+
+        Args:
+            name: Unique stage name
+            func: Stage callable
+            deps: Upstream stage names (must already be declared)
+            params: Stage parameters
+            inputs: Files the stage reads (content-fingerprinted)
+            cache: Whether the stage result is cached on disk
+
+        Returns:
+            The created PipelineNode
+        """
+        if name in self.nodes:
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undeclared stages: {missing}")
+
+        node = PipelineNode(name, func, deps, params, inputs, cache)
+        self.nodes[name] = node
+        return node
+
+    def _fingerprint(self, node: PipelineNode, fingerprints: Dict[str, str]) -> str:
+        """Combine code, params and upstream fingerprints into a stage fingerprint"""
+        digest = hashlib.sha256()
+        digest.update(node.name.encode('utf-8'))
+        digest.update(self.code_version.encode('utf-8'))
+        digest.update(node.source_fingerprint().encode('utf-8'))
+        digest.update(json.dumps(node.params, sort_keys=True, default=str).encode('utf-8'))
+        if node.inputs:
+            digest.update(fingerprint_files(node.inputs).encode('utf-8'))
+        for dep in node.deps:
+            digest.update(fingerprints[dep].encode('utf-8'))
+        return digest.hexdigest()
+
+    def _cache_path(self, node: PipelineNode, fingerprint: str) -> Optional[str]:
+        if not self.cache_dir or not node.cache:
+            return None
+        return os.path.join(self.cache_dir, f"{node.name}-{fingerprint[:16]}.pkl")
+
+    def _load_cached(self, path: Optional[str]):
+        """Return (hit, result) for a cache file"""
+        if path is None or not os.path.exists(path):
+            return False, None
+        try:
+            with open(path, 'rb') as f:
+                return True, pickle.load(f)
+        except Exception:
+            return False, None
+
+    def _store(self, path: Optional[str], result):
+        """Write a stage result to the cache; unpicklable results are simply not cached"""
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _run_stage(self, node: PipelineNode, fingerprint: str, results: Dict):
+        """Return (cache hit, result) for one stage"""
+        path = self._cache_path(node, fingerprint)
+        hit, result = self._load_cached(path)
+
+        if not hit:
+            kwargs = {dep: results[dep] for dep in node.deps}
+            kwargs.update(node.params)
+            result = node.func(**kwargs)
+            self._store(path, result)
+        return hit, result
+
+    def _execute(self, node: PipelineNode, fingerprint: str, results: Dict):
+        """Run one stage (or serve it from cache) and record its timing"""
+        started_at = time.perf_counter()
+        if self.profiler is None:
+            hit, result = self._run_stage(node, fingerprint, results)
+        else:
+            with self.profiler.stage(node.name) as info:
+                hit, result = self._run_stage(node, fingerprint, results)
+                rows = [count_rows(result)] + [count_rows(results[dep]) for dep in node.deps]
+                rows = [n for n in rows if n is not None]
+                info['rows'] = max(rows) if rows else None
+
+        with self._lock:
+            self.run_report[node.name] = {
+                'status': 'cached' if hit else 'computed',
+                'seconds': time.perf_counter() - started_at,
+                'fingerprint': fingerprint[:16]
+            }
+        return result
+
+    def required(self, targets: Optional[Sequence[str]] = None) -> List[str]:
+        """Stages needed for the targets, in declaration (topological) order"""
+        if targets is None:
+            return list(self.nodes)
+
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.nodes:
+                raise ValueError(f"Unknown pipeline stage: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.nodes[name].deps)
+        return [name for name in self.nodes if name in needed]
+
+    def run(self, targets: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Run the pipeline
+
+        Stages whose dependencies are satisfied run concurrently on a thread
+        pool; a stage whose fingerprint matches a cached result is loaded
+        from disk instead of recomputed.
+
+        Args:
+            targets: Stages to produce (default: all); dependencies are included
+
+        Returns:
+            Dictionary mapping stage name to its result
+        """
+        order = self.required(targets)
+        fingerprints: Dict[str, str] = {}
+        for name in order:
+            fingerprints[name] = self._fingerprint(self.nodes[name], fingerprints)
+
+        results: Dict = {}
+        pending = list(order)
+        running: Dict[Future, str] = {}
+        self.run_report = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or max(1, len(order))) as executor:
+            while pending or running:
+                for name in [n for n in pending if all(dep in results for dep in self.nodes[n].deps)]:
+                    pending.remove(name)
+                    future = executor.submit(self._execute, self.nodes[name], fingerprints[name], results)
+                    running[future] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+
+        return results
+
+    def get_run_report(self) -> Dict[str, Dict]:
+        """
+        Get per-stage status ('computed' or 'cached'), seconds and fingerprint
+
+        Returns:
+            Dictionary keyed by stage name, in declaration order
+        """
+        return {name: self.run_report[name] for name in self.nodes if name in self.run_report}
@@ -0,0 +1,251 @@
+"""
+Profiling Module
+Wall time, CPU time, peak memory and row counts per pipeline stage and analysis method
+"""
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DUMP_FORMATS = ('cprofile', 'pyinstrument')
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """
+    Get the peak resident set size of this process (or its finished children)
+
+    Args:
+        children: Report terminated child processes (e.g. render workers) instead
+
+    Returns:
+        Peak RSS in MB, or None where the platform does not expose it
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def count_rows(obj) -> Optional[int]:
+    """Row count of a DataFrame/Series result, or of the first item of a tuple result"""
+    if isinstance(obj, (tuple, list)) and obj:
+        obj = obj[0]
+    if hasattr(obj, 'shape') and hasattr(obj, 'index'):
+        return len(obj)
+    return None
+
+
+class Profiler:
+    """Aggregates timings per stage and per method, optionally dumping per-stage profiles"""
+
+    def __init__(self, dump_format: Optional[str] = None, dump_dir: str = 'reports/profiles'):
+        """
+        Initialize Profiler
+
+        Args:
+            dump_format: None, 'cprofile' (.prof files) or 'pyinstrument' (.html files)
+            dump_dir: Directory for per-stage profile dumps
+        """
+        self.configure(dump_format, dump_dir)
+        self.records: Dict[str, Dict[str, Dict]] = {'stages': {}, 'methods': {}}
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+
+    def configure(self, dump_format: Optional[str] = None, dump_dir: Optional[str] = None):
+        """
+        Set the per-stage profile dump format and directory
+
+        Args:
+            dump_format: None, 'cprofile' or 'pyinstrument'
+            dump_dir: Directory for dumps (unchanged if None)
+        """
+        if dump_format not in (None,) + DUMP_FORMATS:
+            raise ValueError(f"Unknown profile dump format: {dump_format}")
+        self.dump_format = dump_format
+        if dump_dir is not None:
+            self.dump_dir = dump_dir
+
+    def reset(self):
+        """Clear all records"""
+        with self._lock:
+            self.records = {'stages': {}, 'methods': {}}
+            self._started_at = time.perf_counter()
+
+    def record(self, kind: str, name: str, wall: float, cpu: float,
+               rss_before: Optional[float], rows: Optional[int]):
+        """Add one measured call to the aggregate for its name"""
+        rss_after = peak_rss_mb()
+        with self._lock:
+            entry = self.records[kind].setdefault(name, {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                'peak_rss_mb': None, 'peak_rss_growth_mb': 0.0, 'rows': None
+            })
+            entry['calls'] += 1
+            entry['wall_seconds'] += wall
+            entry['cpu_seconds'] += cpu
+            if rss_after is not None:
+                entry['peak_rss_mb'] = max(entry['peak_rss_mb'] or 0.0, rss_after)
+                entry['peak_rss_growth_mb'] = max(entry['peak_rss_growth_mb'], rss_after - rss_before)
+            if rows is not None:
+                entry['rows'] = max(entry['rows'] or 0, rows)
+
+    @contextmanager
+    def measure(self, kind: str, name: str, rows: Optional[int] = None):
+        """
+        Measure a block of code
+
+        CPU time is the calling thread's, so concurrent stages do not count
+        each other's work; time spent in worker processes is not included.
+        Peak RSS is the process high-water mark, and growth is how far a block
+        raised it.
+
+        Args:
+            kind: 'stages' or 'methods'
+            name: Record name
+            rows: Rows processed, if known up front
+
+        Yields:
+            Dictionary whose 'rows' key the block may set
+        """
+        info = {'rows': rows}
+        rss_before = peak_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield info
+        finally:
+            self.record(kind, name, time.perf_counter() - wall_start,
+                        time.thread_time() - cpu_start, rss_before, info['rows'])
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        Measure a pipeline stage, dumping a cProfile/pyinstrument profile if enabled
+
+        Args:
+            name: Stage name
+            rows: Rows processed, if known up front
+
+        Yields:
+            Dictionary whose 'rows' key the stage may set
+        """
+        with self.measure('stages', name, rows) as info:
+            if self.dump_format is None:
+                yield info
+                return
+
+            os.makedirs(self.dump_dir, exist_ok=True)
+            if self.dump_format == 'cprofile':
+                import cProfile
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    yield info
+                finally:
+                    profile.disable()
+                    profile.dump_stats(os.path.join(self.dump_dir, f'{name}.prof'))
+            else:
+                from pyinstrument import Profiler as SamplingProfiler
+                profile = SamplingProfiler()
+                profile.start()
+                try:
+                    yield info
+                finally:
+                    profile.stop()
+                    with open(os.path.join(self.dump_dir, f'{name}.html'), 'w') as f:
+                        f.write(profile.output_html())
+
+    def get_profile(self) -> Dict:
+        """
+        Get the collected profile
+
+        Returns:
+            Dictionary with per-stage and per-method records, process totals
+            and environment information
+        """
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self.records['stages'].items()}
+            methods = dict(sorted(self.records['methods'].items(),
+                                  key=lambda item: item[1]['wall_seconds'], reverse=True))
+            methods = {name: dict(entry) for name, entry in methods.items()}
+
+        usage = os.times()
+        return {
+            'stages': stages,
+            'methods': methods,
+            'process': {
+                'wall_seconds': time.perf_counter() - self._started_at,
+                'cpu_seconds': usage.user + usage.system,
+                'children_cpu_seconds': usage.children_user + usage.children_system,
+                'peak_rss_mb': peak_rss_mb(),
+                'children_peak_rss_mb': peak_rss_mb(children=True)
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            }
+        }
+
+    def write(self, path: str, extra: Optional[Dict] = None) -> Dict:
+        """
+        Write the profile as JSON
+
+        Args:
+            path: Output file path (e.g. reports/perf_profile.json)
+            extra: Additional top-level sections to include
+
+        Returns:
+            The written profile
+        """
+        profile = self.get_profile()
+        profile.update(extra or {})
+        with open(path, 'w') as f:
+            json.dump(profile, f, indent=2, default=str)
+        return profile
+
+
+profiler = Profiler()
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording each call of a method in the module profiler
+
+    Rows are taken from a DataFrame result or, failing that, from self.df.
+
+    Args:
+        name: Record name (default: Class.method)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        record_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.measure('methods', record_name) as info:
+                result = func(*args, **kwargs)
+                rows = count_rows(result)
+                if rows is None and args and hasattr(args[0], 'df'):
+                    rows = count_rows(args[0].df)
+                info['rows'] = rows
+            return result
+
+        return wrapper
+
+    return decorator
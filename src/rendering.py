@@ -0,0 +1,431 @@
+"""
+Rendering Module
+Headless plot rendering farm: lightweight plot specs rendered by Agg-backend worker processes
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import warnings
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest merges are only locked within a process
+    fcntl = None
+warnings.filterwarnings('ignore')
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Output presets: drafts for fast iteration, publication for final reports
+RENDER_PRESETS = {
+    'draft': {'dpi': 72, 'format': 'png', 'bbox_inches': None},
+    'web': {'dpi': 120, 'format': 'png', 'bbox_inches': 'tight'},
+    'publication': {'dpi': 300, 'format': 'png', 'bbox_inches': 'tight'},
+    'vector': {'dpi': 300, 'format': 'svg', 'bbox_inches': 'tight'}
+}
+
+# Plot cache manifest (file name -> input hash -> path), kept next to the figures
+MANIFEST_NAME = '.plot_manifest.json'
+# Serializes manifest merges between renderers of this process (the file lock covers other processes)
+_MANIFEST_LOCK = threading.Lock()
+# Bump when drawing code changes so cached figures are redrawn
+RENDER_CACHE_VERSION = 1
+# Seaborn whitegrid rc, resolved lazily so importing this module stays light
+_BASE_STYLE: Optional[Dict] = None
+
+
+def _update_hash(hasher, value):
+    """Feed a spec value (arrays, frames, containers, scalars) into a hash"""
+    if isinstance(value, np.ndarray):
+        hasher.update(f"ndarray:{value.dtype}:{value.shape}".encode())
+        if value.dtype == object:
+            hasher.update(pd.util.hash_array(value.ravel()).tobytes())
+        else:
+            hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (pd.Series, pd.DataFrame, pd.Index)):
+        hasher.update(f"{type(value).__name__}:{value.shape}".encode())
+        if isinstance(value, pd.DataFrame):
+            hasher.update(repr(list(value.columns)).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        hasher.update(f"dict:{len(value)}".encode())
+        for key in sorted(value, key=str):
+            hasher.update(str(key).encode())
+            _update_hash(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            _update_hash(hasher, item)
+    else:
+        hasher.update(repr(value).encode())
+
+
+class PlotSpec:
+    """Lightweight, picklable description of a single figure"""
+
+    def __init__(self, kind: str, name: str, data: Dict, params: Optional[Dict] = None,
+                 figsize: tuple = (14, 6), rc: Optional[Dict] = None):
+        """
+        Initialize PlotSpec
+
+        Args:
+            kind: Renderer name (key of RENDERERS)
+            name: Output file name without extension
+            data: Arrays/frames the renderer draws (already reduced in the main process)
+            params: Titles, labels, colors and other drawing options
+            figsize: Figure size in inches
+            rc: Matplotlib rc overrides applied while rendering
+        """
+        self.kind = kind
+        self.name = name
+        self.data = data
+        self.params = params or {}
+        self.figsize = figsize
+        self.rc = rc or {}
+
+    def fingerprint(self, preset: Dict) -> str:
+        """
+        Hash everything that determines the rendered image
+
+        Args:
+            preset: Entry from RENDER_PRESETS
+
+        Returns:
+            Hex digest of the data slice, drawing parameters and output preset
+        """
+        hasher = hashlib.sha256()
+        _update_hash(hasher, [RENDER_CACHE_VERSION, self.kind, self.name, self.params,
+                              list(self.figsize), self.rc, preset, self.data])
+        return hasher.hexdigest()
+
+
+def _draw_distribution_qq(fig: 'Figure', spec: PlotSpec):
+    """Histogram with mean/median markers and a normal Q-Q plot"""
+    from scipy import stats as scipy_stats
+
+    data, col = spec.data['values'], spec.params['column']
+    mean, median = spec.data['mean'], spec.data['median']
+    axes = fig.subplots(1, 2)
+
+    axes[0].hist(data, bins=30, edgecolor='black', alpha=0.7, color='steelblue')
+    axes[0].axvline(mean, color='red', linestyle='--', label=f'Mean: {mean:.2f}')
+    axes[0].axvline(median, color='green', linestyle='--', label=f'Median: {median:.2f}')
+    axes[0].set_title(f'Distribution of {col}', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel(col)
+    axes[0].set_ylabel('Frequency')
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+
+    scipy_stats.probplot(data, dist="norm", plot=axes[1])
+    axes[1].set_title(f'Q-Q Plot: {col}', fontsize=12, fontweight='bold')
+    axes[1].grid(True, alpha=0.3)
+
+
+def _draw_distribution_box(fig: 'Figure', spec: PlotSpec):
+    """Histogram alongside a box plot"""
+    data, col = spec.data['values'], spec.params['column']
+    axes = fig.subplots(1, 2)
+
+    axes[0].hist(data, bins=30, edgecolor='black', alpha=0.7, color=spec.params.get('color', 'steelblue'))
+    axes[0].set_title(f'Distribution of {col}', fontweight='bold')
+    axes[0].set_xlabel(col)
+    axes[0].set_ylabel('Frequency')
+    axes[0].grid(True, alpha=0.3)
+
+    axes[1].boxplot(data, vert=True)
+    axes[1].set_title(f'Box Plot: {col}', fontweight='bold')
+    axes[1].set_ylabel(col)
+    axes[1].grid(True, alpha=0.3)
+
+
+def _draw_trend(fig: 'Figure', spec: PlotSpec):
+    """Time series with optional moving average, above yearly averages"""
+    col = spec.params['column']
+    axes = fig.subplots(2, 1)
+
+    axes[0].plot(spec.data['dates'], spec.data['values'], linewidth=2, color='steelblue')
+    axes[0].set_title(f'Trend Analysis: {col} over Time', fontsize=12, fontweight='bold')
+    axes[0].set_xlabel('Date')
+    axes[0].set_ylabel(col)
+    axes[0].grid(True, alpha=0.3)
+
+    if spec.data.get('rolling_mean') is not None:
+        window = spec.params['window']
+        axes[0].plot(spec.data['dates'], spec.data['rolling_mean'],
+                     color='red', linestyle='--', linewidth=2, label=f'{window}-period moving average')
+        axes[0].legend()
+
+    if spec.data.get('yearly_mean') is not None:
+        yearly = spec.data['yearly_mean']
+        axes[1].bar(yearly.index, yearly.values, color='steelblue', alpha=0.7)
+        axes[1].set_title(f'Yearly Average: {col}', fontsize=12, fontweight='bold')
+        axes[1].set_xlabel('Year')
+        axes[1].set_ylabel(f'Average {col}')
+        axes[1].grid(True, alpha=0.3, axis='y')
+
+
+def _draw_boxplots(fig: 'Figure', spec: PlotSpec):
+    """Side-by-side colored box plots for several columns"""
+    ax = fig.subplots()
+    labels = spec.params['labels']
+    bp = ax.boxplot(spec.data['series'], patch_artist=True)
+    ax.set_xticks(range(1, len(labels) + 1))
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+
+    for patch, color in zip(bp['boxes'], spec.params.get('colors', []) * 2):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+
+    ax.set_title(spec.params.get('title', 'Outlier Detection - Box Plots'), fontsize=14, fontweight='bold')
+    ax.set_ylabel('Values')
+    ax.grid(True, alpha=0.3, axis='y')
+
+
+def _draw_correlation_heatmap(fig: 'Figure', spec: PlotSpec):
+    """Lower-triangle annotated correlation heatmap"""
+    import seaborn as sns
+
+    corr_matrix = spec.data['corr_matrix']
+    ax = fig.subplots()
+    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+    sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8}, ax=ax)
+    ax.set_title(spec.params.get('title', 'Correlation Heatmap'), fontsize=14, fontweight='bold', pad=20)
+
+
+RENDERERS: Dict[str, Callable[['Figure', PlotSpec], None]] = {
+    'distribution_qq': _draw_distribution_qq,
+    'distribution_box': _draw_distribution_box,
+    'trend': _draw_trend,
+    'boxplots': _draw_boxplots,
+    'correlation_heatmap': _draw_correlation_heatmap
+}
+
+
+def _init_worker():
+    """Configure a rendering worker: headless backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _base_style() -> Dict:
+    """Seaborn whitegrid rc settings, loaded once per process on first render"""
+    global _BASE_STYLE
+    if _BASE_STYLE is None:
+        import seaborn as sns
+        _BASE_STYLE = dict(sns.axes_style("whitegrid"))
+    return _BASE_STYLE
+
+
+def render_spec(spec: PlotSpec, save_path: str, preset: Dict) -> Dict:
+    """
+    Render one spec to disk (runs in worker processes or inline)
+
+    Args:
+        spec: Plot specification
+        save_path: Output directory
+        preset: Entry from RENDER_PRESETS
+
+    Returns:
+        Dictionary with output path and render time
+    """
+    # matplotlib is imported here, not at module load, to keep package import fast
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    start = time.perf_counter()
+    path = os.path.join(save_path, f"{spec.name}.{preset['format']}")
+
+    with matplotlib.rc_context({**_base_style(), **(spec.rc or {})}):
+        fig = Figure(figsize=spec.figsize)
+        FigureCanvasAgg(fig)
+        RENDERERS[spec.kind](fig, spec)
+        fig.tight_layout()
+        fig.savefig(path, dpi=preset['dpi'], format=preset['format'], bbox_inches=preset['bbox_inches'])
+
+    return {'name': spec.name, 'path': path, 'seconds': time.perf_counter() - start}
+
+
+class PlotRenderer:
+    """Renders plot specs on a pool of headless worker processes"""
+
+    def __init__(self, save_path: str, preset: str = 'publication',
+                 n_workers: Optional[int] = None, use_cache: bool = True):
+        """
+        Initialize PlotRenderer
+
+        Args:
+            save_path: Directory figures are written to
+            preset: Name of a RENDER_PRESETS entry ('draft', 'web', 'publication', 'vector')
+            n_workers: Worker processes (default: CPU count, 1 renders inline)
+            use_cache: Skip figures whose inputs match the manifest and whose file exists
+        """
+        if preset not in RENDER_PRESETS:
+            raise ValueError(f"Unknown render preset: {preset}")
+
+        self.save_path = save_path
+        self.preset_name = preset
+        self.preset = RENDER_PRESETS[preset]
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._results: List[Dict] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self.use_cache = use_cache
+        self.cache_hits = 0
+        self._manifest: Optional[Dict] = None
+        self._manifest_updates: Dict[str, Dict] = {}
+        self._pending_hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Start the worker pool on first use, or None when rendering inline"""
+        if self._executor is None and self.n_workers > 1:
+            try:
+                # Spawned, not forked: renderers run on pipeline threads, and a fork taken while
+                # another thread holds an import lock deadlocks the child's first import
+                self._executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            except (OSError, NotImplementedError):
+                # Restricted environments (no semaphores/fork) fall back to inline rendering
+                self.n_workers = 1
+        return self._executor
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.save_path, MANIFEST_NAME)
+
+    def _load_manifest(self) -> Dict:
+        """Read the plot manifest once; a missing or corrupt manifest is treated as empty"""
+        if self._manifest is None:
+            try:
+                with open(self._manifest_path()) as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def submit(self, spec: PlotSpec) -> Future:
+        """
+        Queue a spec for rendering, or resolve it from the plot cache
+
+        Args:
+            spec: Plot specification
+
+        Returns:
+            Future resolving to the render result dictionary
+        """
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+
+        file_name = f"{spec.name}.{self.preset['format']}"
+        path = os.path.join(self.save_path, file_name)
+        fingerprint = spec.fingerprint(self.preset)
+
+        if self.use_cache:
+            entry = self._load_manifest().get(file_name)
+            if entry and entry.get('hash') == fingerprint and os.path.exists(path):
+                self.cache_hits += 1
+                future = Future()
+                future.set_result({'name': spec.name, 'path': path, 'seconds': 0.0, 'cached': True})
+                return future
+
+        with self._lock:
+            self._pending_hashes[file_name] = fingerprint
+
+        executor = self._get_executor()
+        if executor is not None:
+            future = executor.submit(render_spec, spec, self.save_path, self.preset)
+        else:
+            future = Future()
+            future.set_result(render_spec(spec, self.save_path, self.preset))
+
+        future.add_done_callback(self._record)
+        return future
+
+    def _record(self, future: Future):
+        """Collect a finished render for throughput statistics and the manifest"""
+        if future.exception() is None:
+            result = future.result()
+            file_name = os.path.basename(result['path'])
+            with self._lock:
+                self._results.append(result)
+                self._finished_at = time.perf_counter()
+                self._manifest_updates[file_name] = {
+                    'hash': self._pending_hashes.pop(file_name, None),
+                    'path': result['path'],
+                    'rendered_at': datetime.now().isoformat(timespec='seconds')
+                }
+
+    def render(self, specs: List[PlotSpec]) -> List[str]:
+        """
+        Render specs and wait for all of them
+
+        Args:
+            specs: Plot specifications
+
+        Returns:
+            List of written file paths, in spec order
+        """
+        futures = [self.submit(spec) for spec in specs]
+        return [future.result()['path'] for future in futures]
+
+    def get_stats(self) -> Dict:
+        """
+        Get throughput statistics for everything rendered so far
+
+        Returns:
+            Dictionary with figure count, wall time and figures per second
+        """
+        elapsed = self._finished_at - self._started_at if self._finished_at else 0.0
+        n_figures = len(self._results)
+        return {
+            'preset': self.preset_name,
+            'n_workers': self.n_workers,
+            'figures': n_figures,
+            'cache_hits': self.cache_hits,
+            'wall_seconds': elapsed,
+            'render_seconds': sum(r['seconds'] for r in self._results),
+            'figures_per_second': n_figures / elapsed if elapsed > 0 else 0.0
+        }
+
+    def close(self):
+        """Wait for queued renders, stop the worker pool and persist the manifest"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._write_manifest()
+
+    def _write_manifest(self):
+        """Merge new entries into the on-disk manifest (other renderers may share the directory)"""
+        if not self._manifest_updates or not os.path.isdir(self.save_path):
+            return
+
+        # Hold an exclusive lock across load, merge and replace so concurrent renderers keep each other's entries
+        with _MANIFEST_LOCK, open(self._manifest_path() + '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._manifest = None
+            manifest = self._load_manifest()
+            manifest.update(self._manifest_updates)
+            self._manifest_updates = {}
+
+            with tempfile.NamedTemporaryFile('w', dir=self.save_path, prefix=MANIFEST_NAME,
+                                             suffix='.tmp', delete=False) as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.replace(f.name, self._manifest_path())
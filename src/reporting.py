@@ -0,0 +1,265 @@
+"""
+Report Serialization Module
+Writes analysis reports as compact JSON metadata with tabular payloads in sidecar files
+"""
+import importlib.util
+import json
+import math
+import os
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .results import CompactResult
+except ImportError:
+    from results import CompactResult
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+PARQUET_AVAILABLE = any(importlib.util.find_spec(engine) is not None
+                        for engine in ('pyarrow', 'fastparquet'))
+TABLE_FORMATS = ('parquet', 'csv')
+TABLE_KEY = '$table'
+
+
+class ReportWriter:
+    """Writes report dictionaries as JSON with DataFrames, arrays and long lists split into tables"""
+
+    def __init__(self, output_dir: str, table_format: str = 'auto', min_table_rows: int = 50,
+                 use_orjson: bool = True, indent: Optional[int] = None):
+        """
+        Initialize ReportWriter
+
+        Args:
+            output_dir: Directory for reports; tables go to its tables/ subdirectory
+            table_format: 'parquet', 'csv' or 'auto' (Parquet when pyarrow/fastparquet is installed)
+            min_table_rows: Lists, arrays and DataFrames with at least this many rows become tables
+            use_orjson: Use orjson when it is installed
+            indent: JSON indentation (None writes compact JSON)
+        """
+        if table_format == 'auto':
+            table_format = 'parquet' if PARQUET_AVAILABLE else 'csv'
+        if table_format not in TABLE_FORMATS:
+            raise ValueError(f"Unknown table format: {table_format}")
+        self.output_dir = output_dir
+        self.table_dir = os.path.join(output_dir, 'tables')
+        self.table_format = table_format
+        self.min_table_rows = min_table_rows
+        self.use_orjson = use_orjson and ORJSON_AVAILABLE
+        self.indent = indent
+        self.stats: Dict[str, Dict] = {}
+
+    def write(self, payload: Any, name: str) -> Dict:
+        """
+        Write one report
+
+        Args:
+            payload: Report (nested dicts/lists, DataFrames, Series, arrays, numpy scalars,
+                result objects, which are written as their summaries)
+            name: Report name; writes <output_dir>/<name>.json
+
+        Returns:
+            Dictionary with the written files, their sizes and the write time
+        """
+        start = time.perf_counter()
+        tables = {}
+        document = self._convert(payload, name, tables)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if tables:
+            os.makedirs(self.table_dir, exist_ok=True)
+        table_files = [self._write_table(df, os.path.join(self.output_dir, path))
+                       for path, df in tables.items()]
+
+        json_path = os.path.join(self.output_dir, f'{name}.json')
+        with open(json_path, 'wb') as f:
+            f.write(self._dumps(document))
+
+        stats = {
+            'json_file': json_path,
+            'json_bytes': os.path.getsize(json_path),
+            'table_files': table_files,
+            'table_bytes': sum(os.path.getsize(path) for path in table_files),
+            'seconds': time.perf_counter() - start,
+            'serializer': 'orjson' if self.use_orjson else 'json',
+            'table_format': self.table_format
+        }
+        stats['total_bytes'] = stats['json_bytes'] + stats['table_bytes']
+        self.stats[name] = stats
+        return stats
+
+    def get_stats(self) -> Dict:
+        """Get size and timing statistics for every report written so far"""
+        return {
+            'reports': self.stats,
+            'total_bytes': sum(s['total_bytes'] for s in self.stats.values()),
+            'total_seconds': sum(s['seconds'] for s in self.stats.values())
+        }
+
+    def _dumps(self, document: Any) -> bytes:
+        """Serialize a JSON-native document"""
+        if self.use_orjson:
+            option = orjson.OPT_NON_STR_KEYS
+            if self.indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(document, option=option)
+        separators = None if self.indent else (',', ':')
+        return json.dumps(document, indent=self.indent, separators=separators).encode('utf-8')
+
+    def _convert(self, obj: Any, path: str, tables: Dict[str, pd.DataFrame]) -> Any:
+        """
+        Convert a payload to JSON-native values, collecting large tabular parts
+
+        Args:
+            obj: Value to convert
+            path: Dotted key path, used to name table files
+            tables: Collected tables, keyed by relative file path
+
+        Returns:
+            JSON-native value (tables are replaced by a reference)
+        """
+        if isinstance(obj, dict):
+            return {self._convert_key(key): self._convert(value, f'{path}.{key}', tables)
+                    for key, value in obj.items()}
+        if isinstance(obj, CompactResult):
+            return self._convert(obj.summary(), path, tables)
+
+        table = self._as_table(obj, path)
+        if table is not None:
+            if len(table) >= self.min_table_rows:
+                return self._reference(table, path, tables)
+            if isinstance(obj, (list, tuple, np.ndarray)):
+                return [self._convert(item, f'{path}[{i}]', tables) for i, item in enumerate(obj)]
+            return self._convert(obj.to_dict(), path, tables)
+
+        if isinstance(obj, (list, tuple, set)):
+            return [self._convert(item, f'{path}[{i}]', tables) for i, item in enumerate(obj)]
+        return self._convert_scalar(obj)
+
+    def _as_table(self, obj: Any, path: str) -> Optional[pd.DataFrame]:
+        """Get a DataFrame view of tabular values (None for anything else)"""
+        column = path.rsplit('.', 1)[-1]
+        if isinstance(obj, pd.DataFrame):
+            return obj
+        if isinstance(obj, pd.Series):
+            return obj.to_frame(name=obj.name if obj.name is not None else column)
+        if isinstance(obj, np.ndarray):
+            if obj.ndim == 1:
+                return pd.DataFrame({column: obj})
+            if obj.ndim == 2:
+                return pd.DataFrame(obj)
+            return None
+        if isinstance(obj, (list, tuple)) and obj:
+            if all(isinstance(item, dict) for item in obj):
+                keys = set(obj[0])
+                if all(set(item) == keys for item in obj) and not any(
+                        isinstance(value, (dict, list)) for item in obj for value in item.values()):
+                    return pd.DataFrame(list(obj))
+                return None
+            if all(isinstance(item, (int, float, str, bool, np.generic)) or item is None for item in obj):
+                return pd.DataFrame({column: list(obj)})
+        return None
+
+    def _reference(self, table: pd.DataFrame, path: str, tables: Dict[str, pd.DataFrame]) -> Dict:
+        """Register a table for writing and return its JSON reference"""
+        file_name = path.replace('/', '_').replace(' ', '_')
+        relative = f'tables/{file_name}.{self.table_format}'
+        tables[relative] = table
+        return {
+            TABLE_KEY: relative,
+            'rows': int(table.shape[0]),
+            'columns': [str(column) for column in table.columns],
+            'index': not isinstance(table.index, pd.RangeIndex),
+            'index_levels': 0 if isinstance(table.index, pd.RangeIndex) else table.index.nlevels
+        }
+
+    def _write_table(self, table: pd.DataFrame, path: str) -> str:
+        """Write a table sidecar, keeping the index unless it is a plain range"""
+        table = table.copy(deep=False)
+        table.columns = [str(column) for column in table.columns]
+        keep_index = not isinstance(table.index, pd.RangeIndex)
+        if self.table_format == 'parquet':
+            try:
+                table.to_parquet(path, index=keep_index)
+                return path
+            except (TypeError, ValueError, ImportError):
+                # Mixed-type object columns: stringify and retry
+                table = table.astype({col: str for col in table.columns if table[col].dtype == object})
+                table.to_parquet(path, index=keep_index)
+                return path
+        table.to_csv(path, index=keep_index)
+        return path
+
+    @staticmethod
+    def _convert_key(key: Any) -> Any:
+        """Keep JSON-compatible keys (orjson writes numbers as strings), stringify the rest"""
+        if isinstance(key, (str, bool)) or key is None:
+            return key
+        if isinstance(key, (int, np.integer)):
+            return int(key)
+        if isinstance(key, (float, np.floating)) and math.isfinite(key):
+            return float(key)
+        return str(key)
+
+    @staticmethod
+    def _convert_scalar(value: Any) -> Any:
+        """Convert numpy, pandas and datetime scalars; NaN and NaT become null"""
+        if value is None or isinstance(value, (str, bool)):
+            return value
+        if isinstance(value, np.bool_):
+            return bool(value)
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        if isinstance(value, (float, np.floating)):
+            return float(value) if math.isfinite(value) else None
+        if value is pd.NaT:
+            return None
+        if isinstance(value, (pd.Timestamp, datetime, date)):
+            return value.isoformat()
+        try:
+            if pd.isna(value):
+                return None
+        except (TypeError, ValueError):
+            pass
+        return str(value)
+
+
+def load_report(path: str) -> Any:
+    """
+    Load a report written by ReportWriter, reading table references back into DataFrames
+
+    Args:
+        path: Path to the report JSON file
+
+    Returns:
+        Report with tables as DataFrames
+    """
+    base_dir = os.path.dirname(path)
+    with open(path, 'rb') as f:
+        document = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+    def resolve(obj):
+        if isinstance(obj, dict):
+            if TABLE_KEY in obj:
+                table_path = os.path.join(base_dir, obj[TABLE_KEY])
+                if table_path.endswith('.parquet'):
+                    return pd.read_parquet(table_path)
+                # References written before index_levels existed had a single-level index
+                levels = obj.get('index_levels', 1 if obj.get('index') else 0)
+                return pd.read_csv(table_path, index_col=list(range(levels)) if levels else None)
+            return {key: resolve(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [resolve(item) for item in obj]
+        return obj
+
+    return resolve(document)
@@ -0,0 +1,273 @@
+"""
+Resampling Module
+Align mixed-frequency series onto one regular period calendar as dense NumPy blocks
+"""
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Sequence
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from .normalization import (PERIOD_ALIASES, PERIODS_PER_YEAR, Normalizer,
+                                aggregation_method, harmonize_frequency)
+    from .profiling import profiled
+except ImportError:
+    from normalization import (PERIOD_ALIASES, PERIODS_PER_YEAR, Normalizer,
+                               aggregation_method, harmonize_frequency)
+    from profiling import profiled
+
+# Frequency label -> period-start date offset (the dataset dates periods by their first day)
+DATE_OFFSETS = {'Monthly': 'MS', 'Quarterly': 'QS', 'Yearly': 'YS'}
+# Largest median gap (days) between observations for each frequency, finest first
+MAX_SPACING_DAYS = (('Monthly', 45), ('Quarterly', 135))
+
+
+def infer_frequency(dates: pd.Series) -> Optional[str]:
+    """
+    Frequency label of a date series from the median spacing of its distinct dates
+
+    Args:
+        dates: Dates of one series (any order, repeats allowed)
+
+    Returns:
+        'Monthly', 'Quarterly', 'Yearly', or None with fewer than two distinct dates
+    """
+    unique = np.unique(pd.to_datetime(pd.Series(dates)).dropna().to_numpy())
+    if len(unique) < 2:
+        return None
+    spacing = np.median(np.diff(unique)) / np.timedelta64(1, 'D')
+    return next((label for label, days in MAX_SPACING_DAYS if spacing <= days), 'Yearly')
+
+
+def series_frequencies(df: pd.DataFrame, keys: Sequence[str] = ('country', 'indicator'),
+                       frequency_column: str = 'frequency') -> pd.DataFrame:
+    """
+    Native frequencies of every series from the frequency column
+
+    Args:
+        df: Long DataFrame
+        keys: Columns identifying a series
+        frequency_column: Column with 'Monthly', 'Quarterly' or 'Yearly' labels
+
+    Returns:
+        DataFrame with keys, frequency (the most common label), finest and
+        coarsest labels, and the number of rows
+    """
+    keys = list(keys)
+    labels = df[frequency_column].astype(str).str.strip()
+    frame = pd.DataFrame({key: df[key].to_numpy() for key in keys})
+    frame['frequency'] = labels.to_numpy()
+    frame['per_year'] = labels.map(PERIODS_PER_YEAR).to_numpy()
+    counts = frame.groupby(keys + ['frequency', 'per_year'], observed=True).size().rename('rows').reset_index()
+    grouped = counts.groupby(keys, observed=True)
+    result = counts.loc[grouped['rows'].idxmax(), keys + ['frequency']].reset_index(drop=True)
+    frequency_of = {count: label for label, count in PERIODS_PER_YEAR.items()}
+    result['finest'] = grouped['per_year'].max().map(frequency_of).to_numpy()
+    result['coarsest'] = grouped['per_year'].min().map(frequency_of).to_numpy()
+    result['rows'] = grouped['rows'].sum().to_numpy()
+    return result
+
+
+class AlignedPanel:
+    """Series x period value block on one regular calendar, with a mask of interpolated cells"""
+
+    def __init__(self, values: np.ndarray, interpolated: np.ndarray, periods: pd.PeriodIndex,
+                 series: pd.DataFrame, frequency: str):
+        """
+        Initialize AlignedPanel
+
+        Args:
+            values: Float array (series x periods), NaN where there is no value
+            interpolated: Boolean array (series x periods), True where a value was
+                derived from a coarser frequency rather than observed
+            periods: Regular PeriodIndex of the columns
+            series: One row per series (keys and source frequencies)
+            frequency: Calendar frequency label
+        """
+        self.values = values
+        self.interpolated = interpolated
+        self.periods = periods
+        self.series = series
+        self.frequency = frequency
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def labels(self, keys: Optional[Sequence[str]] = None) -> pd.Index:
+        """Series labels (a MultiIndex over keys, or an Index for a single key)"""
+        keys = list(keys) if keys is not None else [col for col in self.series.columns
+                                                     if col not in ('source_frequency', 'method')]
+        if len(keys) == 1:
+            return pd.Index(self.series[keys[0]], name=keys[0])
+        return pd.MultiIndex.from_frame(self.series[keys])
+
+    def select(self, mask: np.ndarray) -> 'AlignedPanel':
+        """Subset of the series (e.g. panel.select(panel.series['country'] == 'Ghana'))"""
+        mask = np.asarray(mask, dtype=bool)
+        return AlignedPanel(self.values[mask], self.interpolated[mask], self.periods,
+                            self.series[mask].reset_index(drop=True), self.frequency)
+
+    def to_frame(self, observed_only: bool = False, keys: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Wide DataFrame indexed by period, one column per series
+
+        Args:
+            observed_only: Blank out interpolated cells
+            keys: Key columns used as column labels (default: all keys)
+
+        Returns:
+            DataFrame (periods x series)
+        """
+        values = np.where(self.interpolated, np.nan, self.values) if observed_only else self.values
+        return pd.DataFrame(values.T, index=self.periods, columns=self.labels(keys))
+
+    def coverage(self) -> Dict:
+        """Cell counts: observed, interpolated and missing"""
+        present = ~np.isnan(self.values)
+        interpolated = int((present & self.interpolated).sum())
+        return {'series': self.shape[0], 'periods': self.shape[1],
+                'observed': int(present.sum()) - interpolated, 'interpolated': interpolated,
+                'missing': int((~present).sum())}
+
+
+def _upsample(coarse: pd.DataFrame, target: str, keys: Sequence[str], value_column: str,
+              interpolate: bool) -> pd.DataFrame:
+    """
+    Spread coarse-period values over the target periods they contain
+
+    Flows are split evenly (period totals are preserved). Stocks are anchored
+    at the last sub-period and averages at the middle one; with `interpolate`
+    the sub-periods in between move linearly toward the neighbouring coarse
+    period's anchor, where that period is observed, otherwise they repeat the
+    value.
+    """
+    target_per_year = PERIODS_PER_YEAR[target]
+    alias = PERIOD_ALIASES[target]
+    keys = list(keys)
+    coarse = coarse.sort_values(keys + ['ordinal'], kind='stable').reset_index(drop=True)
+    ratio = (target_per_year // coarse['per_year']).to_numpy(dtype=np.int64)
+    value = coarse[value_column].to_numpy(dtype=np.float64)
+    method = coarse['method'].to_numpy()
+
+    # Neighbouring coarse periods of the same series (NaN when absent or not adjacent)
+    same = np.zeros(len(coarse), dtype=bool)
+    if len(coarse) > 1:
+        same[1:] = (coarse[keys].iloc[1:].to_numpy() == coarse[keys].iloc[:-1].to_numpy()).all(axis=1)
+    ordinal = coarse['ordinal'].to_numpy()
+    adjacent = same.copy()
+    adjacent[1:] &= ordinal[1:] == ordinal[:-1] + 1
+    previous = np.where(adjacent, np.roll(value, 1), np.nan)
+    following = np.full(len(coarse), np.nan)
+    following[:-1] = np.where(adjacent[1:], value[1:], np.nan)
+
+    # One row per contained sub-period
+    rows = np.repeat(np.arange(len(coarse)), ratio)
+    offset = np.arange(len(rows)) - np.repeat(np.cumsum(ratio) - ratio, ratio)
+    starts = pd.PeriodIndex(coarse['period'], dtype=coarse['period'].dtype).asfreq(alias, how='start')
+    periods = starts[rows] + offset
+
+    r = ratio[rows].astype(np.float64)
+    v = value[rows]
+    anchor = np.where(method[rows] == 'last', r - 1, (r - 1) / 2)
+    distance = (offset - anchor) / r
+    neighbour = np.where(distance >= 0, following[rows], previous[rows])
+    spread = v + np.abs(distance) * (neighbour - v) if interpolate else v
+    spread = np.where(np.isnan(spread), v, spread)
+    upsampled = np.where(method[rows] == 'sum', v / r, spread)
+
+    result = coarse.loc[rows, keys + ['source_frequency']].reset_index(drop=True)
+    result['period'] = periods
+    result[value_column] = upsampled
+    return result
+
+
+@profiled()
+def align_series(df: pd.DataFrame, frequency: str = 'Quarterly', date_column: str = 'time',
+                 value_column: str = 'amount', keys: Sequence[str] = ('country', 'indicator'),
+                 interpolate: bool = True, scale: bool = True,
+                 start: Optional[str] = None, end: Optional[str] = None) -> AlignedPanel:
+    """
+    Align every series onto one regular period calendar
+
+    Each row's native frequency comes from the frequency column. Series at or
+    finer than the target are aggregated with normalization.harmonize_frequency
+    (flows summed over complete periods, stocks last, rates and indices
+    averaged). Coarser series are spread over their sub-periods (see
+    _upsample) and only fill periods without an observed value.
+
+    Args:
+        df: Long DataFrame with indicator, unit, currency and frequency columns
+        frequency: Calendar frequency ('Monthly', 'Quarterly' or 'Yearly')
+        date_column: Date column
+        value_column: Value column
+        keys: Columns identifying a series
+        interpolate: Interpolate stocks and averages linearly when upsampling
+            (False repeats the coarse value)
+        scale: Put Million/Billion amounts on one scale first (Normalizer basis
+            'scaled'); disable if the data is already normalized
+        start: First period of the calendar (default: earliest value)
+        end: Last period of the calendar (default: latest value)
+
+    Returns:
+        AlignedPanel with one row per series and one column per period
+    """
+    if frequency not in PERIODS_PER_YEAR:
+        raise ValueError(f"Unknown frequency: {frequency}")
+    keys = list(keys)
+    alias = PERIOD_ALIASES[frequency]
+    target_per_year = PERIODS_PER_YEAR[frequency]
+    data = Normalizer().normalize(df, 'scaled', date_column, value_column) if scale else df
+
+    # At or finer than the target: aggregate
+    fine = harmonize_frequency(data, frequency, date_column, value_column, keys)
+    fine['interpolated'] = False
+
+    # Coarser than the target: spread over sub-periods
+    per_year = data['frequency'].astype(str).str.strip().map(PERIODS_PER_YEAR)
+    coarse_rows = data[per_year < target_per_year]
+    parts = [fine[keys + ['period', value_column, 'source_frequency', 'interpolated']]]
+    for label in [label for label, count in PERIODS_PER_YEAR.items() if count < target_per_year]:
+        subset = coarse_rows[per_year[coarse_rows.index] == PERIODS_PER_YEAR[label]]
+        if subset.empty:
+            continue
+        coarse = harmonize_frequency(subset, label, date_column, value_column, keys)
+        coarse['per_year'] = PERIODS_PER_YEAR[label]
+        coarse['ordinal'] = coarse['period'].map(lambda period: period.ordinal).to_numpy(dtype=np.int64)
+        methods = aggregation_method(subset['indicator'], subset['unit'])
+        method_of = pd.DataFrame({key: subset[key].to_numpy() for key in keys}).assign(method=methods) \
+            .drop_duplicates(keys)
+        coarse = coarse.merge(method_of, on=keys, how='left')
+        upsampled = _upsample(coarse, frequency, keys, value_column, interpolate)
+        upsampled['interpolated'] = True
+        parts.append(upsampled)
+
+    # Observed values win over values spread from coarser frequencies (finest first)
+    combined = pd.concat(parts, ignore_index=True)
+    combined['per_year'] = combined['source_frequency'].map(PERIODS_PER_YEAR)
+    combined = combined.sort_values('per_year', ascending=False, kind='stable') \
+        .drop_duplicates(keys + ['period']).dropna(subset=[value_column])
+
+    first = pd.Period(start, alias) if start is not None else combined['period'].min()
+    last = pd.Period(end, alias) if end is not None else combined['period'].max()
+    if combined.empty or pd.isna(first) or pd.isna(last):
+        periods = pd.PeriodIndex([], freq=alias)
+    else:
+        periods = pd.period_range(first, last, freq=alias)
+    ordinals = combined['period'].map(lambda period: period.ordinal).to_numpy(dtype=np.int64)
+    column = ordinals - (periods[0].ordinal if len(periods) else 0)
+    combined = combined[(column >= 0) & (column < len(periods))]
+    column = column[(column >= 0) & (column < len(periods))]
+
+    series = combined.groupby(keys, sort=True, observed=True).agg(
+        source_frequency=('per_year', 'min')).reset_index()
+    frequency_of = {count: label for label, count in PERIODS_PER_YEAR.items()}
+    series['source_frequency'] = series['source_frequency'].map(frequency_of)
+    row = pd.MultiIndex.from_frame(series[keys]).get_indexer(pd.MultiIndex.from_frame(combined[keys]))
+
+    values = np.full((len(series), len(periods)), np.nan)
+    interpolated = np.zeros((len(series), len(periods)), dtype=bool)
+    values[row, column] = combined[value_column].to_numpy(dtype=np.float64)
+    interpolated[row, column] = combined['interpolated'].to_numpy(dtype=bool)
+    return AlignedPanel(values, interpolated, periods, series, frequency)
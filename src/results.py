@@ -0,0 +1,211 @@
+"""
+Result Objects Module
+Per-row analysis results kept compact in memory and in reports; full arrays are built on request
+"""
+from abc import ABC, abstractmethod
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+import warnings
+warnings.filterwarnings('ignore')
+
+
+class CompactResult(ABC):
+    """Base class for per-row results: summary() is bounded, accessors materialize rows"""
+
+    def __init__(self, index: Optional[pd.Index], length: int):
+        """
+        Initialize CompactResult
+
+        Args:
+            index: Row labels of the analyzed rows (None for positional rows)
+            length: Number of rows
+        """
+        # A plain 0..n-1 range carries no information; rebuild it only when asked
+        if index is not None and index.equals(pd.RangeIndex(length)):
+            index = None
+        self._index = index
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def index(self) -> pd.Index:
+        """Row labels of the analyzed rows"""
+        return self._index if self._index is not None else pd.RangeIndex(self.length)
+
+    @abstractmethod
+    def summary(self) -> Dict:
+        """Bounded-size summary for reports (independent of the row count)"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.summary()})"
+
+
+class LabelResult(CompactResult):
+    """Integer labels per row (e.g. cluster assignments)"""
+
+    def __init__(self, labels: np.ndarray, index: Optional[pd.Index] = None):
+        """
+        Initialize LabelResult
+
+        Args:
+            labels: Integer label per row (-1 is kept as its own label, e.g. DBSCAN noise)
+            index: Row labels
+        """
+        labels = np.asarray(labels)
+        super().__init__(index, len(labels))
+        # Store in the narrowest signed type (int8 for any realistic cluster count)
+        dtype = next(d for d in (np.int8, np.int16, np.int32, np.int64) if len(labels) == 0 or
+                     (np.iinfo(d).min <= labels.min() and labels.max() <= np.iinfo(d).max))
+        self._labels = labels.astype(dtype)
+
+    def counts(self) -> Dict[int, int]:
+        """Number of rows per label"""
+        values, counts = np.unique(self._labels, return_counts=True)
+        return {int(v): int(c) for v, c in zip(values, counts)}
+
+    def members(self, label: int) -> pd.Index:
+        """Row labels assigned to one label"""
+        return self.index[self._labels == label]
+
+    def bitmap(self, label: int) -> np.ndarray:
+        """Packed membership bitmap (one bit per row) for one label"""
+        return np.packbits(self._labels == label)
+
+    def to_array(self) -> np.ndarray:
+        """Materialize all labels"""
+        return self._labels.astype(np.int64)
+
+    def to_series(self) -> pd.Series:
+        """Materialize all labels indexed by row"""
+        return pd.Series(self.to_array(), index=self.index, name='label')
+
+    def summary(self) -> Dict:
+        return {'rows': self.length, 'counts': self.counts()}
+
+
+class ScoreResult(CompactResult):
+    """Continuous score per row (e.g. anomaly scores)"""
+
+    def __init__(self, scores: np.ndarray, index: Optional[pd.Index] = None,
+                 lower_is_extreme: bool = True, top_k: int = 10, bins: int = 20):
+        """
+        Initialize ScoreResult
+
+        Args:
+            scores: Score per row
+            index: Row labels
+            lower_is_extreme: Whether low scores are the notable ones (Isolation Forest)
+            top_k: Number of most extreme rows in the summary
+            bins: Histogram bins in the summary
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        super().__init__(index, len(scores))
+        self._scores = scores
+        self.lower_is_extreme = lower_is_extreme
+        self.top_k = top_k
+        self.bins = bins
+
+    def top(self, k: Optional[int] = None) -> pd.Series:
+        """
+        Most extreme rows, most extreme first
+
+        Args:
+            k: Number of rows (default: top_k)
+
+        Returns:
+            Series of scores indexed by row
+        """
+        k = min(k or self.top_k, self.length)
+        if k == 0:
+            return pd.Series(dtype=np.float64, name='score')
+        keyed = self._scores if self.lower_is_extreme else -self._scores
+        positions = np.argpartition(keyed, k - 1)[:k]
+        positions = positions[np.argsort(keyed[positions], kind='stable')]
+        return pd.Series(self._scores[positions], index=self.index[positions], name='score')
+
+    def histogram(self, bins: Optional[int] = None) -> Dict[str, List[float]]:
+        """Histogram of finite scores as bin edges and counts"""
+        finite = self._scores[np.isfinite(self._scores)]
+        if len(finite) == 0:
+            return {'edges': [], 'counts': []}
+        counts, edges = np.histogram(finite, bins=bins or self.bins)
+        return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+    def to_array(self) -> np.ndarray:
+        """Materialize all scores"""
+        return self._scores.copy()
+
+    def to_series(self) -> pd.Series:
+        """Materialize all scores indexed by row"""
+        return pd.Series(self._scores, index=self.index, name='score')
+
+    def summary(self) -> Dict:
+        finite = self._scores[np.isfinite(self._scores)]
+        if len(finite) == 0:
+            return {'rows': self.length, 'count': 0}
+        quantiles = np.percentile(finite, [5, 25, 50, 75, 95])
+        top = self.top()
+        return {
+            'rows': self.length,
+            'count': int(len(finite)),
+            'mean': float(finite.mean()),
+            'std': float(finite.std()),
+            'min': float(finite.min()),
+            'max': float(finite.max()),
+            'quantiles': dict(zip(['p5', 'p25', 'p50', 'p75', 'p95'], quantiles.tolist())),
+            'histogram': self.histogram(),
+            'top': [{'row': row, 'score': float(score)} for row, score in top.items()]
+        }
+
+
+class RowMask(CompactResult):
+    """Set of flagged rows stored as a packed bitmap (one bit per row)"""
+
+    def __init__(self, bitmap: np.ndarray, length: int, index: Optional[pd.Index] = None,
+                 preview: int = 10):
+        """
+        Initialize RowMask
+
+        Args:
+            bitmap: Packed uint8 bitmap (np.packbits of a boolean mask)
+            length: Number of rows the bitmap covers
+            index: Row labels
+            preview: Number of flagged rows listed in the summary
+        """
+        super().__init__(index, length)
+        self.bitmap = np.asarray(bitmap, dtype=np.uint8)
+        self.preview = preview
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray, index: Optional[pd.Index] = None, **kwargs) -> 'RowMask':
+        """Build from a boolean mask"""
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask), len(mask), index, **kwargs)
+
+    def count(self) -> int:
+        """Number of flagged rows"""
+        return int(np.unpackbits(self.bitmap, count=self.length).sum())
+
+    def mask(self) -> np.ndarray:
+        """Materialize the boolean mask"""
+        return np.unpackbits(self.bitmap, count=self.length).astype(bool)
+
+    def positions(self) -> np.ndarray:
+        """Materialize flagged row positions"""
+        return np.flatnonzero(self.mask())
+
+    def indices(self) -> pd.Index:
+        """Materialize flagged row labels"""
+        return self.index[self.mask()]
+
+    def summary(self) -> Dict:
+        count = self.count()
+        return {
+            'rows': self.length,
+            'count': count,
+            'percentage': (count / self.length) * 100 if self.length else 0.0,
+            'first': self.indices()[:self.preview].tolist()
+        }
@@ -0,0 +1,264 @@
+"""
+Rolling Statistics Module
+Rolling mean, std, min, max and quantiles over many series in one vectorized sweep
+"""
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Union
+import warnings
+warnings.filterwarnings('ignore')
+
+STATISTICS = ('sum', 'count', 'mean', 'std', 'min', 'max')
+# Rows per chunk for the sliding-window quantile path (bounds its memory)
+QUANTILE_CHUNK_ROWS = 1 << 16
+
+
+def _group_starts(codes: np.ndarray) -> np.ndarray:
+    """Index of the first row of each row's group (rows must be grouped contiguously)"""
+    n = len(codes)
+    boundary = np.ones(n, dtype=bool)
+    boundary[1:] = codes[1:] != codes[:-1]
+    return np.maximum.accumulate(np.where(boundary, np.arange(n), 0))
+
+
+def _first_valid(blocks: np.ndarray) -> np.ndarray:
+    """First non-NaN value of each row of a 2-D array (0 where a row is all NaN)"""
+    present = ~np.isnan(blocks)
+    first = blocks[np.arange(len(blocks)), present.argmax(axis=1)]
+    return np.where(present.any(axis=1), first, 0.0)
+
+
+def _window_moments(values: np.ndarray, window: int, full: np.ndarray, codes: np.ndarray):
+    """
+    Count, shifted sum and shifted sum of squares of every trailing window
+
+    Sums restart every `window` rows, so a full window is a block suffix plus
+    a block prefix (or one whole block). Each part is accumulated relative to
+    a value inside the window (the last observed value of the suffix block,
+    the first of the prefix block) and the two parts are merged exactly, so
+    rounding error depends on the spread within each window rather than on
+    the magnitude of the whole column. Windows cut short by a series start use
+    that series' running sums, shifted by its first observed value.
+
+    Args:
+        values: Values with NaN for missing (groups contiguous)
+        window: Window length
+        full: Whether each row's window lies entirely inside its series
+        codes: Group code per row
+
+    Returns:
+        (count, sum of (x - shift), sum of (x - shift)², shift) arrays per row
+    """
+    n = len(values)
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(blocks, window)
+    present = ~np.isnan(padded)
+
+    first = _first_valid(padded)
+    last = _first_valid(padded[:, ::-1])
+    ahead = np.where(present, padded - first[:, None], 0.0)
+    behind = np.where(present, padded - last[:, None], 0.0)[:, ::-1]
+
+    prefix_n = np.cumsum(present, axis=1).ravel()[:n].astype(np.float64)
+    prefix_s = np.cumsum(ahead, axis=1).ravel()[:n]
+    prefix_q = np.cumsum(ahead * ahead, axis=1).ravel()[:n]
+    suffix_n = np.cumsum(present[:, ::-1], axis=1)[:, ::-1].ravel()[:n].astype(np.float64)
+    suffix_s = np.cumsum(behind, axis=1)[:, ::-1].ravel()[:n]
+    suffix_q = np.cumsum(behind * behind, axis=1)[:, ::-1].ravel()[:n]
+
+    count, sums, squares, shift = (np.empty(n) for _ in range(4))
+    rows = np.flatnonzero(full)
+    start = rows - window + 1
+    block = rows // window
+    split = start % window != 0
+    # Whole-block windows are one prefix; others merge the suffix part into the prefix shift
+    n1 = np.where(split, suffix_n[start], 0.0)
+    s1 = np.where(split, suffix_s[start], 0.0)
+    q1 = np.where(split, suffix_q[start], 0.0)
+    delta = np.where(split, last[np.maximum(block - 1, 0)] - first[block], 0.0)
+    count[rows] = n1 + prefix_n[rows]
+    sums[rows] = s1 + n1 * delta + prefix_s[rows]
+    squares[rows] = q1 + 2 * delta * s1 + n1 * delta ** 2 + prefix_q[rows]
+    shift[rows] = first[block]
+
+    partial = np.flatnonzero(~full)
+    if len(partial):
+        series = pd.Series(values)
+        group_first = series.groupby(codes, sort=False).transform('first').fillna(0.0).to_numpy()
+        shifted = pd.Series(values - group_first)
+        grouped = pd.DataFrame({'n': series.notna().astype(np.float64), 's': shifted.fillna(0.0),
+                                'q': (shifted ** 2).fillna(0.0)}).groupby(codes, sort=False).cumsum()
+        count[partial] = grouped['n'].to_numpy()[partial]
+        sums[partial] = grouped['s'].to_numpy()[partial]
+        squares[partial] = grouped['q'].to_numpy()[partial]
+        shift[partial] = group_first[partial]
+    return count, sums, squares, shift
+
+
+def _window_extreme(values: np.ndarray, window: int, full: np.ndarray, codes: np.ndarray,
+                    func: np.ufunc) -> np.ndarray:
+    """
+    Rolling max (func=np.maximum) or min (np.minimum) with the van Herk/Gil-Werman algorithm
+
+    The array is cut into blocks of `window` rows; every full window spans at
+    most two blocks, so its extreme is func(suffix-extreme at the window start,
+    prefix-extreme at the window end). Windows cut short by a series start
+    (partial windows) use a grouped cumulative extreme instead.
+    """
+    n = len(values)
+    fill = -np.inf if func is np.maximum else np.inf
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, fill)
+    padded[:n] = values
+    padded = padded.reshape(blocks, window)
+    prefix = func.accumulate(padded, axis=1).ravel()[:n]
+    suffix = func.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+
+    result = np.full(n, fill)
+    positions = np.flatnonzero(full)
+    result[positions] = func(suffix[positions - window + 1], prefix[positions])
+
+    partial = np.flatnonzero(~full)
+    if len(partial):
+        grouped = pd.Series(values).groupby(codes, sort=False)
+        cumulative = (grouped.cummax() if func is np.maximum else grouped.cummin()).to_numpy()
+        result[partial] = cumulative[partial]
+    return result
+
+
+def rolling_statistics(values: Union[np.ndarray, pd.Series], window: int,
+                       groups: Optional[np.ndarray] = None,
+                       statistics: Sequence[str] = ('mean', 'std', 'min', 'max'),
+                       quantiles: Sequence[float] = (), min_periods: Optional[int] = None,
+                       ddof: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Compute several trailing-window statistics in one pass, optionally per series
+
+    Sums, counts, means and standard deviations come from block-wise shifted sums;
+    min and max from van Herk/Gil-Werman block sweeps (O(n) regardless of the
+    window); quantiles from a chunked sliding-window view. NaN values are
+    skipped, as in pandas. Windows never cross from one group into the next.
+
+    Args:
+        values: Values in time order within each group
+        window: Window length in rows
+        groups: Group code per row (e.g. from groupby().ngroup()); None treats
+            all rows as one series. Rows need not be sorted by group.
+        statistics: Any of 'sum', 'count', 'mean', 'std', 'min', 'max'
+        quantiles: Quantiles in [0, 1] (e.g. 0.5 for the rolling median)
+        min_periods: Minimum non-NaN values for a result (default: window, as pandas)
+        ddof: Delta degrees of freedom for std (pandas uses 1)
+
+    Returns:
+        Dictionary mapping statistic name (quantiles as 'q0.5') to a float64 array
+        aligned with values; NaN where fewer than min_periods values are available
+    """
+    unknown = set(statistics) - set(STATISTICS)
+    if unknown:
+        raise ValueError(f"Unknown rolling statistics: {sorted(unknown)}")
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    min_periods = window if min_periods is None else min_periods
+
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    n = len(values)
+    codes = np.zeros(n, dtype=np.int64) if groups is None else np.asarray(groups)
+
+    # Make each group contiguous (stable, so time order within groups is kept)
+    order = None
+    if n > 1 and (np.diff(codes) < 0).any():
+        order = np.argsort(codes, kind='stable')
+        values, codes = values[order], codes[order]
+
+    starts = _group_starts(codes)
+    positions = np.arange(n)
+    lo = np.maximum(positions - window + 1, starts)
+    full = positions - window + 1 >= starts
+
+    present = ~np.isnan(values)
+    count, sums, squares, shift = _window_moments(values, window, full, codes)
+    count = np.rint(count)
+    valid = count >= max(min_periods, 1)
+    results: Dict[str, np.ndarray] = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / count
+        if 'sum' in statistics:
+            results['sum'] = np.where(valid, sums + count * shift, np.nan)
+        if 'mean' in statistics:
+            results['mean'] = np.where(valid, mean + shift, np.nan)
+        if 'std' in statistics:
+            variance = np.maximum(squares - sums * mean, 0.0) / (count - ddof)
+            results['std'] = np.where(valid & (count > ddof), np.sqrt(variance), np.nan)
+
+    if 'count' in statistics:
+        # As pandas: count is reported once the window spans min_periods rows, even if they are NaN
+        results['count'] = np.where(positions - lo + 1 >= max(min_periods, 1), count, np.nan)
+    if 'max' in statistics:
+        extreme = _window_extreme(np.where(present, values, -np.inf), window, full, codes, np.maximum)
+        results['max'] = np.where(valid, extreme, np.nan)
+    if 'min' in statistics:
+        extreme = _window_extreme(np.where(present, values, np.inf), window, full, codes, np.minimum)
+        results['min'] = np.where(valid, extreme, np.nan)
+
+    if len(quantiles):
+        padded = np.concatenate([np.full(window - 1, np.nan), values])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+        offsets = np.arange(window) - (window - 1)
+        q_values = {q: np.full(n, np.nan) for q in quantiles}
+        for chunk_start in range(0, n, QUANTILE_CHUNK_ROWS):
+            chunk = slice(chunk_start, min(chunk_start + QUANTILE_CHUNK_ROWS, n))
+            rows = positions[chunk]
+            # Blank out the part of each window that precedes its group's first row
+            block = np.where(rows[:, None] + offsets[None, :] >= starts[chunk][:, None], windows[chunk], np.nan)
+            chunk_valid = valid[chunk]
+            if chunk_valid.any():
+                estimates = np.nanquantile(block[chunk_valid], list(quantiles), axis=1)
+                for q, estimate in zip(quantiles, estimates):
+                    q_values[q][rows[chunk_valid]] = estimate
+        for q in quantiles:
+            results[f'q{q:g}'] = q_values[q]
+
+    if order is not None:
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(n)
+        results = {name: array[inverse] for name, array in results.items()}
+    return results
+
+
+def add_rolling_features(df: pd.DataFrame, columns: List[str], windows: Sequence[int],
+                         by: Optional[List[str]] = None, order_by: Optional[str] = None,
+                         statistics: Sequence[str] = ('mean', 'std', 'max', 'min'),
+                         min_periods: Optional[int] = None) -> pd.DataFrame:
+    """
+    Add rolling statistic columns named '<column>_rolling_<statistic>_<window>'
+
+    Args:
+        df: DataFrame (modified in place and returned)
+        columns: Numeric columns
+        windows: Window lengths in rows
+        by: Series key columns; windows stay within each series (None rolls over all rows)
+        order_by: Column giving time order within a series (None keeps row order)
+        statistics: Statistics to add (see rolling_statistics)
+        min_periods: Minimum non-NaN values per window (default: the window)
+
+    Returns:
+        The DataFrame with feature columns added
+    """
+    if order_by is not None:
+        order = np.lexsort([df[order_by].to_numpy()] + [df[key].to_numpy() for key in reversed(by or [])])
+    else:
+        order = np.arange(len(df))
+    codes = df.groupby(by, sort=False, observed=True).ngroup().to_numpy()[order] if by else None
+
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    for col in columns:
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)[order]
+        for window in windows:
+            results = rolling_statistics(values, window, codes, statistics, min_periods=min_periods)
+            for statistic in statistics:
+                df[f'{col}_rolling_{statistic}_{window}'] = results[statistic][inverse]
+    return df
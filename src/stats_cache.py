@@ -0,0 +1,229 @@
+"""
+Statistics Cache Module
+Memoized moments, quantiles, and correlations shared across analysis methods
+"""
+import threading
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+
+def nan_quantiles(values: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """
+    Compute column quantiles of a 2-D array ignoring NaN, in one sort
+
+    Uses the same linear interpolation as pandas/numpy quantile, but sorts
+    every column at once instead of looping per column.
+
+    Args:
+        values: 2-D float array (rows x columns)
+        quantiles: Quantiles to compute, each in [0, 1]
+
+    Returns:
+        Array of shape (len(quantiles), n_columns)
+    """
+    sorted_values = np.sort(values, axis=0)  # NaN sorts to the end
+    counts = (~np.isnan(values)).sum(axis=0)
+    result = np.full((len(quantiles), values.shape[1]), np.nan)
+
+    has_data = counts > 0
+    if not has_data.any():
+        return result
+
+    last = np.maximum(counts - 1, 0)
+    for i, q in enumerate(quantiles):
+        position = q * last
+        lower = np.floor(position).astype(np.intp)
+        upper = np.ceil(position).astype(np.intp)
+        lower_vals = np.take_along_axis(sorted_values, lower[np.newaxis, :], axis=0)[0]
+        upper_vals = np.take_along_axis(sorted_values, upper[np.newaxis, :], axis=0)[0]
+        result[i] = np.where(has_data, lower_vals + (upper_vals - lower_vals) * (position - lower), np.nan)
+
+    return result
+
+
+def nan_moments(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute count, mean, std, min, max, skewness and kurtosis per column
+
+    Skewness and kurtosis use the same bias-corrected estimators as pandas
+    (adjusted Fisher-Pearson skew, excess kurtosis).
+
+    Args:
+        values: 2-D float array (rows x columns)
+
+    Returns:
+        Dictionary of 1-D arrays keyed by statistic name
+    """
+    if values.shape[0] == 0:
+        # nanmin/nanmax cannot reduce an empty axis; nothing to describe
+        empty = np.full(values.shape[1], np.nan)
+        return {'count': np.zeros(values.shape[1]), 'mean': empty, 'std': empty.copy(), 'min': empty.copy(),
+                'max': empty.copy(), 'skewness': empty.copy(), 'kurtosis': empty.copy()}
+
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=0).astype(np.float64)
+    mean = np.nanmean(values, axis=0)
+
+    centered = np.where(valid, values - mean, 0.0)
+    squared = centered ** 2
+    m2 = squared.sum(axis=0) / n
+    m3 = (squared * centered).sum(axis=0) / n
+    m4 = (squared ** 2).sum(axis=0) / n
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt(m2 * n / (n - 1))
+        skew = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+        kurt = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * m4 / m2 ** 2 - 3 * (n - 1))
+
+    constant = m2 == 0
+    skew = np.where(n < 3, np.nan, np.where(constant, 0.0, skew))
+    kurt = np.where(n < 4, np.nan, np.where(constant, 0.0, kurt))
+    std = np.where(n < 2, np.nan, std)
+
+    return {
+        'count': n,
+        'mean': mean,
+        'std': std,
+        'min': np.nanmin(values, axis=0),
+        'max': np.nanmax(values, axis=0),
+        'skewness': skew,
+        'kurtosis': kurt
+    }
+
+
+class StatisticsCache:
+    """Computes statistics once per column set and serves repeated requests from memory"""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize StatisticsCache
+
+        Args:
+            df: DataFrame the statistics describe (must not be mutated in place)
+        """
+        self.df = df
+        self._cache: Dict[Tuple, object] = {}
+        self.hits = 0
+        self.misses = 0
+        # Re-entrant: computing moments looks up the value block; sections may query concurrently
+        self._lock = threading.RLock()
+
+    def _lookup(self, key: Tuple, compute):
+        """Return a cached entry, computing it on first access (once, even across threads)"""
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._cache[key] = compute()
+            return self._cache[key]
+
+    def values(self, columns: List[str]) -> np.ndarray:
+        """
+        Get columns as a contiguous float64 block
+
+        Args:
+            columns: Column names
+
+        Returns:
+            2-D array (rows x columns) with NaN for missing values
+        """
+        columns = tuple(columns)
+        return self._lookup(
+            ('values', columns),
+            lambda: self.df[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+
+    def moments(self, columns: List[str]) -> pd.DataFrame:
+        """
+        Get moments and quartiles for a column set
+
+        Args:
+            columns: Column names
+
+        Returns:
+            DataFrame indexed by column with count, mean, std, min, q1,
+            median, q3, max, skewness and kurtosis
+        """
+        columns = tuple(columns)
+
+        def compute():
+            values = self.values(list(columns))
+            stats = nan_moments(values)
+            q1, median, q3 = nan_quantiles(values, [0.25, 0.5, 0.75])
+            return pd.DataFrame({
+                'count': stats['count'],
+                'mean': stats['mean'],
+                'std': stats['std'],
+                'min': stats['min'],
+                'q1': q1,
+                'median': median,
+                'q3': q3,
+                'max': stats['max'],
+                'skewness': stats['skewness'],
+                'kurtosis': stats['kurtosis']
+            }, index=list(columns))
+
+        return self._lookup(('moments', columns), compute)
+
+    def quantiles(self, columns: List[str], quantiles: Sequence[float]) -> pd.DataFrame:
+        """
+        Get arbitrary quantiles for a column set
+
+        Args:
+            columns: Column names
+            quantiles: Quantiles to compute
+
+        Returns:
+            DataFrame indexed by quantile with one column per input column
+        """
+        columns, quantiles = tuple(columns), tuple(quantiles)
+        return self._lookup(
+            ('quantiles', columns, quantiles),
+            lambda: pd.DataFrame(nan_quantiles(self.values(list(columns)), quantiles),
+                                 index=list(quantiles), columns=list(columns))
+        )
+
+    def correlation(self, columns: List[str]) -> pd.DataFrame:
+        """
+        Get the Pearson correlation matrix for a column set
+
+        Args:
+            columns: Column names
+
+        Returns:
+            Correlation matrix DataFrame
+        """
+        columns = tuple(columns)
+        return self._lookup(('correlation', columns), lambda: self.df[list(columns)].corr())
+
+    def describe(self, columns: List[str]) -> Dict:
+        """
+        Get a summary equivalent to DataFrame.describe().to_dict()
+
+        Args:
+            columns: Column names
+
+        Returns:
+            Dictionary mapping column to its summary statistics
+        """
+        moments = self.moments(columns)
+        summary = moments[['count', 'mean', 'std', 'min', 'q1', 'median', 'q3', 'max']]
+        summary.columns = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        return summary.T.to_dict()
+
+    def get_cache_info(self) -> Dict:
+        """
+        Get cache usage counters
+
+        Returns:
+            Dictionary with hits, misses and number of cached entries
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._cache)
+        }
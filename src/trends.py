@@ -0,0 +1,166 @@
+"""
+Trend Estimation Module
+OLS and Mann-Kendall/Sen trends for every series of a long-format panel in one vectorized pass
+"""
+import pandas as pd
+import numpy as np
+from scipy import stats
+from typing import Optional, Sequence
+import warnings
+warnings.filterwarnings('ignore')
+
+DAYS_PER_YEAR = 365.2425
+
+
+def _direction(n: np.ndarray, sen_slope: np.ndarray, mk_s: np.ndarray, mk_p: np.ndarray,
+               alpha: float, min_points: int) -> np.ndarray:
+    """Direction label from the Mann-Kendall test (sign from the Sen slope, or S on a zero slope)"""
+    sign = np.where(sen_slope != 0, np.sign(sen_slope), np.sign(mk_s))
+    direction = np.where(sign > 0, 'Increasing', 'Decreasing').astype(object)
+    direction[~(mk_p < alpha) | (sign == 0)] = 'Stable'
+    direction[n < min_points] = 'Insufficient data'
+    return direction
+
+
+def series_trends(df: pd.DataFrame, date_column: Optional[str] = 'time', value_column: str = 'amount',
+                  keys: Sequence[str] = ('country', 'indicator'), alpha: float = 0.05,
+                  min_points: int = 3, max_pairs: int = 5_000_000, seed: int = 42) -> pd.DataFrame:
+    """
+    Estimate a linear and a robust trend for every series
+
+    Time is the x-axis (slopes are per year), so irregular spacing and gaps
+    are handled naturally; NaN values are dropped and repeated time points
+    within a series are averaged. OLS sums come from grouped bincounts. The
+    Mann-Kendall S statistic and Sen slope compare every pair of points
+    within a series, generated one lag at a time across all series at once.
+    When a panel has more than `max_pairs` pairs, each series keeps at most an
+    equal share of the budget and the Sen slope of longer series is the median
+    of a uniform sample of their pairs (S and its test stay exact).
+
+    Args:
+        df: Long-format DataFrame
+        date_column: Datetime column (None uses the row order within each series)
+        value_column: Numeric column
+        keys: Columns identifying a series (empty treats all rows as one series)
+        alpha: Significance level for the direction label
+        min_points: Minimum points for a direction other than 'Insufficient data'
+        max_pairs: Pair budget for the Sen slope
+        seed: Seed for the Sen pair sample
+
+    Returns:
+        DataFrame with one row per series: keys, n, start, end, slope, intercept
+        (fitted value at start), slope_se, t_statistic, p_value, r_squared,
+        sen_slope, mk_s, mk_tau, mk_z, mk_p_value and direction
+    """
+    keys = list(keys)
+    data = pd.DataFrame({key: df[key] for key in keys})
+    data['y'] = pd.to_numeric(df[value_column], errors='coerce')
+    if date_column is not None:
+        data['t'] = pd.to_datetime(df[date_column])
+        data = data.dropna(subset=['y', 't'])
+    else:
+        data = data.dropna(subset=['y'])
+        data['t'] = data.groupby(keys, sort=False).cumcount() if keys else np.arange(len(data))
+
+    # One point per series and time, sorted by series then time
+    data = data.groupby(keys + ['t'], sort=True, observed=True)['y'].mean().reset_index()
+    if keys:
+        codes = data.groupby(keys, sort=False, observed=True).ngroup().to_numpy()
+        series = data[keys].drop_duplicates().reset_index(drop=True)
+    else:
+        codes = np.zeros(len(data), dtype=np.int64)
+        series = pd.DataFrame(index=range(1 if len(data) else 0))
+    n_series = len(series)
+
+    y = data['y'].to_numpy(dtype=np.float64)
+    if date_column is not None:
+        origin = data['t'].min()
+        x = ((data['t'] - origin) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64) / DAYS_PER_YEAR
+    else:
+        x = data['t'].to_numpy(dtype=np.float64)
+
+    n = np.bincount(codes, minlength=n_series).astype(np.float64)
+    first = np.concatenate([[0], np.cumsum(n)[:-1]]).astype(np.int64)
+    last = first + n.astype(np.int64) - 1
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # OLS on centred values (one bincount per sum)
+        x_mean = np.bincount(codes, x, n_series) / n
+        y_mean = np.bincount(codes, y, n_series) / n
+        dx, dy = x - x_mean[codes], y - y_mean[codes]
+        sxx = np.bincount(codes, dx * dx, n_series)
+        sxy = np.bincount(codes, dx * dy, n_series)
+        syy = np.bincount(codes, dy * dy, n_series)
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        rss = np.maximum(syy - slope * sxy, 0.0)
+        slope_se = np.sqrt(rss / (n - 2) / sxx)
+        slope_se[n < 3] = np.nan
+        t_stat = slope / slope_se
+        p_value = 2 * stats.t.sf(np.abs(t_stat), np.maximum(n - 2, 1))
+        p_value[~np.isfinite(t_stat) | (n < 3)] = np.nan
+        r_squared = np.where(syy > 0, 1 - rss / syy, np.nan)
+        intercept = y_mean + slope * (x[first] - x_mean)
+
+    # Mann-Kendall S and Sen slope over all within-series pairs, one lag at a time
+    rank = np.arange(len(y)) - first[codes]
+    remaining = (n[codes] - 1 - rank).astype(np.int64)
+    series_pairs = n * (n - 1) / 2
+    cap = np.inf
+    if series_pairs.sum() > max_pairs:
+        # Largest per-series cap whose capped total fits the budget
+        low, high = 0.0, series_pairs.max()
+        for _ in range(60):
+            cap = (low + high) / 2
+            low, high = (cap, high) if np.minimum(series_pairs, cap).sum() <= max_pairs else (low, cap)
+        cap = low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        keep = np.where(series_pairs > cap, cap / series_pairs, 1.0)
+    rng = np.random.default_rng(seed)
+    mk_s = np.zeros(n_series)
+    pair_codes, pair_slopes = [], []
+    active = np.flatnonzero(remaining > 0)
+    lag = 1
+    while len(active):
+        diff = y[active + lag] - y[active]
+        mk_s += np.bincount(codes[active], np.sign(diff), n_series)
+        chosen = active if np.isinf(cap) else active[rng.random(len(active)) < keep[codes[active]]]
+        if len(chosen):
+            pair_codes.append(codes[chosen])
+            pair_slopes.append((y[chosen + lag] - y[chosen]) / (x[chosen + lag] - x[chosen]))
+        lag += 1
+        active = active[remaining[active] >= lag]
+
+    sen_slope = np.full(n_series, np.nan)
+    if pair_codes:
+        medians = pd.Series(np.concatenate(pair_slopes)).groupby(np.concatenate(pair_codes)).median()
+        sen_slope[medians.index.to_numpy()] = medians.to_numpy()
+
+    # Variance of S with the correction for tied values
+    ties = pd.DataFrame({'code': codes, 'y': y}).groupby(['code', 'y'], sort=False).size()
+    t = ties.to_numpy(dtype=np.float64)
+    tie_term = np.bincount(ties.index.get_level_values('code').to_numpy(), t * (t - 1) * (2 * t + 5), n_series)
+    mk_var = (n * (n - 1) * (2 * n + 5) - tie_term) / 18
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mk_z = np.where(mk_var > 0, (mk_s - np.sign(mk_s)) / np.sqrt(mk_var), 0.0)
+        mk_tau = np.where(n > 1, mk_s / (n * (n - 1) / 2), np.nan)
+    mk_p = 2 * stats.norm.sf(np.abs(mk_z))
+    mk_p[n < 2] = np.nan
+
+    times = data['t'].to_numpy()
+    result = series.copy()
+    result['n'] = n.astype(np.int64)
+    result['start'] = times[first]
+    result['end'] = times[last]
+    result['slope'] = slope
+    result['intercept'] = intercept
+    result['slope_se'] = slope_se
+    result['t_statistic'] = t_stat
+    result['p_value'] = p_value
+    result['r_squared'] = r_squared
+    result['sen_slope'] = sen_slope
+    result['mk_s'] = mk_s.astype(np.int64)
+    result['mk_tau'] = mk_tau
+    result['mk_z'] = mk_z
+    result['mk_p_value'] = mk_p
+    result['direction'] = _direction(n, sen_slope, mk_s, mk_p, alpha, min_points)
+    return result
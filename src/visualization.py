@@ -2,51 +2,189 @@
 Visualization Module
 Creates comprehensive dashboards and visualizations using matplotlib, seaborn, and plotly
 """
+import os
+import time
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 11
+try:
+    from .cube import AggregateCube
+    from .profiling import profiled
+    from .rendering import PlotRenderer, PlotSpec
+    from .scenarios import country_panel
+except ImportError:
+    from cube import AggregateCube
+    from profiling import profiled
+    from rendering import PlotRenderer, PlotSpec
+    from scenarios import country_panel
+
+# Plot style (the renderer applies the whitegrid base style)
 COLOR_PALETTE = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6A994E', '#F77F00']
+PLOT_RC = {'font.size': 11}
+# Columns of the long layout, where the trend dashboard draws one trace per indicator
+LONG_COLUMNS = {'country', 'indicator', 'unit', 'currency', 'frequency'}
+TREND_INDICATORS = ['Budget Deficit/Surplus', 'Revenue', 'Expenditure']
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets downsampling
+    
+    Keeps the first and last points and, for each bucket in between, the point
+    forming the largest triangle with the previous pick and the next bucket's
+    mean, which preserves peaks and troughs far better than striding.
+    
+    Args:
+        x: Sorted numeric x values (datetimes as int64)
+        y: y values
+        n_out: Number of points to keep
+    
+    Returns:
+        Indices of the selected points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean() if next_end > end else x[-1]
+        next_y = y[end:next_end].mean() if next_end > end else y[-1]
+        
+        areas = np.abs((x[prev] - next_x) * (y[start:end] - y[prev])
+                       - (x[prev] - x[start:end]) * (next_y - y[prev]))
+        prev = start + int(np.argmax(areas)) if end > start else start
+        selected[i + 1] = prev
+    
+    return selected
 
 
 class DashboardGenerator:
     """Generates comprehensive dashboards"""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, max_points: int = 2000,
+                 plotlyjs: str = 'directory', cube: Optional[AggregateCube] = None):
         """
         Initialize DashboardGenerator
         
         Args:
             df: DataFrame to visualize
+            max_points: Maximum points drawn per time series trace
+            plotlyjs: How HTML files load plotly.js ('directory' shares one
+                plotly.min.js next to the files, 'cdn', or True to inline it)
+            cube: Prebuilt aggregate cube for df (built on demand if not given)
         """
         self.df = df.copy()
         self.figures: List = []
+        self.max_points = max_points
+        self.plotlyjs = plotlyjs
+        self.dashboard_stats: Dict[str, Dict] = {}
+        self.cube = cube
+    
+    def _get_cube(self, date_column: str, value_column: str) -> AggregateCube:
+        """Get the aggregate cube for a date/value column pair, building it once"""
+        if self.cube is None or not self.cube.matches(date_column, value_column):
+            self.cube = AggregateCube(self.df, date_column, value_column).build()
+        return self.cube
+    
+    def _write_html(self, fig: go.Figure, save_path: str, file_name: str,
+                    started_at: float, points: Optional[Dict] = None):
+        """Write a dashboard and record its size and build time"""
+        path = f"{save_path}/{file_name}"
+        fig.write_html(path, include_plotlyjs=self.plotlyjs)
+        self.dashboard_stats[file_name] = {
+            'path': path,
+            'bytes': os.path.getsize(path),
+            'render_seconds': time.perf_counter() - started_at,
+            **(points or {})
+        }
+    
+    def _aggregate_series(self, date_column: str, value_column: str) -> pd.Series:
+        """Total a value column per date, sorted by time"""
+        dates = pd.to_datetime(self.df[date_column])
+        return self.df[value_column].groupby(dates).sum().sort_index()
+    
+    def _trend_series(self, date_column: str, value_columns: List[str],
+                      indicators: Optional[List[str]] = None, max_series: int = 3) -> Dict[str, pd.Series]:
+        """
+        Time series to draw on the trend dashboard, keyed by trace name
+        
+        In the long layout (country, indicator, unit, currency and frequency
+        columns) each indicator becomes one series: the yearly cross-country
+        median on a normalized basis (amounts in percent of GDP, rates as they
+        are; see scenarios.country_panel), so rows of different frequencies,
+        scales and currencies are never added up. Otherwise each value column
+        is totalled per date.
+        
+        Args:
+            date_column: Name of date column
+            value_columns: Value columns (the first is the amount in the long layout)
+            indicators: Indicators to draw (default: TREND_INDICATORS, or the
+                best-covered ones when none of those are in the data)
+            max_series: Maximum number of series
+        
+        Returns:
+            Dictionary of trace name -> time-indexed series
+        """
+        if not LONG_COLUMNS.issubset(self.df.columns):
+            return {col: self._aggregate_series(date_column, col)
+                    for col in value_columns[:max_series] if col in self.df.columns}
+        
+        if indicators is None and self.df['indicator'].isin(TREND_INDICATORS).any():
+            indicators = TREND_INDICATORS
+        panel = country_panel(self.df, indicators, date_column, value_columns[0])
+        if indicators is None:
+            coverage = panel.drop(columns='Nominal GDP', errors='ignore').count()
+            indicators = coverage.sort_values(ascending=False, kind='stable').index.tolist()
+        series = {}
+        for indicator in [name for name in indicators if name in panel.columns][:max_series]:
+            median = panel[indicator].groupby(level='period').median().dropna()
+            median.index = median.index.to_timestamp()
+            series[f"{indicator} ({panel.attrs['units'][indicator]}, median)"] = median.sort_index()
+        return series
     
+    def _downsample(self, series: pd.Series) -> pd.Series:
+        """Reduce a time-indexed series to at most max_points with LTTB"""
+        if len(series) <= self.max_points:
+            return series
+        x = series.index.values.astype('datetime64[ns]').astype(np.int64)
+        return series.iloc[lttb_downsample(x, series.values, self.max_points)]
+    
+    @profiled()
     def create_trend_dashboard(self, date_column: str,
                                value_columns: List[str],
-                               save_path: Optional[str] = None) -> go.Figure:
+                               save_path: Optional[str] = None,
+                               indicators: Optional[List[str]] = None) -> go.Figure:
         """
         Create interactive trend dashboard
         
+        Each trend series (see _trend_series) is downsampled (LTTB) to at most
+        max_points before it is drawn as a WebGL trace, so file size stays
+        bounded regardless of how many rows feed a series.
+        
         Args:
             date_column: Name of date column
             value_columns: List of columns to plot
             save_path: Path to save HTML file
+            indicators: Indicators to draw in the long layout (default: TREND_INDICATORS)
         
         Returns:
             Plotly figure object
         """
+        started_at = time.perf_counter()
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Time Series Trends', 'Year-over-Year Comparison', 
@@ -54,27 +192,29 @@ class DashboardGenerator:
             specs=[[{"secondary_y": False}, {"secondary_y": False}],
                    [{"secondary_y": False}, {"secondary_y": False}]]
         )
-        
-        # Time series plot
-        for i, col in enumerate(value_columns[:3]):
-            if col in self.df.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=self.df[date_column],
-                        y=self.df[col],
-                        name=col,
-                        line=dict(color=COLOR_PALETTE[i % len(COLOR_PALETTE)], width=2),
-                        mode='lines+markers'
-                    ),
-                    row=1, col=1
-                )
+        points = {'points_in': 0, 'points_out': 0}
+        
+        # Time series plot: one downsampled WebGL trace per indicator (or column)
+        trends = self._trend_series(date_column, value_columns, indicators)
+        for i, (name, series) in enumerate(trends.items()):
+            sampled = self._downsample(series)
+            points['points_in'] += len(series)
+            points['points_out'] += len(sampled)
+            fig.add_trace(
+                go.Scattergl(
+                    x=sampled.index,
+                    y=sampled.values,
+                    name=name,
+                    line=dict(color=COLOR_PALETTE[i % len(COLOR_PALETTE)], width=2),
+                    mode='lines+markers' if len(sampled) <= 500 else 'lines'
+                ),
+                row=1, col=1
+            )
         
         # Year-over-year comparison
         try:
-            self.df['year'] = pd.to_datetime(self.df[date_column]).dt.year
-            self.df['month'] = pd.to_datetime(self.df[date_column]).dt.month
-            
-            yearly_data = self.df.groupby('year')[value_columns[0]].sum()
+            cube = self._get_cube(date_column, value_columns[0])
+            yearly_data = cube.rollup(['year'])['sum']
             fig.add_trace(
                 go.Bar(
                     x=yearly_data.index,
@@ -89,7 +229,7 @@ class DashboardGenerator:
         
         # Monthly patterns
         try:
-            monthly_data = self.df.groupby('month')[value_columns[0]].mean()
+            monthly_data = cube.rollup(['month'])['mean']
             fig.add_trace(
                 go.Scatter(
                     x=monthly_data.index,
@@ -103,13 +243,13 @@ class DashboardGenerator:
         except:
             pass
         
-        # Cumulative trends
+        # Cumulative trends (computed on the full first trend series, then downsampled)
         try:
-            cumulative = self.df[value_columns[0]].cumsum()
+            cumulative = self._downsample(next(iter(trends.values())).cumsum())
             fig.add_trace(
-                go.Scatter(
-                    x=self.df[date_column],
-                    y=cumulative,
+                go.Scattergl(
+                    x=cumulative.index,
+                    y=cumulative.values,
                     name='Cumulative',
                     fill='tozeroy',
                     marker_color=COLOR_PALETTE[2]
@@ -127,7 +267,7 @@ class DashboardGenerator:
         )
         
         if save_path:
-            fig.write_html(f"{save_path}/trend_dashboard.html")
+            self._write_html(fig, save_path, 'trend_dashboard.html', started_at, points)
         
         return fig
     
@@ -143,6 +283,7 @@ class DashboardGenerator:
         Returns:
             Plotly figure object
         """
+        started_at = time.perf_counter()
         n_metrics = len(kpi_metrics)
         cols = 3
         rows = (n_metrics + cols - 1) // cols
@@ -185,7 +326,7 @@ class DashboardGenerator:
         )
         
         if save_path:
-            fig.write_html(f"{save_path}/kpi_dashboard.html")
+            self._write_html(fig, save_path, 'kpi_dashboard.html', started_at)
         
         return fig
     
@@ -201,6 +342,7 @@ class DashboardGenerator:
         Returns:
             Plotly figure object
         """
+        started_at = time.perf_counter()
         n_insights = len(insights)
         fig = make_subplots(
             rows=n_insights, cols=1,
@@ -237,7 +379,7 @@ class DashboardGenerator:
         )
         
         if save_path:
-            fig.write_html(f"{save_path}/insight_storyboard.html")
+            self._write_html(fig, save_path, 'insight_storyboard.html', started_at)
         
         return fig
     
@@ -255,6 +397,8 @@ class DashboardGenerator:
         Returns:
             Plotly figure object
         """
+        started_at = time.perf_counter()
+        
         # Extract strong correlations
         edges = []
         for i in range(len(corr_matrix.columns)):
@@ -291,7 +435,7 @@ class DashboardGenerator:
         )
         
         if save_path:
-            fig.write_html(f"{save_path}/correlation_network.html")
+            self._write_html(fig, save_path, 'correlation_network.html', started_at)
         
         return fig
 
@@ -299,40 +443,59 @@ class DashboardGenerator:
 class VisualizationGenerator:
     """Main visualization generator class"""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, render_preset: str = 'publication',
+                 n_workers: Optional[int] = None, cube: Optional[AggregateCube] = None):
         """
         Initialize VisualizationGenerator
         
         Args:
             df: DataFrame to visualize
+            render_preset: Static plot output preset ('draft', 'web', 'publication', 'vector')
+            n_workers: Plot rendering worker processes (default: CPU count, 1 renders inline)
+            cube: Prebuilt aggregate cube shared with the trend dashboard
         """
         self.df = df.copy()
-        self.dashboard_gen = DashboardGenerator(df)
+        self.dashboard_gen = DashboardGenerator(df, cube=cube)
+        self.render_preset = render_preset
+        self.n_workers = n_workers
+        self.render_stats: Optional[Dict] = None
     
+    @profiled()
     def generate_all_visualizations(self, date_column: Optional[str] = None,
                                    value_columns: Optional[List[str]] = None,
                                    save_path: Optional[str] = None) -> Dict:
         """
         Generate all standard visualizations
         
+        Static figures from every section are rendered together on one
+        worker pool; throughput is available afterwards in self.render_stats.
+        
         Args:
             date_column: Name of date column
             value_columns: List of value columns
             save_path: Path to save visualizations
         
         Returns:
-            Dictionary with all generated figures
+            Dictionary with generated file paths (static plots) and dashboard figures
         """
         if value_columns is None:
             value_columns = self.df.select_dtypes(include=[np.number]).columns.tolist()[:5]
         
         visualizations = {}
         
+        # Static plots are described as specs and rendered in one batch
+        static_specs = {
+            'distributions': self._distribution_plot_specs(value_columns),
+            'correlation': self._correlation_heatmap_specs(),
+            'outliers': self._outlier_plot_specs(value_columns)
+        }
+        rendered = self._render(static_specs, save_path)
+        
         # 1. Distribution plots
-        visualizations['distributions'] = self._create_distribution_plots(value_columns, save_path)
+        visualizations['distributions'] = rendered['distributions']
         
         # 2. Correlation heatmap
-        visualizations['correlation'] = self._create_correlation_heatmap(save_path)
+        visualizations['correlation'] = rendered['correlation'][0] if rendered['correlation'] else None
         
         # 3. Trend dashboard (if date column available)
         if date_column and date_column in self.df.columns:
@@ -341,90 +504,83 @@ class VisualizationGenerator:
             )
         
         # 4. Box plots for outlier visualization
-        visualizations['outliers'] = self._create_outlier_plots(value_columns, save_path)
+        visualizations['outliers'] = rendered['outliers'][0] if rendered['outliers'] else None
         
         return visualizations
     
+    def _render(self, specs_by_section: Dict[str, List[PlotSpec]],
+                save_path: Optional[str]) -> Dict[str, List[str]]:
+        """Render grouped specs on one worker pool, returning paths per group"""
+        all_specs = [spec for specs in specs_by_section.values() for spec in specs]
+        if not save_path or not all_specs:
+            return {section: [] for section in specs_by_section}
+        
+        with PlotRenderer(save_path, self.render_preset, self.n_workers) as renderer:
+            paths = iter(renderer.render(all_specs))
+        self.render_stats = renderer.get_stats()
+        
+        return {section: [next(paths) for _ in specs] for section, specs in specs_by_section.items()}
+    
+    def get_render_report(self) -> Dict:
+        """
+        Get output statistics for the last generate_all_visualizations run
+        
+        Returns:
+            Dictionary with static render throughput and per-dashboard size/time
+        """
+        return {
+            'static_plots': self.render_stats,
+            'dashboards': self.dashboard_gen.dashboard_stats
+        }
+    
     def _create_distribution_plots(self, columns: List[str],
                                    save_path: Optional[str] = None) -> List:
-        """Create distribution plots for columns"""
-        figures = []
-        
-        for col in columns:
-            if col in self.df.columns:
-                fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-                
-                # Histogram
-                axes[0].hist(self.df[col].dropna(), bins=30, edgecolor='black', 
-                           alpha=0.7, color=COLOR_PALETTE[0])
-                axes[0].set_title(f'Distribution of {col}', fontweight='bold')
-                axes[0].set_xlabel(col)
-                axes[0].set_ylabel('Frequency')
-                axes[0].grid(True, alpha=0.3)
-                
-                # Box plot
-                axes[1].boxplot(self.df[col].dropna(), vert=True)
-                axes[1].set_title(f'Box Plot: {col}', fontweight='bold')
-                axes[1].set_ylabel(col)
-                axes[1].grid(True, alpha=0.3)
-                
-                plt.tight_layout()
-                
-                if save_path:
-                    plt.savefig(f"{save_path}/distribution_{col}.png", dpi=300, bbox_inches='tight')
-                
-                figures.append(fig)
-                plt.close()
-        
-        return figures
+        """Create distribution plots for columns, returning saved file paths"""
+        specs = {'distributions': self._distribution_plot_specs(columns)}
+        return self._render(specs, save_path)['distributions']
+    
+    def _distribution_plot_specs(self, columns: List[str]) -> List[PlotSpec]:
+        """Build histogram/box plot specs for columns"""
+        return [
+            PlotSpec('distribution_box', f'distribution_{col}',
+                     data={'values': self.df[col].dropna().to_numpy()},
+                     params={'column': col, 'color': COLOR_PALETTE[0]},
+                     figsize=(14, 5), rc=PLOT_RC)
+            for col in columns if col in self.df.columns
+        ]
     
-    def _create_correlation_heatmap(self, save_path: Optional[str] = None) -> plt.Figure:
-        """Create correlation heatmap"""
+    def _create_correlation_heatmap(self, save_path: Optional[str] = None) -> Optional[str]:
+        """Create correlation heatmap, returning the saved file path"""
+        paths = self._render({'correlation': self._correlation_heatmap_specs()}, save_path)['correlation']
+        return paths[0] if paths else None
+    
+    def _correlation_heatmap_specs(self) -> List[PlotSpec]:
+        """Build the correlation heatmap spec"""
         numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
         
         if len(numeric_cols) < 2:
-            return None
-        
-        corr_matrix = self.df[numeric_cols].corr()
-        
-        fig, ax = plt.subplots(figsize=(12, 10))
-        mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-        sns.heatmap(corr_matrix, mask=mask, annot=True, fmt='.2f', cmap='coolwarm',
-                   center=0, square=True, linewidths=1, cbar_kws={"shrink": 0.8}, ax=ax)
-        ax.set_title('Correlation Heatmap', fontsize=14, fontweight='bold', pad=20)
+            return []
         
-        if save_path:
-            plt.savefig(f"{save_path}/correlation_heatmap.png", dpi=300, bbox_inches='tight')
-        
-        return fig
+        return [PlotSpec('correlation_heatmap', 'correlation_heatmap',
+                         data={'corr_matrix': self.df[numeric_cols].corr()},
+                         params={'title': 'Correlation Heatmap'},
+                         figsize=(12, 10), rc=PLOT_RC)]
     
     def _create_outlier_plots(self, columns: List[str],
-                              save_path: Optional[str] = None) -> plt.Figure:
-        """Create box plots for outlier detection"""
+                              save_path: Optional[str] = None) -> Optional[str]:
+        """Create box plots for outlier detection, returning the saved file path"""
+        paths = self._render({'outliers': self._outlier_plot_specs(columns)}, save_path)['outliers']
+        return paths[0] if paths else None
+    
+    def _outlier_plot_specs(self, columns: List[str]) -> List[PlotSpec]:
+        """Build the combined box plot spec"""
         numeric_cols = [col for col in columns if col in self.df.columns and col in self.df.select_dtypes(include=[np.number]).columns]
         
         if not numeric_cols:
-            return None
-        
-        fig, ax = plt.subplots(figsize=(14, 6))
-        data_to_plot = [self.df[col].dropna() for col in numeric_cols[:10]]
-        
-        bp = ax.boxplot(data_to_plot, labels=numeric_cols[:10], patch_artist=True)
-        
-        # Color the boxes
-        for patch, color in zip(bp['boxes'], COLOR_PALETTE * 2):
-            patch.set_facecolor(color)
-            patch.set_alpha(0.7)
+            return []
         
-        ax.set_title('Outlier Detection - Box Plots', fontsize=14, fontweight='bold')
-        ax.set_ylabel('Values')
-        ax.grid(True, alpha=0.3, axis='y')
-        plt.xticks(rotation=45, ha='right')
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(f"{save_path}/outlier_detection.png", dpi=300, bbox_inches='tight')
-        
-        return fig
-
+        return [PlotSpec('boxplots', 'outlier_detection',
+                         data={'series': [self.df[col].dropna().to_numpy() for col in numeric_cols[:10]]},
+                         params={'labels': numeric_cols[:10], 'colors': COLOR_PALETTE,
+                                 'title': 'Outlier Detection - Box Plots'},
+                         figsize=(14, 6), rc=PLOT_RC)]